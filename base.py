@@ -1,7 +1,13 @@
 from abc import abstractmethod
-from typing import Iterable, Literal, Protocol
+from typing import Iterable, Literal, Protocol, Sequence, runtime_checkable
 
-from models import MatchScore
+from models import (
+    MatchCounterWeights,
+    MatchScore,
+    MatchScoreColumns,
+    MatchScoreTuple,
+    TeamMetricTotals,
+)
 
 
 class SoccerMatchScoresLoader(Protocol):
@@ -10,6 +16,30 @@ class SoccerMatchScoresLoader(Protocol):
         ...
 
 
+@runtime_checkable
+class ColumnarSoccerMatchScoresLoader(SoccerMatchScoresLoader, Protocol):
+    """
+    Optional extension of SoccerMatchScoresLoader for loaders that can provide match scores as
+    columns, so that rankers can skip building a MatchScore object per match score
+    """
+
+    @abstractmethod
+    def iter_match_score_columns(self) -> Iterable[MatchScoreColumns]:
+        ...
+
+
+@runtime_checkable
+class TupleSoccerMatchScoresLoader(SoccerMatchScoresLoader, Protocol):
+    """
+    Optional extension of SoccerMatchScoresLoader for loaders that can provide (already validated)
+    match scores as plain tuples, so that rankers can skip building a MatchScore object per match
+    """
+
+    @abstractmethod
+    def iter_match_score_tuples(self) -> Iterable[MatchScoreTuple]:
+        ...
+
+
 class MetricScorer(Protocol):
     @abstractmethod
     def readable_string_from_metric(self, metric: int) -> str:
@@ -37,6 +67,68 @@ class MetricScorer(Protocol):
         ...
 
 
+@runtime_checkable
+class BatchMetricScorer(MetricScorer, Protocol):
+    """
+    Optional extension of MetricScorer for scoring many match scores at once (ie vectorized)
+    """
+
+    @abstractmethod
+    def score_batch(
+        self,
+        team_a_ids: Sequence[int],
+        team_b_ids: Sequence[int],
+        team_a_scores: Sequence[int],
+        team_b_scores: Sequence[int],
+    ) -> tuple[Sequence[int], Sequence[int]]:
+        """
+        Given a batch of match scores as columns (index i of each column belonging to the same
+        match score), returns a pair of columns of metric deltas for team A and team B.
+        """
+        ...
+
+
+@runtime_checkable
+class FusedMetricScorer(MetricScorer, Protocol):
+    """
+    Optional extension of MetricScorer for metrics that are a linear combination of per-match
+    counters (wins, ties, losses, goals for + against). Rankers can then count every match once
+    into a per-team row of counters, and derive all such metrics from that row, instead of
+    scoring every match once per metric scorer.
+    """
+
+    @abstractmethod
+    def counter_weights(self) -> MatchCounterWeights:
+        """Returns the weight of each per-match counter within the metric"""
+        ...
+
+
+class SoccerTeamMetricTotalsLoader(Protocol):
+    @abstractmethod
+    def iter_metric_totals(self, metric_scorers: list[MetricScorer]) -> Iterable[TeamMetricTotals]:
+        """
+        Returns partial per-team metric totals (one per batch of match scores) that can be merged
+        together to get the same totals as scoring every match score one at a time.
+        """
+        ...
+
+
+class PipelineObserver(Protocol):
+    """
+    Hooks for instrumenting the stages of the ranking pipeline (ie for profiling). Hooks are only
+    called once per stage/batch rather than once per match score, to keep their cost negligible.
+    """
+
+    @abstractmethod
+    def on_stage_finished(self, stage: str, seconds: float):
+        ...
+
+    @abstractmethod
+    def on_count(self, counter: str, count: int):
+        """Adds count to the named counter (ie lines_read)"""
+        ...
+
+
 class SoccerTeamRanker(Protocol):
     @abstractmethod
     def clear(self):
@@ -0,0 +1,208 @@
+"""
+Batch mode ranking many independent seasons (ie leagues x years) within a single invocation.
+
+Seasons are spread across a pool of worker processes, each reusing a single warm ranker (cleared
+between seasons), and every season's rankings are written to their own output file. A season that
+can't be ranked is reported, without aborting the rest of the batch.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from base import MetricScorer
+from main import (
+    COMPRESSION_FILE_SUFFIXES,
+    TIEBREAKER_METRIC_SCORERS,
+    FromBinaryIOSoccerMatchScoresLoader,
+    StandardCompetitionSoccerTeamRanker,
+    ToIORankingDumper,
+    _positive_int,
+    _worth_process_pool,
+    build_metric_scorers,
+    open_input_file,
+)
+from models import SeasonRankingResult
+
+# Warm ranker of the current (worker) process, see _init_season_ranker
+_season_ranker: StandardCompetitionSoccerTeamRanker | None = None
+
+
+def _init_season_ranker(metric_scorers: list[MetricScorer], top_k: int | None):
+    """Creates the ranker reused by every season ranked within the current (worker) process"""
+    global _season_ranker
+    _season_ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=metric_scorers, top_k=top_k)
+
+
+def _rank_season(season_path: Path, output_path: Path) -> SeasonRankingResult:
+    """
+    Ranks a single season file into its output file, using the warm ranker of the current process.
+    """
+    ranker = _season_ranker
+    assert ranker is not None, "_init_season_ranker must be called first"
+    start_time = time.perf_counter()
+    ranker.clear()
+    try:
+        with open_input_file(season_path) as input_fileio:
+            ranker.load_scores(FromBinaryIOSoccerMatchScoresLoader(fileio=input_fileio))
+        # Written to a temporary file first, so that a failed season never leaves a partial output
+        with tempfile.NamedTemporaryFile(
+            "w", dir=output_path.parent, prefix=f".{output_path.name}.", delete=False
+        ) as output_fileio:
+            try:
+                ToIORankingDumper(
+                    fileio=output_fileio, buffer_size=ToIORankingDumper.DEFAULT_BUFFER_SIZE
+                ).dump_rankings(ranker)
+            except BaseException:
+                os.unlink(output_fileio.name)
+                raise
+        os.replace(output_fileio.name, output_path)
+    except (OSError, UnicodeDecodeError, ValueError) as exc:
+        return SeasonRankingResult(
+            season_path=str(season_path),
+            output_path=str(output_path),
+            seconds=time.perf_counter() - start_time,
+            error=str(exc),
+        )
+    return SeasonRankingResult(
+        season_path=str(season_path),
+        output_path=str(output_path),
+        seconds=time.perf_counter() - start_time,
+        match_count=ranker.match_count,
+    )
+
+
+class BatchSeasonRanker:
+    def __init__(
+        self,
+        metric_scorers: list[MetricScorer],
+        top_k: int | None = None,
+        max_workers: int | None = None,
+    ):
+        if max_workers is not None and max_workers <= 0:
+            raise ValueError("Max workers must be > 0")
+        self.metric_scorers = metric_scorers
+        self.top_k = top_k
+        self.max_workers = max_workers
+
+    def iter_rank_seasons(
+        self, season_paths: Sequence[Path], output_dir: Path
+    ) -> Iterable[SeasonRankingResult]:
+        """
+        Ranks every season into output_dir (one output file per season, named after the season
+        file without any compression extension) and yields the result of each season, in the same
+        order as season_paths
+        """
+        output_paths = [
+            output_dir
+            / (
+                season_path.stem
+                if season_path.suffix.lower() in COMPRESSION_FILE_SUFFIXES
+                else season_path.name
+            )
+            for season_path in season_paths
+        ]
+        if len(set(output_paths)) != len(output_paths):
+            raise ValueError("Season file names must be unique")
+        output_dir.mkdir(parents=True, exist_ok=True)
+        if not _worth_process_pool(len(season_paths), self.max_workers):
+            _init_season_ranker(self.metric_scorers, self.top_k)
+            yield from map(_rank_season, season_paths, output_paths)
+            return
+
+        executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_season_ranker,
+            initargs=(self.metric_scorers, self.top_k),
+        )
+        try:
+            # Seasons are handed to workers in chunks, as most seasons are quick to rank
+            worker_count = self.max_workers or os.cpu_count() or 1
+            chunk_size = max(1, len(season_paths) // (4 * worker_count))
+            yield from executor.map(_rank_season, season_paths, output_paths, chunksize=chunk_size)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _read_manifest(manifest_path: Path) -> list[Path]:
+    """Season file paths listed one per line, relative to the directory of the manifest"""
+    with open(manifest_path, "r") as manifest_fileio:
+        return [manifest_path.parent / line.strip() for line in manifest_fileio if line.strip()]
+
+
+def handle_input_args() -> argparse.Namespace:
+    arg_parser = argparse.ArgumentParser(
+        description=(
+            "Outputs the ranking table of many independent seasons, one output file per season"
+        )
+    )
+    arg_parser.add_argument(
+        "output_dir", type=Path, help="Directory to write each season's ranking table to"
+    )
+    seasons_group = arg_parser.add_mutually_exclusive_group(required=True)
+    seasons_group.add_argument(
+        "--manifest",
+        type=Path,
+        help="File listing one season file path per line (relative to the manifest's directory)",
+    )
+    seasons_group.add_argument(
+        "--input-dir", type=Path, help="Directory of season files (see --pattern)"
+    )
+    arg_parser.add_argument(
+        "--pattern",
+        default="*.txt",
+        help="Glob pattern of the season files within --input-dir (default: *.txt)",
+    )
+    arg_parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        help="Max number of worker processes ranking seasons (default: CPU count)",
+    )
+    arg_parser.add_argument(
+        "--top-k",
+        type=_positive_int,
+        help="Only output the top K rankings of each season",
+    )
+    arg_parser.add_argument(
+        "--tiebreaker",
+        dest="tiebreakers",
+        action="append",
+        choices=list(TIEBREAKER_METRIC_SCORERS),
+        default=[],
+        help="Metric used to break ties on points (repeatable, applied in the given order)",
+    )
+    args = arg_parser.parse_args(sys.argv[1:])
+    if args.manifest is not None:
+        args.season_paths = _read_manifest(args.manifest)
+    else:
+        args.season_paths = sorted(args.input_dir.glob(args.pattern))
+    return args
+
+
+def main(args: argparse.Namespace):
+    batch_ranker = BatchSeasonRanker(
+        metric_scorers=build_metric_scorers(args), top_k=args.top_k, max_workers=args.workers
+    )
+    try:
+        season_results = batch_ranker.iter_rank_seasons(args.season_paths, args.output_dir)
+        failed_season_count = 0
+        # One JSON line per season (timing + any error), as soon as each season is ranked
+        for season_result in season_results:
+            print(json.dumps(asdict(season_result)), flush=True)
+            if season_result.error is not None:
+                failed_season_count += 1
+    except ValueError as exc:
+        sys.exit(f"Invalid: {exc}\n")
+    if failed_season_count:
+        sys.exit(f"Failed: {failed_season_count} of {len(args.season_paths)} seasons\n")
+
+
+if __name__ == "__main__":
+    main(handle_input_args())
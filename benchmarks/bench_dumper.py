@@ -0,0 +1,66 @@
+"""
+Compares dumping a large ranking table using ToIORankingDumper's per-line flush mode against its
+buffered mode, writing to a file (so that every flush is a real write syscall).
+
+Usage (from the challenge code directory):
+    $ python -m benchmarks.bench_dumper [--teams N] [--buffer-size N]
+"""
+
+import argparse
+import tempfile
+import time
+from typing import Iterable
+
+from base import SoccerMatchScoresLoader, SoccerTeamRanker
+from main import ToIORankingDumper
+
+
+class PreformattedRanker(SoccerTeamRanker):
+    """Ranker returning pre-formatted rankings, so that only the dumping itself is measured"""
+
+    def __init__(self, team_count: int):
+        self.rankings = [
+            f"{ranking}. Team {ranking}, {team_count - ranking} pts"
+            for ranking in range(1, team_count + 1)
+        ]
+
+    def clear(self):
+        self.rankings.clear()
+
+    def load_scores(self, loader: SoccerMatchScoresLoader):
+        pass
+
+    def iter_rankings(self) -> Iterable[str]:
+        return iter(self.rankings)
+
+
+def time_dump(ranker: SoccerTeamRanker, buffer_size: int | None) -> float:
+    with tempfile.TemporaryFile("w") as output_fileio:
+        dumper = ToIORankingDumper(fileio=output_fileio, buffer_size=buffer_size)
+        start_time = time.perf_counter()
+        dumper.dump_rankings(ranker)
+        return time.perf_counter() - start_time
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    arg_parser.add_argument("--teams", type=int, default=1_000_000)
+    arg_parser.add_argument(
+        "--buffer-size", type=int, default=ToIORankingDumper.DEFAULT_BUFFER_SIZE
+    )
+    args = arg_parser.parse_args()
+
+    ranker = PreformattedRanker(args.teams)
+    per_line_time = time_dump(ranker, buffer_size=None)
+    buffered_time = time_dump(ranker, buffer_size=args.buffer_size)
+    print(f"{args.teams} teams: per-line flush {per_line_time:.3f}s")
+    print(
+        f"{args.teams} teams: buffered ({args.buffer_size} chars) {buffered_time:.3f}s, "
+        f"speedup {per_line_time / buffered_time:.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
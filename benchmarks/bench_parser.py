@@ -0,0 +1,50 @@
+"""
+Compares the per-line cost of parsing match scores using MATCH_SCORE_PATTERN against the
+regex-free fast path of FromIOSoccerMatchScoresLoader.
+
+Usage (from the challenge code directory):
+    $ python -m benchmarks.bench_parser [--lines N] [--repeat N]
+"""
+
+import argparse
+import timeit
+from io import StringIO
+
+from main import FromIOSoccerMatchScoresLoader
+
+SHORT_NAME_LINE = "Lions 3, Snakes 3\n"
+LONG_NAME_LINE = f"{'Long Team Name ' * 8}FC 12, {'Other Long Team Name ' * 8}United 7\n"
+
+
+def time_per_line(raw_match_score: str, fast_parse: bool, lines: int, repeat: int) -> float:
+    loader = FromIOSoccerMatchScoresLoader(fileio=StringIO(), fast_parse=fast_parse)
+    best_total = min(
+        timeit.repeat(
+            lambda: loader.parse_match_score(raw_match_score), number=lines, repeat=repeat
+        )
+    )
+    return best_total / lines
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    arg_parser.add_argument("--lines", type=int, default=200_000)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    for label, raw_match_score in (
+        ("short names", SHORT_NAME_LINE),
+        ("long names", LONG_NAME_LINE),
+    ):
+        regex_time = time_per_line(raw_match_score, False, args.lines, args.repeat)
+        fast_time = time_per_line(raw_match_score, True, args.lines, args.repeat)
+        print(
+            f"{label}: regex {regex_time * 1e9:.0f} ns/line, "
+            f"fast {fast_time * 1e9:.0f} ns/line, speedup {regex_time / fast_time:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Deterministic generator of synthetic seasons (match score lines in the input format of main.py).
+
+Usage (from the challenge code directory):
+    $ python -m benchmarks.season_generator <output_path> [--matches N] [--teams N] ...
+"""
+
+import argparse
+import random
+import string
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+NAME_CHARACTERS = string.ascii_letters + string.digits + " @&'-."
+
+
+@dataclass(frozen=True)
+class SeasonConfig:
+    match_count: int = 100_000
+    team_count: int = 1_000
+    # Team name lengths are drawn from a normal distribution, clipped to [min, max]
+    name_length_mean: float = 12.0
+    name_length_stddev: float = 4.0
+    name_length_min: int = 3
+    name_length_max: int = 64
+    # Probability of a match ending in a tie
+    tie_rate: float = 0.25
+    max_score: int = 6
+    seed: int = 0
+
+    def __post_init__(self):
+        if self.match_count < 0:
+            raise ValueError("Match count must be >= 0")
+        elif self.team_count < 2:
+            raise ValueError("Team count must be >= 2")
+        elif not 1 <= self.name_length_min <= self.name_length_max:
+            raise ValueError("Name lengths must satisfy 1 <= min <= max")
+        elif not 0 <= self.tie_rate <= 1:
+            raise ValueError("Tie rate must be within [0, 1]")
+        elif self.max_score < 1:
+            raise ValueError("Max score must be >= 1")
+
+
+def generate_team_names(config: SeasonConfig, rng: random.Random) -> list[str]:
+    team_names = []
+    for team_index in range(config.team_count):
+        # The team index suffix guarantees unique names (regardless of the random part)
+        suffix = f" #{team_index}"
+        name_length = round(rng.gauss(config.name_length_mean, config.name_length_stddev))
+        name_length = min(max(name_length, config.name_length_min), config.name_length_max)
+        random_part_length = max(name_length - len(suffix), 1)
+        random_part = "".join(rng.choices(NAME_CHARACTERS, k=random_part_length))
+        # Team names can't start or end with whitespace
+        team_names.append(f"{random_part.strip() or 'T'}{suffix}")
+    return team_names
+
+
+def generate_season(config: SeasonConfig) -> Iterable[str]:
+    """Yields match score lines (including trailing new line characters)"""
+    rng = random.Random(config.seed)
+    team_names = generate_team_names(config, rng)
+    for _ in range(config.match_count):
+        team_name_a, team_name_b = rng.sample(team_names, 2)
+        if rng.random() < config.tie_rate:
+            team_score_a = team_score_b = rng.randint(0, config.max_score)
+        else:
+            team_score_a, team_score_b = rng.sample(range(config.max_score + 1), 2)
+        yield f"{team_name_a} {team_score_a}, {team_name_b} {team_score_b}\n"
+
+
+def add_season_config_args(arg_parser: argparse.ArgumentParser):
+    defaults = SeasonConfig()
+    arg_parser.add_argument("--matches", type=int, default=defaults.match_count)
+    arg_parser.add_argument("--teams", type=int, default=defaults.team_count)
+    arg_parser.add_argument("--name-length-mean", type=float, default=defaults.name_length_mean)
+    arg_parser.add_argument("--name-length-stddev", type=float, default=defaults.name_length_stddev)
+    arg_parser.add_argument("--name-length-min", type=int, default=defaults.name_length_min)
+    arg_parser.add_argument("--name-length-max", type=int, default=defaults.name_length_max)
+    arg_parser.add_argument("--tie-rate", type=float, default=defaults.tie_rate)
+    arg_parser.add_argument("--max-score", type=int, default=defaults.max_score)
+    arg_parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def season_config_from_args(args: argparse.Namespace) -> SeasonConfig:
+    return SeasonConfig(
+        match_count=args.matches,
+        team_count=args.teams,
+        name_length_mean=args.name_length_mean,
+        name_length_stddev=args.name_length_stddev,
+        name_length_min=args.name_length_min,
+        name_length_max=args.name_length_max,
+        tie_rate=args.tie_rate,
+        max_score=args.max_score,
+        seed=args.seed,
+    )
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    arg_parser.add_argument("output_path", type=Path)
+    add_season_config_args(arg_parser)
+    args = arg_parser.parse_args()
+
+    with open(args.output_path, "w") as output_fileio:
+        output_fileio.writelines(generate_season(season_config_from_args(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Times each stage of the ranking pipeline separately (with peak memory) on a synthetic season, and
+optionally compares the results against a saved baseline.
+
+Usage (from the challenge code directory):
+    $ python -m benchmarks.suite [--output results.json] [--baseline baseline.json] [--threshold 0.1]
+"""
+
+import argparse
+import dataclasses
+import json
+import sys
+import time
+import tracemalloc
+from io import StringIO
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from base import SoccerMatchScoresLoader
+from benchmarks.season_generator import (
+    SeasonConfig,
+    add_season_config_args,
+    generate_season,
+    season_config_from_args,
+)
+from main import (
+    FromIOSoccerMatchScoresLoader,
+    GoalDifferenceMetricScorer,
+    GoalsForMetricScorer,
+    MatchResultMetricScorer,
+    StandardCompetitionSoccerTeamRanker,
+    ToIORankingDumper,
+)
+from models import MatchScore
+
+STAGES = (
+    "iter_match_scores",
+    "load_scores",
+    "load_scores_many_teams",
+    "load_scores_many_teams_tiebreakers",
+    "_generate_rankings",
+    "iter_rankings",
+    "dump_rankings",
+)
+
+
+# The many teams stages load a season with this few matches per team (ie far more teams than
+# matches per batch), so that any per-batch cost growing with the total number of teams shows up
+MANY_TEAMS_MATCHES_PER_TEAM = 4
+
+
+class PreloadedSoccerMatchScoresLoader(SoccerMatchScoresLoader):
+    """Loader of already parsed match scores, so that load_scores can be timed without parsing"""
+
+    def __init__(self, match_scores: list[MatchScore]):
+        self.match_scores = match_scores
+
+    def iter_match_scores(self) -> Iterable[MatchScore]:
+        return iter(self.match_scores)
+
+
+def measure(stage_fn: Callable[[], Any], repeat: int, setup_fn: Callable[[], Any]) -> dict:
+    """
+    Returns the best wall-clock time of a stage across repeats, plus its peak traced memory.
+    Memory is measured within a separate run, as tracing allocations skews timings.
+    """
+    best_seconds = float("inf")
+    for _ in range(repeat):
+        setup_fn()
+        start_time = time.perf_counter()
+        stage_fn()
+        best_seconds = min(best_seconds, time.perf_counter() - start_time)
+
+    setup_fn()
+    tracemalloc.start()
+    try:
+        stage_fn()
+        _, peak_memory_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": best_seconds, "peak_memory_bytes": peak_memory_bytes}
+
+
+def parse_season(config: SeasonConfig) -> list[MatchScore]:
+    return list(
+        FromIOSoccerMatchScoresLoader(
+            fileio=StringIO("".join(generate_season(config))), fast_parse=True
+        ).iter_match_scores()
+    )
+
+
+def run_suite(config: SeasonConfig, repeat: int) -> dict:
+    raw_season = "".join(generate_season(config))
+    match_scores = list(
+        FromIOSoccerMatchScoresLoader(
+            fileio=StringIO(raw_season), fast_parse=True
+        ).iter_match_scores()
+    )
+    ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=[MatchResultMetricScorer()])
+    many_teams_match_scores = parse_season(
+        dataclasses.replace(
+            config,
+            team_count=max(config.team_count, config.match_count // MANY_TEAMS_MATCHES_PER_TEAM),
+        )
+    )
+    many_teams_ranker = StandardCompetitionSoccerTeamRanker(
+        metric_scorers=[MatchResultMetricScorer()]
+    )
+    many_teams_tiebreakers_ranker = StandardCompetitionSoccerTeamRanker(
+        metric_scorers=[
+            MatchResultMetricScorer(),
+            GoalDifferenceMetricScorer(),
+            GoalsForMetricScorer(),
+        ]
+    )
+
+    def reset_ranker():
+        ranker.clear()
+
+    def loaded_ranker():
+        ranker.clear()
+        ranker._accumulate_scores(PreloadedSoccerMatchScoresLoader(match_scores))
+
+    def ranked_ranker():
+        loaded_ranker()
+        ranker._generate_rankings()
+
+    def dump_rankings():
+        ToIORankingDumper(
+            fileio=StringIO(), buffer_size=ToIORankingDumper.DEFAULT_BUFFER_SIZE
+        ).dump_rankings(ranker)
+
+    stage_measurements = {
+        "iter_match_scores": measure(
+            lambda: list(
+                FromIOSoccerMatchScoresLoader(
+                    fileio=StringIO(raw_season), fast_parse=True
+                ).iter_match_scores()
+            ),
+            repeat,
+            lambda: None,
+        ),
+        "load_scores": measure(
+            lambda: ranker._accumulate_scores(PreloadedSoccerMatchScoresLoader(match_scores)),
+            repeat,
+            reset_ranker,
+        ),
+        "load_scores_many_teams": measure(
+            lambda: many_teams_ranker._accumulate_scores(
+                PreloadedSoccerMatchScoresLoader(many_teams_match_scores)
+            ),
+            repeat,
+            many_teams_ranker.clear,
+        ),
+        "load_scores_many_teams_tiebreakers": measure(
+            lambda: many_teams_tiebreakers_ranker._accumulate_scores(
+                PreloadedSoccerMatchScoresLoader(many_teams_match_scores)
+            ),
+            repeat,
+            many_teams_tiebreakers_ranker.clear,
+        ),
+        "_generate_rankings": measure(ranker._generate_rankings, repeat, loaded_ranker),
+        "iter_rankings": measure(lambda: list(ranker.iter_rankings()), repeat, ranked_ranker),
+        "dump_rankings": measure(dump_rankings, repeat, ranked_ranker),
+    }
+    return {
+        "config": config.__dict__,
+        "python_version": sys.version,
+        "stages": {stage: stage_measurements[stage] for stage in STAGES},
+    }
+
+
+def find_regressions(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Returns a description of every stage whose time (or peak memory) is more than `threshold`
+    (ie 0.1 for 10%) above the baseline's
+    """
+    regressions = []
+    for stage, measurements in results["stages"].items():
+        baseline_measurements = baseline.get("stages", {}).get(stage)
+        if baseline_measurements is None:
+            continue
+        for measurement in ("seconds", "peak_memory_bytes"):
+            baseline_value = baseline_measurements.get(measurement)
+            if not baseline_value:
+                continue
+            relative_change = measurements[measurement] / baseline_value - 1
+            if relative_change > threshold:
+                regressions.append(
+                    f"{stage} {measurement}: {measurements[measurement]:.6g} vs baseline "
+                    f"{baseline_value:.6g} (+{relative_change:.1%})"
+                )
+    return regressions
+
+
+def format_results(results: dict) -> Iterable[str]:
+    for stage, measurements in results["stages"].items():
+        yield (
+            f"{stage}: {measurements['seconds']:.4f}s, "
+            f"peak memory {measurements['peak_memory_bytes'] / 1024 / 1024:.1f} MiB"
+        )
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    add_season_config_args(arg_parser)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--output", type=Path, help="Path to write the JSON results to")
+    arg_parser.add_argument("--baseline", type=Path, help="Path of JSON results to compare against")
+    arg_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Max allowed relative increase over the baseline (ie 0.1 for 10%%)",
+    )
+    args = arg_parser.parse_args()
+
+    results = run_suite(season_config_from_args(args), repeat=args.repeat)
+    for line in format_results(results):
+        print(line)
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2))
+
+    if args.baseline is not None:
+        regressions = find_regressions(
+            results, json.loads(args.baseline.read_text()), args.threshold
+        )
+        if regressions:
+            sys.exit("Regressions found:\n" + "\n".join(regressions))
+        print(f"No regressions above {args.threshold:.0%} of baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,156 @@
+import argparse
+import bz2
+import glob
+import gzip
+import hashlib
+import heapq
+import io
+import json
+import lzma
+import mmap
+import operator
+import os
+import queue
 import re
+import struct
 import sys
-from collections import defaultdict
-from contextlib import nullcontext
+import tempfile
+import threading
+import time
+import zlib
+from array import array
+from bisect import bisect_left, insort
+from collections import defaultdict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
+from itertools import chain, groupby, islice, repeat
+from multiprocessing import get_all_start_methods, get_context
 from pathlib import Path
 from sys import stdin, stdout
-from typing import Iterable, Literal, TextIO, cast
+from typing import (
+    BinaryIO,
+    Callable,
+    Iterable,
+    Literal,
+    Sequence,
+    TextIO,
+    TypeVar,
+    cast,
+)
 
-from base import MetricScorer, RankingDumper, SoccerMatchScoresLoader, SoccerTeamRanker
-from models import MatchScore, SoccerMatchResult, TeamGameScore
+try:
+    import numpy as np
+except ImportError:  # NumPy is an optional dependency, only used to vectorize batch scoring
+    np = None
 
+from base import (
+    BatchMetricScorer,
+    ColumnarSoccerMatchScoresLoader,
+    FusedMetricScorer,
+    MetricScorer,
+    PipelineObserver,
+    RankingDumper,
+    SoccerMatchScoresLoader,
+    SoccerTeamMetricTotalsLoader,
+    SoccerTeamRanker,
+    TupleSoccerMatchScoresLoader,
+)
+from models import (
+    MAX_SCORE,
+    InvalidLine,
+    MatchCounterWeights,
+    MatchScore,
+    MatchScoreColumns,
+    MatchScoreTuple,
+    SoccerMatchResult,
+    TeamGameScore,
+    TeamMetricTotals,
+)
 
-class FromIOSoccerMatchScoresLoader(SoccerMatchScoresLoader):
+# Compressed input formats, detected by file extension or else by magic bytes
+COMPRESSION_MODULES = {"gzip": gzip, "bz2": bz2, "xz": lzma}
+COMPRESSION_FILE_SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+COMPRESSION_MAGIC_PATTERNS = {
+    "gzip": re.compile(rb"\x1f\x8b"),
+    # "BZh" alone could also start a plain text team name, so the block size digit + the magic of
+    # the first block (or of the end of stream, for an empty file) are matched too
+    "bz2": re.compile(rb"BZh[1-9](?:1AY&SY|\x17rE8P\x90)"),
+    "xz": re.compile(rb"\xfd7zXZ\x00"),
+}
+COMPRESSION_MAGIC_SIZE = 10
+
+# Scores with up to this many digits are always <= MAX_SCORE, longer ones (ie with leading zeros)
+# are left to the text parser to validate
+MAX_FAST_SCORE_DIGITS = len(str(MAX_SCORE)) - 1
+
+# A MatchScore or a MatchScoreTuple, depending on the parse function of a loader
+ParsedMatchScore = TypeVar("ParsedMatchScore", MatchScore, MatchScoreTuple)
+
+
+@contextmanager
+def observe_stage(observer: PipelineObserver | None, stage: str):
+    if observer is None:
+        yield
+        return
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        observer.on_stage_finished(stage, time.perf_counter() - start_time)
+
+
+class StatsPipelineObserver(PipelineObserver):
+    """Collects stage timings + counters into a JSON-serializable summary (ie for --profile)"""
+
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.stage_seconds: dict[str, float] = defaultdict(float)
+        self.counters: dict[str, int] = defaultdict(int)
+
+    def on_stage_finished(self, stage: str, seconds: float):
+        self.stage_seconds[stage] += seconds
+
+    def on_count(self, counter: str, count: int):
+        self.counters[counter] += count
+
+    def summary(self) -> dict:
+        load_seconds = self.stage_seconds.get("load_scores")
+        dump_seconds = self.stage_seconds.get("dump_rankings")
+        return {
+            # Note that load_scores includes generate_rankings
+            "stage_seconds": dict(self.stage_seconds),
+            "counters": dict(self.counters),
+            "throughput": {
+                "lines_per_second": (
+                    self.counters.get("lines_read", 0) / load_seconds if load_seconds else None
+                ),
+                "matches_per_second": (
+                    self.counters.get("matches_parsed", 0) / load_seconds if load_seconds else None
+                ),
+                "rankings_per_second": (
+                    self.counters.get("rankings_written", 0) / dump_seconds
+                    if dump_seconds
+                    else None
+                ),
+            },
+            "total_seconds": time.perf_counter() - self.start_time,
+        }
+
+
+class LenientLinesLoaderMixin:
+    """Skips invalid lines when lenient (ie given invalid_lines), for line by line loaders"""
+
+    lines_read: int
+    invalid_lines: list[InvalidLine] | None
+
+    def _skip_invalid_line(self, raw_line: str, exc: ValueError):
+        """Raises exc, unless lenient, where the (last read) invalid line is skipped instead"""
+        if self.invalid_lines is None:
+            raise exc
+        self.invalid_lines.append(InvalidLine(self.lines_read, raw_line.rstrip("\r\n"), str(exc)))
+
+
+class FromIOSoccerMatchScoresLoader(LenientLinesLoaderMixin, TupleSoccerMatchScoresLoader):
     # Something akin to:
     # Team N@m3 12345, Other T3am Name 5
     MATCH_SCORE_PATTERN = re.compile(
@@ -18,32 +158,1268 @@ class FromIOSoccerMatchScoresLoader(SoccerMatchScoresLoader):
         r"(?P<team_name_b>\S{1}(?:.*\S{1})?) (?P<team_score_b>\d+)"
     )
 
-    def __init__(self, fileio: TextIO):
+    def __init__(
+        self,
+        fileio: TextIO,
+        fast_parse: bool = False,
+        observer: PipelineObserver | None = None,
+        invalid_lines: list[InvalidLine] | None = None,
+    ):
         self.fileio = fileio
+        self.observer = observer
+        self.lines_read = 0
+        # When enabled, well-formed lines are parsed using plain string operations and only lines
+        # that look ambiguous fall back to MATCH_SCORE_PATTERN (accepting + rejecting the same input)
+        self.fast_parse = fast_parse
+        # When given (lenient mode), invalid lines are skipped + appended to it rather than raised
+        self.invalid_lines = invalid_lines
+        # A strict decoding error would otherwise escape readline (losing its whole buffered chunk),
+        # so undecodable bytes are kept as surrogates instead, for their line to be skipped
+        self.input_encoding: str | None = None
+        if (
+            invalid_lines is not None
+            and isinstance(fileio, io.TextIOWrapper)
+            and fileio.errors == "strict"
+        ):
+            fileio.reconfigure(errors="surrogateescape")
+            self.input_encoding = fileio.encoding
+
+    @classmethod
+    def _fast_parse_match_score(cls, raw_match_score: str) -> tuple[str, str, str, str] | None:
+        """
+        Parses an unambiguous line without any regex. Returns None if the line may need the
+        backtracking of MATCH_SCORE_PATTERN (ie team names containing ", ", trailing text, etc.)
+        """
+        line = raw_match_score[:-1] if raw_match_score.endswith("\n") else raw_match_score
+        if "\n" in line or line.count(", ") != 1:
+            return None
+        raw_team_score_a, raw_team_score_b = line.split(", ")
+        team_name_a, _, team_score_a = raw_team_score_a.rpartition(" ")
+        team_name_b, _, team_score_b = raw_team_score_b.rpartition(" ")
+        if not (
+            team_name_a
+            and team_name_b
+            and team_score_a.isdecimal()
+            and team_score_b.isdecimal()
+            and not team_name_a[0].isspace()
+            and not team_name_a[-1].isspace()
+            and not team_name_b[0].isspace()
+            and not team_name_b[-1].isspace()
+        ):
+            return None
+        return team_name_a, team_score_a, team_name_b, team_score_b
+
+    @classmethod
+    def _regex_parse_match_score(cls, raw_match_score: str) -> tuple[str, str, str, str] | None:
+        regex_match = re.match(cls.MATCH_SCORE_PATTERN, raw_match_score)
+        if regex_match is None or len(regex_match.groups()) != 4:
+            return None
+        return cast(tuple[str, str, str, str], regex_match.groups())
+
+    def _parse_match_score_parts(self, raw_match_score: str) -> tuple[str, str, str, str]:
+        match_score_parts = None
+        if self.fast_parse:
+            match_score_parts = self._fast_parse_match_score(raw_match_score)
+        if match_score_parts is None:
+            match_score_parts = self._regex_parse_match_score(raw_match_score)
+        if match_score_parts is None:
+            # Handling this as a loud error to avoid returning a ranking with invalid input
+            raise ValueError("Invalid Match Score found in input")
+        return match_score_parts
+
+    def parse_match_score(self, raw_match_score: str) -> MatchScore:
+        team_name_a, team_score_a, team_name_b, team_score_b = self._parse_match_score_parts(
+            raw_match_score
+        )
+        return MatchScore(
+            TeamGameScore(team_name_a, int(team_score_a)),
+            TeamGameScore(team_name_b, int(team_score_b)),
+        )
+
+    def parse_match_score_tuple(self, raw_match_score: str) -> MatchScoreTuple:
+        """
+        Same as parse_match_score, but without building any TeamGameScore/MatchScore objects.
+        The same validation is performed inline.
+        """
+        team_name_a, raw_team_score_a, team_name_b, raw_team_score_b = (
+            self._parse_match_score_parts(raw_match_score)
+        )
+        team_score_a = int(raw_team_score_a)
+        team_score_b = int(raw_team_score_b)
+        if (
+            not team_name_a
+            or not team_name_b
+            or team_score_a < 0
+            or team_score_b < 0
+            or team_score_a > MAX_SCORE
+            or team_score_b > MAX_SCORE
+            or team_name_a == team_name_b
+        ):
+            # Building the models raises the exact same validation error as parse_match_score would
+            MatchScore(
+                TeamGameScore(team_name_a, team_score_a), TeamGameScore(team_name_b, team_score_b)
+            )
+        return team_name_a, team_score_a, team_name_b, team_score_b
+
+    def _iter_raw_match_scores(self) -> Iterable[str]:
+        lines_read_before = self.lines_read
+        try:
+            while not self.fileio.closed:
+                raw_match_score = self.fileio.readline()
+                if not raw_match_score:
+                    break
+                self.lines_read += 1
+                yield raw_match_score
+        finally:
+            if self.observer is not None:
+                self.observer.on_count("lines_read", self.lines_read - lines_read_before)
+
+    def _iter_leniently_parsed(
+        self, parse_function: Callable[[str], ParsedMatchScore]
+    ) -> Iterable[ParsedMatchScore]:
+        for raw_match_score in self._iter_raw_match_scores():
+            if self.input_encoding is not None and not raw_match_score.isascii():
+                raw_bytes = raw_match_score.encode(self.input_encoding, "surrogateescape")
+                try:
+                    raw_bytes.decode(self.input_encoding)
+                except UnicodeDecodeError as exc:
+                    self._skip_invalid_line(raw_bytes.decode(self.input_encoding, "replace"), exc)
+                    continue
+            try:
+                parsed_match_score = parse_function(raw_match_score)
+            except ValueError as exc:
+                self._skip_invalid_line(raw_match_score, exc)
+                continue
+            yield parsed_match_score
 
     def iter_match_scores(self) -> Iterable[MatchScore]:
-        while not self.fileio.closed:
-            raw_match_score = self.fileio.readline()
-            if not raw_match_score:
-                break
-            regex_match = re.match(self.MATCH_SCORE_PATTERN, raw_match_score)
-            if regex_match is None or len(regex_match.groups()) != 4:
-                # Handling this as a loud error to avoid returning a ranking with invalid input
-                raise ValueError("Invalid Match Score found in input")
-            team_name_a, team_score_a, team_name_b, team_score_b = regex_match.groups()
+        if self.invalid_lines is not None:
+            return self._iter_leniently_parsed(self.parse_match_score)
+        return map(self.parse_match_score, self._iter_raw_match_scores())
+
+    def iter_match_score_tuples(self) -> Iterable[MatchScoreTuple]:
+        if self.invalid_lines is not None:
+            return self._iter_leniently_parsed(self.parse_match_score_tuple)
+        return map(self.parse_match_score_tuple, self._iter_raw_match_scores())
+
+
+class FromBinaryIOSoccerMatchScoresLoader(LenientLinesLoaderMixin, TupleSoccerMatchScoresLoader):
+    """
+    Loads match scores from a binary (UTF-8 encoded) input, parsing raw bytes lines rather than
+    decoding every line first. Each distinct team name is only decoded once, through a bytes to
+    str interning cache, so repeated team names share a single str object.
+
+    Accepts + rejects exactly the same input as FromIOSoccerMatchScoresLoader reading the same
+    input in text mode: lines that can't be parsed unambiguously at the bytes level (ie containing
+    a carriage return, or a team name that isn't valid UTF-8 or starts/ends with whitespace) are
+    decoded + parsed as text instead.
+    """
+
+    def __init__(
+        self,
+        fileio: BinaryIO,
+        observer: PipelineObserver | None = None,
+        invalid_lines: list[InvalidLine] | None = None,
+    ):
+        self.fileio = fileio
+        self.observer = observer
+        self.lines_read = 0
+        self.team_names: dict[bytes, str] = {}
+        # Only used to parse + validate the lines that fall back to text, never reads its fileio
+        self.text_parser = FromIOSoccerMatchScoresLoader(fileio=io.StringIO(), fast_parse=True)
+        # When given (lenient mode), invalid lines are skipped + appended to it rather than raised
+        self.invalid_lines = invalid_lines
+
+    def _iter_text_match_score_tuples(self, raw_match_score: bytes) -> Iterable[MatchScoreTuple]:
+        try:
+            # Universal newlines (same as text mode), ie a carriage return also ends a line
+            match_score_lines = io.StringIO(raw_match_score.decode(), newline=None)
+        except UnicodeDecodeError as exc:
+            self.lines_read += 1
+            self._skip_invalid_line(raw_match_score.decode(errors="replace"), exc)
+            return
+        for match_score_line in match_score_lines:
+            self.lines_read += 1
+            try:
+                match_score_tuple = self.text_parser.parse_match_score_tuple(match_score_line)
+            except ValueError as exc:
+                self._skip_invalid_line(match_score_line, exc)
+                continue
+            yield match_score_tuple
+
+    def _intern_team_name(self, raw_team_name: bytes) -> str | None:
+        """
+        Decodes + caches a team name seen for the first time, once validated the same way the text
+        parser would (ie not starting/ending with whitespace, including non-ASCII whitespace).
+        Anything else is left to the text parser (returning None), to be rejected as it would be.
+        """
+        if not raw_team_name:
+            return None
+        try:
+            team_name = raw_team_name.decode()
+        except UnicodeDecodeError:
+            # Left to the text parser, so that it's skipped as an invalid line when lenient
+            return None
+        if team_name[0].isspace() or team_name[-1].isspace():
+            return None
+        self.team_names[raw_team_name] = team_name
+        return team_name
+
+    def iter_match_score_tuples(self) -> Iterable[MatchScoreTuple]:
+        team_names = self.team_names
+        lines_read_before = self.lines_read
+        try:
+            for raw_match_score in self.fileio:
+                line = raw_match_score.rstrip(b"\n")
+                if b"\r" in line or line.count(b", ") != 1:
+                    yield from self._iter_text_match_score_tuples(raw_match_score)
+                    continue
+                raw_team_score_a, raw_team_score_b = line.split(b", ")
+                raw_team_name_a, _, raw_score_a = raw_team_score_a.rpartition(b" ")
+                raw_team_name_b, _, raw_score_b = raw_team_score_b.rpartition(b" ")
+                # Only team names that were already validated are cached, so the (vast majority of)
+                # lines with known team names skip validating them again
+                team_name_a = team_names.get(raw_team_name_a)
+                if team_name_a is None:
+                    team_name_a = self._intern_team_name(raw_team_name_a)
+                team_name_b = team_names.get(raw_team_name_b)
+                if team_name_b is None:
+                    team_name_b = self._intern_team_name(raw_team_name_b)
+                if (
+                    team_name_a is None
+                    or team_name_b is None
+                    or team_name_a is team_name_b
+                    or not raw_score_a.isdigit()
+                    or not raw_score_b.isdigit()
+                    or len(raw_score_a) > MAX_FAST_SCORE_DIGITS
+                    or len(raw_score_b) > MAX_FAST_SCORE_DIGITS
+                ):
+                    yield from self._iter_text_match_score_tuples(raw_match_score)
+                    continue
+                self.lines_read += 1
+                yield team_name_a, int(raw_score_a), team_name_b, int(raw_score_b)
+        finally:
+            if self.observer is not None:
+                self.observer.on_count("lines_read", self.lines_read - lines_read_before)
+
+    def iter_match_scores(self) -> Iterable[MatchScore]:
+        for team_name_a, team_score_a, team_name_b, team_score_b in self.iter_match_score_tuples():
             yield MatchScore(
-                TeamGameScore(team_name_a, int(team_score_a)),
-                TeamGameScore(team_name_b, int(team_score_b)),
+                TeamGameScore(team_name_a, team_score_a), TeamGameScore(team_name_b, team_score_b)
+            )
+
+
+class BoundedReader(io.RawIOBase):
+    """Raw binary reader of (at most) the next size bytes of a raw binary input"""
+
+    def __init__(self, raw_fileio: io.RawIOBase, size: int):
+        if size < 0:
+            raise ValueError("Size must be >= 0")
+        super().__init__()
+        self.raw_fileio = raw_fileio
+        self.remaining_size = size
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if not self.remaining_size:
+            return 0
+        with memoryview(buffer) as buffer_view:
+            read_size = self.raw_fileio.readinto(buffer_view[: self.remaining_size]) or 0
+        self.remaining_size -= read_size
+        return read_size
+
+
+class PipelinedDecompressingReader(io.RawIOBase):
+    """
+    Raw binary reader of a compressed input, decompressed within a background thread that feeds
+    blocks of decompressed bytes through a bounded queue. The stdlib decompressors release the GIL,
+    so decompressing the next blocks overlaps with parsing the current one, while the bounded queue
+    caps how far ahead (and how much memory) decompression can run.
+    """
+
+    DEFAULT_BLOCK_SIZE = 1024 * 1024
+    DEFAULT_MAX_QUEUED_BLOCKS = 8
+
+    def __init__(
+        self,
+        compressed_fileio: BinaryIO,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        max_queued_blocks: int = DEFAULT_MAX_QUEUED_BLOCKS,
+    ):
+        if block_size <= 0:
+            raise ValueError("Block size must be > 0")
+        elif max_queued_blocks <= 0:
+            raise ValueError("Max queued blocks must be > 0")
+        super().__init__()
+        # ie a gzip.GzipFile, bz2.BZ2File or lzma.LZMAFile (closed along with this reader)
+        self.compressed_fileio = compressed_fileio
+        self.block_size = block_size
+        # Holds blocks of decompressed bytes, then an empty block (EOF) or the decompression error
+        self.blocks: queue.Queue[bytes | Exception] = queue.Queue(maxsize=max_queued_blocks)
+        self.block = memoryview(b"")
+        self.eof = False
+        self.stopped = threading.Event()
+        self.decompress_thread = threading.Thread(target=self._decompress, daemon=True)
+        self.decompress_thread.start()
+
+    def _decompress(self):
+        try:
+            while not self.stopped.is_set():
+                block = self.compressed_fileio.read(self.block_size)
+                self.blocks.put(block)
+                if not block:
+                    break
+        except (EOFError, OSError, lzma.LZMAError, zlib.error) as exc:
+            # Truncated or corrupted compressed data is invalid input, just like an invalid line
+            # (bz2 raises a bare OSError for it, and gzip an OSError subclass)
+            self.blocks.put(ValueError(f"Invalid compressed input: {exc}"))
+        except Exception as exc:
+            self.blocks.put(exc)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self.block:
+            if self.eof:
+                return 0
+            block = self.blocks.get()
+            if isinstance(block, Exception):
+                self.eof = True
+                raise block
+            elif not block:
+                self.eof = True
+                return 0
+            self.block = memoryview(block)
+        read_size = min(len(buffer), len(self.block))
+        buffer[:read_size] = self.block[:read_size]
+        self.block = self.block[read_size:]
+        return read_size
+
+    def close(self):
+        # Also called when garbage collected, even if the constructor raised before starting
+        if not self.closed and hasattr(self, "decompress_thread"):
+            self.stopped.set()
+            # Unblocking the decompress thread if it's waiting on a full queue, it then sees the
+            # stopped event (after at most one more block) and exits
+            while self.decompress_thread.is_alive():
+                try:
+                    self.blocks.get(timeout=0.01)
+                except queue.Empty:
+                    pass
+            self.decompress_thread.join()
+            self.compressed_fileio.close()
+        super().close()
+
+
+def detect_compression(file_path: Path) -> str | None:
+    """
+    Returns the compression format of a file (a key of COMPRESSION_MODULES), or None for plain
+    text. Detected from the file extension first, then from the file's leading magic bytes.
+    """
+    compression = COMPRESSION_FILE_SUFFIXES.get(file_path.suffix.lower())
+    if compression is not None:
+        return compression
+    with open(file_path, "rb") as input_fileio:
+        magic = input_fileio.read(COMPRESSION_MAGIC_SIZE)
+    for compression, magic_pattern in COMPRESSION_MAGIC_PATTERNS.items():
+        if magic_pattern.match(magic):
+            return compression
+    return None
+
+
+def open_input_file(file_path: Path) -> BinaryIO:
+    """Opens an input file for binary reading, transparently decompressing compressed files"""
+    compression = detect_compression(file_path)
+    if compression is None:
+        return open(file_path, "rb")
+    compressed_fileio = cast(BinaryIO, COMPRESSION_MODULES[compression].open(file_path, "rb"))
+    return cast(BinaryIO, io.BufferedReader(PipelinedDecompressingReader(compressed_fileio)))
+
+
+class CachedFromFileSoccerMatchScoresLoader(ColumnarSoccerMatchScoresLoader):
+    """
+    Loads match scores from a file, using a compact binary cache of the parsed season so that
+    loading the same (unmodified) file again skips text parsing altogether.
+
+    Cache files are keyed by the file's resolved path and are only used if the file's size +
+    modification time still match. They are written in native byte order (they're local caches) as:
+    - Header: magic, source file size, source file mtime (ns), team count, match score count
+    - Fixed-width columns: team A scores, team B scores (int64), team A IDs, team B IDs (uint32)
+    - Interned team name table: UTF-8 byte length of each team name (uint32), then the UTF-8 names
+    On later runs, the cache file is memory-mapped and match score columns are read straight from it.
+    """
+
+    CACHE_MAGIC = b"SOCCSEA1"
+    CACHE_HEADER = struct.Struct("=8sQqQQ")
+    CACHE_FILE_SUFFIX = ".season"
+    SCORE_TYPECODE = "q"
+    TEAM_ID_TYPECODE = "I"
+
+    def __init__(
+        self,
+        file_path: Path,
+        cache_dir: Path,
+        fast_parse: bool = False,
+        observer: PipelineObserver | None = None,
+    ):
+        self.file_path = file_path
+        self.cache_dir = cache_dir
+        self.fast_parse = fast_parse
+        self.observer = observer
+
+    @property
+    def cache_path(self) -> Path:
+        path_digest = hashlib.sha256(str(self.file_path.resolve()).encode()).hexdigest()
+        return self.cache_dir / f"{path_digest[:32]}{self.CACHE_FILE_SUFFIX}"
+
+    def _parse_match_score_columns(self) -> MatchScoreColumns:
+        team_ids: dict[str, int] = {}
+        team_a_ids = array(self.TEAM_ID_TYPECODE)
+        team_b_ids = array(self.TEAM_ID_TYPECODE)
+        team_a_scores = array(self.SCORE_TYPECODE)
+        team_b_scores = array(self.SCORE_TYPECODE)
+        with open_input_file(self.file_path) as input_fileio:
+            loader: TupleSoccerMatchScoresLoader
+            if self.fast_parse:
+                loader = FromBinaryIOSoccerMatchScoresLoader(
+                    fileio=input_fileio, observer=self.observer
+                )
+            else:
+                loader = FromIOSoccerMatchScoresLoader(
+                    fileio=io.TextIOWrapper(input_fileio), observer=self.observer
+                )
+            for (
+                team_name_a,
+                team_score_a,
+                team_name_b,
+                team_score_b,
+            ) in loader.iter_match_score_tuples():
+                team_a_ids.append(team_ids.setdefault(team_name_a, len(team_ids)))
+                team_b_ids.append(team_ids.setdefault(team_name_b, len(team_ids)))
+                team_a_scores.append(team_score_a)
+                team_b_scores.append(team_score_b)
+        return MatchScoreColumns(
+            team_names=list(team_ids),
+            team_a_ids=team_a_ids,
+            team_b_ids=team_b_ids,
+            team_a_scores=team_a_scores,
+            team_b_scores=team_b_scores,
+        )
+
+    def _write_cache(self, file_stat: os.stat_result, match_score_columns: MatchScoreColumns):
+        encoded_team_names = [team_name.encode() for team_name in match_score_columns.team_names]
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Writing to a temporary file first, so that a partially written cache is never read
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=self.cache_dir, suffix=self.CACHE_FILE_SUFFIX, delete=False
+        ) as cache_fileio:
+            cache_fileio.write(
+                self.CACHE_HEADER.pack(
+                    self.CACHE_MAGIC,
+                    file_stat.st_size,
+                    file_stat.st_mtime_ns,
+                    len(encoded_team_names),
+                    len(match_score_columns.team_a_ids),
+                )
+            )
+            for column in (
+                match_score_columns.team_a_scores,
+                match_score_columns.team_b_scores,
+                match_score_columns.team_a_ids,
+                match_score_columns.team_b_ids,
+            ):
+                cast(array, column).tofile(cache_fileio)
+            array(self.TEAM_ID_TYPECODE, map(len, encoded_team_names)).tofile(cache_fileio)
+            cache_fileio.writelines(encoded_team_names)
+        os.replace(cache_fileio.name, self.cache_path)
+
+    def _iter_cached_match_score_columns(
+        self, file_stat: os.stat_result
+    ) -> Iterable[MatchScoreColumns]:
+        """
+        Yields the match score columns from a valid cache file, or nothing if there isn't one (or
+        it's empty, truncated or otherwise corrupted, so that the source file is parsed again)
+        """
+        try:
+            cache_fileio = open(self.cache_path, "rb")
+        except FileNotFoundError:
+            return
+        with cache_fileio:
+            # An empty file can't be memory-mapped
+            if os.fstat(cache_fileio.fileno()).st_size < self.CACHE_HEADER.size:
+                return
+            with mmap.mmap(cache_fileio.fileno(), 0, access=mmap.ACCESS_READ) as mapped_cache:
+                yield from self._iter_mapped_match_score_columns(mapped_cache, file_stat)
+
+    def _iter_mapped_match_score_columns(
+        self, mapped_cache: mmap.mmap, file_stat: os.stat_result
+    ) -> Iterable[MatchScoreColumns]:
+        magic, source_size, source_mtime_ns, team_count, match_count = (
+            self.CACHE_HEADER.unpack_from(mapped_cache)
+        )
+        if (magic, source_size, source_mtime_ns) != (
+            self.CACHE_MAGIC,
+            file_stat.st_size,
+            file_stat.st_mtime_ns,
+        ):
+            return
+        column_specs = (
+            (self.SCORE_TYPECODE, match_count),
+            (self.SCORE_TYPECODE, match_count),
+            (self.TEAM_ID_TYPECODE, match_count),
+            (self.TEAM_ID_TYPECODE, match_count),
+            (self.TEAM_ID_TYPECODE, team_count),
+        )
+        team_names_offset = self.CACHE_HEADER.size + sum(
+            item_count * array(typecode).itemsize for typecode, item_count in column_specs
+        )
+        # Checked before casting any column, as a truncated column can't be cast
+        if team_names_offset > len(mapped_cache):
+            return
+
+        cache_view = memoryview(mapped_cache)
+        columns: list[memoryview] = []
+        try:
+            offset = self.CACHE_HEADER.size
+            for typecode, item_count in column_specs:
+                column_size = item_count * array(typecode).itemsize
+                columns.append(cache_view[offset : offset + column_size].cast(typecode))
+                offset += column_size
+            team_a_scores, team_b_scores, team_a_ids, team_b_ids, team_name_lengths = columns
+            if offset + sum(team_name_lengths) != len(mapped_cache):
+                return
+            team_names = []
+            for team_name_length in team_name_lengths:
+                try:
+                    team_names.append(str(cache_view[offset : offset + team_name_length], "utf-8"))
+                except UnicodeDecodeError:
+                    return
+                offset += team_name_length
+
+            yield MatchScoreColumns(
+                team_names=team_names,
+                team_a_ids=team_a_ids,
+                team_b_ids=team_b_ids,
+                team_a_scores=team_a_scores,
+                team_b_scores=team_b_scores,
+            )
+        finally:
+            # Views into the memory-mapped file must be released before it can be closed, even
+            # when the cache file turns out to be invalid
+            for column in columns:
+                column.release()
+            cache_view.release()
+
+    def iter_match_score_columns(self) -> Iterable[MatchScoreColumns]:
+        file_stat = os.stat(self.file_path)
+        cache_hit = False
+        for match_score_columns in self._iter_cached_match_score_columns(file_stat):
+            cache_hit = True
+            yield match_score_columns
+        if cache_hit:
+            return
+
+        match_score_columns = self._parse_match_score_columns()
+        self._write_cache(file_stat, match_score_columns)
+        yield match_score_columns
+
+    def iter_match_scores(self) -> Iterable[MatchScore]:
+        for match_score_columns in self.iter_match_score_columns():
+            team_names = match_score_columns.team_names
+            for team_a_id, team_b_id, team_a_score, team_b_score in zip(
+                match_score_columns.team_a_ids,
+                match_score_columns.team_b_ids,
+                match_score_columns.team_a_scores,
+                match_score_columns.team_b_scores,
+            ):
+                yield MatchScore(
+                    TeamGameScore(team_names[team_a_id], team_a_score),
+                    TeamGameScore(team_names[team_b_id], team_b_score),
+                )
+
+
+class InvalidLineQuarantine:
+    """
+    Error budget of a lenient run: the invalid lines skipped by loaders are written to a quarantine
+    file (as JSON lines, along with their source + line number) rather than aborting the run on the
+    first one. Every invalid line is reported in a single pass, and the run only fails afterwards if
+    there were more than max_invalid_lines of them.
+    """
+
+    def __init__(self, fileio: TextIO, max_invalid_lines: int = 0):
+        if max_invalid_lines < 0:
+            raise ValueError("Max invalid lines must be >= 0")
+        self.fileio = fileio
+        self.max_invalid_lines = max_invalid_lines
+        self.invalid_line_count = 0
+
+    def quarantine(self, source: str, invalid_lines: Iterable[InvalidLine], line_offset: int = 0):
+        """Writes invalid lines of source, numbered from line_offset (ie the start of a chunk)"""
+        for line_number, raw_line, error in invalid_lines:
+            self.invalid_line_count += 1
+            self.fileio.write(
+                json.dumps(
+                    {
+                        "source": source,
+                        "line_number": line_offset + line_number,
+                        "line": raw_line,
+                        "error": error,
+                    }
+                )
+                + "\n"
+            )
+
+    def check_error_budget(self):
+        if self.invalid_line_count > self.max_invalid_lines:
+            raise ValueError(
+                f"Found {self.invalid_line_count} invalid lines in input, more than the error"
+                f" budget of {self.max_invalid_lines}"
+            )
+
+
+def _worth_process_pool(task_count: int, max_workers: int | None) -> bool:
+    """
+    Whether tasks are worth running within a pool of worker processes, rather than serially within
+    the current process: its startup is only worth paying for with more than a single task (and
+    worker). Tasks run within a pool are module-level functions, so that they can be pickled.
+    """
+    return task_count > 1 and max_workers != 1
+
+
+def _observe_lines_read(
+    observer: PipelineObserver | None, totals: TeamMetricTotals
+) -> TeamMetricTotals:
+    if observer is not None:
+        observer.on_count("lines_read", totals.lines_read)
+    return totals
+
+
+def _load_chunk_metric_totals(
+    chunk_fileio: BinaryIO, metric_scorers: list[MetricScorer], fast_parse: bool, lenient: bool
+) -> TeamMetricTotals:
+    """
+    Parses + scores the match scores of a chunk of input, returning the per-team totals (along with
+    the skipped invalid lines, numbered within the chunk, if lenient)
+    """
+    invalid_lines: list[InvalidLine] | None = [] if lenient else None
+    loader: FromBinaryIOSoccerMatchScoresLoader | FromIOSoccerMatchScoresLoader
+    if fast_parse:
+        loader = FromBinaryIOSoccerMatchScoresLoader(
+            fileio=chunk_fileio, invalid_lines=invalid_lines
+        )
+    else:
+        # Wrapping the raw bytes in the same text layer that `open(file_path, "r")` would use, so
+        # that decoding + newline handling are identical to reading the whole input serially
+        loader = FromIOSoccerMatchScoresLoader(
+            fileio=io.TextIOWrapper(chunk_fileio), invalid_lines=invalid_lines
+        )
+    ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=metric_scorers)
+    with chunk_fileio:
+        ranker._accumulate_scores(loader)
+    totals = ranker.partial_totals()
+    totals.lines_read = loader.lines_read
+    totals.invalid_lines = invalid_lines or []
+    return totals
+
+
+def _load_file_chunk_metric_totals(
+    file_path: Path,
+    start: int,
+    end: int,
+    metric_scorers: list[MetricScorer],
+    fast_parse: bool,
+    lenient: bool,
+) -> TeamMetricTotals:
+    """
+    Parses + scores the match scores within the byte range [start, end) of a file (compressed files
+    are never split, their single range is the whole file).
+    """
+    chunk_fileio: BinaryIO
+    if detect_compression(file_path) is not None:
+        chunk_fileio = open_input_file(file_path)
+    else:
+        with open(file_path, "rb") as input_fileio:
+            with mmap.mmap(input_fileio.fileno(), 0, access=mmap.ACCESS_READ) as mapped_input:
+                chunk_fileio = io.BytesIO(mapped_input[start:end])
+    return _load_chunk_metric_totals(chunk_fileio, metric_scorers, fast_parse, lenient)
+
+
+def _load_block_metric_totals(
+    block: bytes, metric_scorers: list[MetricScorer], fast_parse: bool, lenient: bool
+) -> TeamMetricTotals:
+    """
+    Parses + scores the match scores of a block of complete lines read from a stream.
+    """
+    return _load_chunk_metric_totals(io.BytesIO(block), metric_scorers, fast_parse, lenient)
+
+
+class ParallelFromFilesSoccerTeamMetricTotalsLoader(SoccerTeamMetricTotalsLoader):
+    """
+    Memory-maps files, splits each into byte ranges aligned to newlines and then parses + scores
+    every range (across all files) concurrently within a pool of worker processes.
+    When a quarantine is given (lenient mode), invalid lines are skipped + quarantined rather than
+    raised.
+    """
+
+    DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+
+    def __init__(
+        self,
+        file_paths: Sequence[Path],
+        max_workers: int | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        fast_parse: bool = False,
+        observer: PipelineObserver | None = None,
+        quarantine: InvalidLineQuarantine | None = None,
+    ):
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be > 0")
+        elif max_workers is not None and max_workers <= 0:
+            raise ValueError("Max workers must be > 0")
+        self.file_paths = file_paths
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.fast_parse = fast_parse
+        self.observer = observer
+        self.quarantine = quarantine
+
+    def _iter_quarantined_totals(
+        self,
+        file_chunks: list[tuple[Path, int, int]],
+        chunk_totals: Iterable[TeamMetricTotals],
+    ) -> Iterable[TeamMetricTotals]:
+        """Quarantines the invalid lines of every chunk, numbered within their whole file"""
+        line_offset = 0
+        for (file_path, start, _), totals in zip(file_chunks, chunk_totals):
+            if start == 0:
+                line_offset = 0
+            if self.quarantine is not None:
+                self.quarantine.quarantine(str(file_path), totals.invalid_lines, line_offset)
+            line_offset += totals.lines_read
+            yield _observe_lines_read(self.observer, totals)
+
+    def iter_chunk_ranges(self, file_path: Path) -> Iterable[tuple[int, int]]:
+        file_size = os.path.getsize(file_path)
+        if not file_size:
+            # Empty files can't be memory-mapped (and have nothing to parse anyway)
+            return
+        elif detect_compression(file_path) is not None:
+            # Compressed files can't be split at arbitrary offsets, only decompressed sequentially
+            yield 0, file_size
+            return
+        with open(file_path, "rb") as input_fileio:
+            with mmap.mmap(input_fileio.fileno(), 0, access=mmap.ACCESS_READ) as mapped_input:
+                start = 0
+                while start < file_size:
+                    # Extend each range forwards to the next new line character so that no line is
+                    # ever split between 2 ranges
+                    newline_index = mapped_input.find(b"\n", start + self.chunk_size - 1)
+                    end = file_size if newline_index == -1 else newline_index + 1
+                    yield start, end
+                    start = end
+
+    def iter_metric_totals(self, metric_scorers: list[MetricScorer]) -> Iterable[TeamMetricTotals]:
+        file_chunks = [
+            (file_path, start, end)
+            for file_path in self.file_paths
+            for start, end in self.iter_chunk_ranges(file_path)
+        ]
+        lenient = self.quarantine is not None
+        if not _worth_process_pool(len(file_chunks), self.max_workers):
+            yield from self._iter_quarantined_totals(
+                file_chunks,
+                (
+                    _load_file_chunk_metric_totals(
+                        file_path, start, end, metric_scorers, self.fast_parse, lenient
+                    )
+                    for file_path, start, end in file_chunks
+                ),
+            )
+            return
+
+        executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = [
+                executor.submit(
+                    _load_file_chunk_metric_totals,
+                    file_path,
+                    start,
+                    end,
+                    metric_scorers,
+                    self.fast_parse,
+                    lenient,
+                )
+                for file_path, start, end in file_chunks
+            ]
+            # Results are consumed in file order, so the first invalid line of the first invalid
+            # file is the one that gets raised (same as when parsing serially), and quarantined
+            # invalid lines are reported in file order too
+            yield from self._iter_quarantined_totals(
+                file_chunks, (future.result() for future in futures)
+            )
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+class PipelinedFromStreamSoccerTeamMetricTotalsLoader(SoccerTeamMetricTotalsLoader):
+    """
+    Loads a stream that can't be memory-mapped or seeked (ie STDIN) through a pipeline: a reader
+    thread reads large raw blocks and cuts them at the last newline (carrying the partial line over
+    to the next block), a pool of worker processes parses + scores each block into per-team totals,
+    and the totals are yielded (in stream order) to be merged into the ranker.
+
+    Both the queue of read blocks and the number of blocks in flight within the pool are bounded,
+    so that a fast producer (or an unbounded stream) is throttled rather than buffered in memory.
+    When a quarantine is given (lenient mode), invalid lines are skipped + quarantined (as lines
+    of source) rather than raised.
+    """
+
+    DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+
+    def __init__(
+        self,
+        fileio: BinaryIO,
+        max_workers: int | None = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        max_pending_blocks: int | None = None,
+        fast_parse: bool = False,
+        observer: PipelineObserver | None = None,
+        quarantine: InvalidLineQuarantine | None = None,
+        source: str = "<stdin>",
+    ):
+        if block_size <= 0:
+            raise ValueError("Block size must be > 0")
+        elif max_workers is not None and max_workers <= 0:
+            raise ValueError("Max workers must be > 0")
+        elif max_pending_blocks is not None and max_pending_blocks <= 0:
+            raise ValueError("Max pending blocks must be > 0")
+        self.fileio = fileio
+        self.max_workers = max_workers
+        self.block_size = block_size
+        # Enough blocks in flight to keep every worker busy while the next blocks are read
+        self.max_pending_blocks = max_pending_blocks or 2 * (max_workers or os.cpu_count() or 1)
+        self.fast_parse = fast_parse
+        self.observer = observer
+        self.quarantine = quarantine
+        self.source = source
+
+    def _read_blocks(self, blocks: queue.Queue, stopped: threading.Event):
+        """Puts blocks of complete lines, then None (end of stream) or the read error, to blocks"""
+        try:
+            partial_line = b""
+            while not stopped.is_set():
+                # Only waits for the bytes already available (ie in a pipe), rather than for a whole
+                # block, so that lines are parsed as soon as they are written upstream
+                raw_block = self.fileio.read1(self.block_size)
+                if not raw_block:
+                    break
+                newline_index = raw_block.rfind(b"\n")
+                if newline_index == -1:
+                    partial_line += raw_block
+                    continue
+                blocks.put(partial_line + raw_block[: newline_index + 1])
+                partial_line = raw_block[newline_index + 1 :]
+            if stopped.is_set():
+                return
+            if partial_line:
+                # The last line of the stream isn't necessarily terminated by a newline
+                blocks.put(partial_line)
+            blocks.put(None)
+        except Exception as exc:
+            blocks.put(exc)
+
+    @staticmethod
+    def _iter_read_blocks(blocks: queue.Queue) -> Iterable[bytes]:
+        while (block := blocks.get()) is not None:
+            if isinstance(block, Exception):
+                raise block
+            yield block
+
+    def _iter_block_totals(
+        self, read_blocks: Iterable[bytes], metric_scorers: list[MetricScorer]
+    ) -> Iterable[TeamMetricTotals]:
+        lenient = self.quarantine is not None
+        read_blocks = iter(read_blocks)
+        # The first block is parsed without waiting for the next one (which may never come while
+        # the stream is kept open upstream), so that its invalid lines are raised right away
+        for block in islice(read_blocks, 1):
+            yield _load_block_metric_totals(block, metric_scorers, self.fast_parse, lenient)
+        second_blocks = list(islice(read_blocks, 1))
+        if not _worth_process_pool(1 + len(second_blocks), self.max_workers):
+            for block in chain(second_blocks, read_blocks):
+                yield _load_block_metric_totals(block, metric_scorers, self.fast_parse, lenient)
+            return
+
+        # Forked workers close their inherited sys.stdin on startup, which deadlocks if the reader
+        # thread was within a read of it (holding its lock) at fork time: so they are started from
+        # a fresh process instead
+        start_method = "forkserver" if "forkserver" in get_all_start_methods() else "spawn"
+        executor = ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=get_context(start_method)
+        )
+        try:
+            pending_totals: deque[Future[TeamMetricTotals]] = deque()
+            for block in chain(second_blocks, read_blocks):
+                pending_totals.append(
+                    executor.submit(
+                        _load_block_metric_totals, block, metric_scorers, self.fast_parse, lenient
+                    )
+                )
+                # Results are consumed in stream order, so the first invalid line is the one that
+                # gets raised (same as when parsing serially). Finished ones are consumed before
+                # waiting on the next block, which may take a while to be written upstream
+                while pending_totals and (
+                    len(pending_totals) >= self.max_pending_blocks or pending_totals[0].done()
+                ):
+                    yield pending_totals.popleft().result()
+            while pending_totals:
+                yield pending_totals.popleft().result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def iter_metric_totals(self, metric_scorers: list[MetricScorer]) -> Iterable[TeamMetricTotals]:
+        blocks: queue.Queue[bytes | Exception | None] = queue.Queue(maxsize=self.max_pending_blocks)
+        stopped = threading.Event()
+        reader_thread = threading.Thread(
+            target=self._read_blocks, args=(blocks, stopped), daemon=True
+        )
+        reader_thread.start()
+        line_offset = 0
+        try:
+            for totals in self._iter_block_totals(self._iter_read_blocks(blocks), metric_scorers):
+                if self.quarantine is not None:
+                    # Invalid lines are numbered within their block, which starts after line_offset
+                    self.quarantine.quarantine(self.source, totals.invalid_lines, line_offset)
+                line_offset += totals.lines_read
+                yield _observe_lines_read(self.observer, totals)
+        finally:
+            stopped.set()
+            # Unblocking the reader thread if it's waiting on a full queue (ie after an error), but
+            # without joining it: it may be blocked reading a stream that's kept open upstream, and
+            # is a daemon thread that stops by itself after its current read
+            while True:
+                try:
+                    blocks.get_nowait()
+                except queue.Empty:
+                    break
+
+
+class FromSnapshotFilesSoccerTeamMetricTotalsLoader(SoccerTeamMetricTotalsLoader):
+    """
+    Loads the partial metric totals of snapshot files, ie written by other nodes that each ranked
+    a shard of a season, so that only (small) snapshots travel between nodes.
+
+    Snapshots are written in little-endian byte order (they travel between machines) as:
+    - Header: magic, metric scorer count, team count, match count
+    - Metric scorer name table: UTF-8 byte length of each name (uint32), then the UTF-8 names
+    - Team name table: UTF-8 byte length of each team name (uint32), then the UTF-8 names
+    - Fixed-width columns: per-team totals of each metric scorer (int64)
+    """
+
+    SNAPSHOT_MAGIC = b"SOCCSNP1"
+    SNAPSHOT_HEADER = struct.Struct("<8sIQQ")
+    LENGTH_TYPECODE = "I"
+    METRIC_TYPECODE = "q"
+
+    def __init__(self, snapshot_paths: Sequence[Path]):
+        self.snapshot_paths = snapshot_paths
+
+    @staticmethod
+    def _metric_scorer_name(metric_scorer: MetricScorer) -> str:
+        return type(metric_scorer).__name__
+
+    @staticmethod
+    def _write_column(fileio: BinaryIO, column: array):
+        if sys.byteorder == "big":
+            column = array(column.typecode, column)
+            column.byteswap()
+        column.tofile(fileio)
+
+    @staticmethod
+    def _read_column(fileio: BinaryIO, typecode: str, item_count: int) -> array:
+        column = array(typecode)
+        raw_column = fileio.read(item_count * column.itemsize)
+        if len(raw_column) != item_count * column.itemsize:
+            raise ValueError("Invalid snapshot: Truncated file")
+        column.frombytes(raw_column)
+        if sys.byteorder == "big":
+            column.byteswap()
+        return column
+
+    @classmethod
+    def _write_names(cls, fileio: BinaryIO, names: Sequence[str]):
+        encoded_names = [name.encode() for name in names]
+        cls._write_column(fileio, array(cls.LENGTH_TYPECODE, map(len, encoded_names)))
+        fileio.writelines(encoded_names)
+
+    @classmethod
+    def _read_names(cls, fileio: BinaryIO, name_count: int) -> list[str]:
+        name_lengths = cls._read_column(fileio, cls.LENGTH_TYPECODE, name_count)
+        encoded_names = fileio.read(sum(name_lengths))
+        if len(encoded_names) != sum(name_lengths):
+            raise ValueError("Invalid snapshot: Truncated file")
+        names = []
+        offset = 0
+        for name_length in name_lengths:
+            names.append(encoded_names[offset : offset + name_length].decode())
+            offset += name_length
+        return names
+
+    @classmethod
+    def dump_snapshot(
+        cls, fileio: BinaryIO, metric_scorers: list[MetricScorer], totals: TeamMetricTotals
+    ):
+        """Writes partial metric totals (ie from SoccerTeamRanker.partial_totals) as a snapshot"""
+        if len(totals.metric_totals) != len(metric_scorers):
+            raise ValueError("Metric totals must contain one set of totals per metric scorer")
+        fileio.write(
+            cls.SNAPSHOT_HEADER.pack(
+                cls.SNAPSHOT_MAGIC, len(metric_scorers), len(totals.team_names), totals.match_count
+            )
+        )
+        cls._write_names(fileio, list(map(cls._metric_scorer_name, metric_scorers)))
+        cls._write_names(fileio, totals.team_names)
+        for team_metric_totals in totals.metric_totals:
+            cls._write_column(fileio, array(cls.METRIC_TYPECODE, team_metric_totals))
+
+    @classmethod
+    def load_snapshot(cls, fileio: BinaryIO) -> tuple[list[str], TeamMetricTotals]:
+        """Returns the metric scorer names + partial metric totals of a snapshot"""
+        raw_header = fileio.read(cls.SNAPSHOT_HEADER.size)
+        if len(raw_header) != cls.SNAPSHOT_HEADER.size:
+            raise ValueError("Invalid snapshot: Truncated file")
+        magic, metric_count, team_count, match_count = cls.SNAPSHOT_HEADER.unpack(raw_header)
+        if magic != cls.SNAPSHOT_MAGIC:
+            raise ValueError("Invalid snapshot: Unknown file format")
+        metric_scorer_names = cls._read_names(fileio, metric_count)
+        team_names = cls._read_names(fileio, team_count)
+        metric_totals: list[Sequence[int]] = [
+            cls._read_column(fileio, cls.METRIC_TYPECODE, team_count) for _ in range(metric_count)
+        ]
+        return metric_scorer_names, TeamMetricTotals(
+            team_names=team_names, metric_totals=metric_totals, match_count=match_count
+        )
+
+    @classmethod
+    def load_matching_snapshot(
+        cls, fileio: BinaryIO, metric_scorers: list[MetricScorer]
+    ) -> TeamMetricTotals:
+        """Returns the partial metric totals of a snapshot, written for the given metric scorers"""
+        metric_scorer_names, totals = cls.load_snapshot(fileio)
+        expected_metric_scorer_names = list(map(cls._metric_scorer_name, metric_scorers))
+        if metric_scorer_names != expected_metric_scorer_names:
+            # Adding up totals of different metrics would silently produce wrong rankings
+            raise ValueError(
+                f"Snapshot metric scorers {metric_scorer_names} don't match"
+                f" {expected_metric_scorer_names}"
+            )
+        return totals
+
+    def iter_metric_totals(self, metric_scorers: list[MetricScorer]) -> Iterable[TeamMetricTotals]:
+        for snapshot_path in self.snapshot_paths:
+            with open(snapshot_path, "rb") as snapshot_fileio:
+                yield self.load_matching_snapshot(snapshot_fileio, metric_scorers)
+
+
+class FollowedFileSoccerMatchScoresLoader(TupleSoccerMatchScoresLoader):
+    """
+    Loads the match scores appended to a growing file (ie a match feed log) since the last load.
+    The byte offset consumed so far is tracked, and only complete lines are ever consumed: a
+    trailing line without a newline is assumed to be partially written, so it's never loaded (even
+    if the file stops growing) until its newline has been written.
+    """
+
+    SCAN_CHUNK_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        file_path: Path,
+        offset: int = 0,
+        fast_parse: bool = False,
+        observer: PipelineObserver | None = None,
+    ):
+        if offset < 0:
+            raise ValueError("Offset must be >= 0")
+        self.file_path = file_path
+        self.offset = offset
+        self.fast_parse = fast_parse
+        self.observer = observer
+
+    def _complete_lines_end(self, input_fileio: BinaryIO) -> int:
+        """
+        Returns the offset right after the last complete line appended since the consumed offset,
+        scanning backwards from the end of the file in bounded chunks (ie without reading the
+        appended lines themselves)
+        """
+        end = input_fileio.seek(0, os.SEEK_END)
+        if end < self.offset:
+            raise ValueError("Followed file is smaller than the offset consumed so far")
+        while end > self.offset:
+            start = max(self.offset, end - self.SCAN_CHUNK_SIZE)
+            input_fileio.seek(start)
+            newline_index = input_fileio.read(end - start).rfind(b"\n")
+            if newline_index != -1:
+                return start + newline_index + 1
+            end = start
+        return self.offset
+
+    def _appended_lines_loader(self, appended_fileio: BinaryIO) -> TupleSoccerMatchScoresLoader:
+        if self.fast_parse:
+            return FromBinaryIOSoccerMatchScoresLoader(
+                fileio=appended_fileio, observer=self.observer
             )
+        # Wrapping the raw bytes in the same text layer that `open(file_path, "r")` would use
+        return FromIOSoccerMatchScoresLoader(
+            fileio=io.TextIOWrapper(appended_fileio), observer=self.observer
+        )
+
+    @contextmanager
+    def _open_appended_lines(self):
+        """
+        Opens the complete lines appended since the consumed offset for (incremental) reading,
+        along with the offset they end at
+        """
+        with open(self.file_path, "rb", buffering=0) as input_fileio:
+            end = self._complete_lines_end(input_fileio)
+            input_fileio.seek(self.offset)
+            with io.BufferedReader(
+                BoundedReader(input_fileio, end - self.offset)
+            ) as appended_fileio:
+                yield cast(BinaryIO, appended_fileio), end
+
+    def iter_match_score_tuples(self) -> Iterable[MatchScoreTuple]:
+        with self._open_appended_lines() as (appended_fileio, end):
+            yield from self._appended_lines_loader(appended_fileio).iter_match_score_tuples()
+        # Only consumed once every appended line was loaded successfully
+        self.offset = end
+
+    def iter_match_scores(self) -> Iterable[MatchScore]:
+        with self._open_appended_lines() as (appended_fileio, end):
+            yield from self._appended_lines_loader(appended_fileio).iter_match_scores()
+        self.offset = end
+
+
+class FromBinaryLinesSoccerMatchRoundsLoader:
+    """
+    Splits match score lines into rounds (ie matchdays), at round marker lines (ie `# Round 12`).
+    A marker line ends the current round, if it contains any match scores, and the end of the
+    input ends the last round, so markers can either precede or follow the lines of each round.
+
+    Marker lines only contain `#` characters, optionally followed by a space (or tab) and a label,
+    so that a match score line whose team name starts with `#` (ie `#1 Lions 3, Snakes 1`) is never
+    mistaken for a marker. A marker line that would also parse as a match score (ie
+    `# Lions 3, Snakes 1`) is ambiguous, and raised rather than skipped.
+    """
+
+    ROUND_MARKER_PATTERN = re.compile(rb"#+(?:[ \t][^\r\n]*)?\r?\n?")
+
+    def __init__(self, raw_lines: Iterable[bytes], observer: PipelineObserver | None = None):
+        self.raw_lines = raw_lines
+        self.observer = observer
+        # Only used to reject ambiguous marker lines, never reads its fileio
+        self.match_score_parser = FromIOSoccerMatchScoresLoader(
+            fileio=io.StringIO(), fast_parse=True
+        )
+
+    def _round_loader(self, round_lines: list[bytes]) -> FromBinaryIOSoccerMatchScoresLoader:
+        return FromBinaryIOSoccerMatchScoresLoader(
+            fileio=io.BytesIO(b"".join(round_lines)), observer=self.observer
+        )
+
+    def is_round_marker(self, raw_line: bytes) -> bool:
+        if self.ROUND_MARKER_PATTERN.fullmatch(raw_line) is None:
+            return False
+        try:
+            self.match_score_parser.parse_match_score_tuple(raw_line.decode())
+        except ValueError:
+            return True
+        raise ValueError(f"Ambiguous round marker, also a valid match score: {raw_line.decode()}")
+
+    def iter_round_loaders(self) -> Iterable[FromBinaryIOSoccerMatchScoresLoader]:
+        """Yields a loader of the match scores of each (non-empty) round, in order"""
+        round_lines: list[bytes] = []
+        for raw_line in self.raw_lines:
+            if raw_line.startswith(b"#") and self.is_round_marker(raw_line):
+                if round_lines:
+                    yield self._round_loader(round_lines)
+                    round_lines = []
+                continue
+            # The last line of a file may lack its newline, when lines of several files are chained
+            round_lines.append(raw_line if raw_line.endswith(b"\n") else raw_line + b"\n")
+        if round_lines:
+            yield self._round_loader(round_lines)
+
+
+class FromFilesSoccerMatchScoresLoader(TupleSoccerMatchScoresLoader):
+    """
+    Loads the match scores of several (possibly compressed) files serially, in file order.
+    When a quarantine is given (lenient mode), invalid lines are skipped + quarantined rather than
+    raised.
+    """
+
+    def __init__(
+        self,
+        file_paths: Sequence[Path],
+        observer: PipelineObserver | None = None,
+        quarantine: InvalidLineQuarantine | None = None,
+    ):
+        self.file_paths = file_paths
+        self.observer = observer
+        self.quarantine = quarantine
+
+    def _iter_file_loaders(self) -> Iterable[FromBinaryIOSoccerMatchScoresLoader]:
+        for file_path in self.file_paths:
+            invalid_lines: list[InvalidLine] = []
+            with open_input_file(file_path) as input_fileio:
+                yield FromBinaryIOSoccerMatchScoresLoader(
+                    fileio=input_fileio,
+                    observer=self.observer,
+                    invalid_lines=None if self.quarantine is None else invalid_lines,
+                )
+            if self.quarantine is not None:
+                # The file was fully loaded once the loop resumes
+                self.quarantine.quarantine(str(file_path), invalid_lines)
+
+    def iter_match_score_tuples(self) -> Iterable[MatchScoreTuple]:
+        for file_loader in self._iter_file_loaders():
+            yield from file_loader.iter_match_score_tuples()
+
+    def iter_match_scores(self) -> Iterable[MatchScore]:
+        for file_loader in self._iter_file_loaders():
+            yield from file_loader.iter_match_scores()
 
 
-class MatchResultMetricScorer(MetricScorer):
+class ChainedSoccerMatchScoresLoader(ColumnarSoccerMatchScoresLoader):
+    """Loads the match scores of several columnar loaders (ie one per file), one after another"""
+
+    def __init__(self, loaders: Sequence[ColumnarSoccerMatchScoresLoader]):
+        self.loaders = loaders
+
+    def iter_match_score_columns(self) -> Iterable[MatchScoreColumns]:
+        for loader in self.loaders:
+            yield from loader.iter_match_score_columns()
+
+    def iter_match_scores(self) -> Iterable[MatchScore]:
+        for loader in self.loaders:
+            yield from loader.iter_match_scores()
+
+
+class MatchResultMetricScorer(BatchMetricScorer, FusedMetricScorer):
     POINTS_BY_RESULT = {
         SoccerMatchResult.WIN: 3,
         SoccerMatchResult.TIE: 1,
         SoccerMatchResult.LOSS: 0,
     }
 
+    def __init__(self):
+        # Looked up once, rather than going through the enum + dict for every match score
+        self.win_points = self.POINTS_BY_RESULT[SoccerMatchResult.WIN]
+        self.tie_points = self.POINTS_BY_RESULT[SoccerMatchResult.TIE]
+        self.loss_points = self.POINTS_BY_RESULT[SoccerMatchResult.LOSS]
+
     def readable_string_from_metric(self, metric: int) -> str:
         unit_str = "pt" if metric == 1 else "pts"
         return f"{metric} {unit_str}"
@@ -54,141 +1430,1854 @@ class MatchResultMetricScorer(MetricScorer):
     def sort_order(self) -> Literal[-1, 1]:
         return -1
 
+    def counter_weights(self) -> MatchCounterWeights:
+        return MatchCounterWeights(
+            wins=self.win_points, ties=self.tie_points, losses=self.loss_points
+        )
+
     def score(self, match_score: MatchScore) -> tuple[int, int]:
-        if match_score.team_score_a.score > match_score.team_score_b.score:
-            match_result_for_team_a = SoccerMatchResult.WIN
-            match_result_for_team_b = SoccerMatchResult.LOSS
-        elif match_score.team_score_a.score == match_score.team_score_b.score:
-            match_result_for_team_a = SoccerMatchResult.TIE
-            match_result_for_team_b = SoccerMatchResult.TIE
-        else:
-            match_result_for_team_a = SoccerMatchResult.LOSS
-            match_result_for_team_b = SoccerMatchResult.WIN
+        team_score_a = match_score.team_score_a.score
+        team_score_b = match_score.team_score_b.score
+        if team_score_a > team_score_b:
+            return self.win_points, self.loss_points
+        elif team_score_a == team_score_b:
+            return self.tie_points, self.tie_points
+        return self.loss_points, self.win_points
+
+    def score_batch(
+        self,
+        team_a_ids: Sequence[int],
+        team_b_ids: Sequence[int],
+        team_a_scores: Sequence[int],
+        team_b_scores: Sequence[int],
+    ) -> tuple[Sequence[int], Sequence[int]]:
+        win_points, tie_points, loss_points = self.win_points, self.tie_points, self.loss_points
+        if np is not None:
+            score_signs = np.sign(
+                np.asarray(team_a_scores, dtype=np.int64)
+                - np.asarray(team_b_scores, dtype=np.int64)
+            )
+            ties = score_signs == 0
+            return (
+                np.select([score_signs > 0, ties], [win_points, tie_points], loss_points),
+                np.select([score_signs < 0, ties], [win_points, tie_points], loss_points),
+            )
 
         return (
-            self.POINTS_BY_RESULT[match_result_for_team_a],
-            self.POINTS_BY_RESULT[match_result_for_team_b],
+            [
+                (
+                    win_points
+                    if score_a > score_b
+                    else tie_points if score_a == score_b else loss_points
+                )
+                for score_a, score_b in zip(team_a_scores, team_b_scores)
+            ],
+            [
+                (
+                    win_points
+                    if score_b > score_a
+                    else tie_points if score_a == score_b else loss_points
+                )
+                for score_a, score_b in zip(team_a_scores, team_b_scores)
+            ],
         )
 
 
+class GoalDifferenceMetricScorer(BatchMetricScorer, FusedMetricScorer):
+    def readable_string_from_metric(self, metric: int) -> str:
+        return f"{metric} GD"
+
+    def default(self) -> int:
+        return 0
+
+    def sort_order(self) -> Literal[-1, 1]:
+        return -1
+
+    def counter_weights(self) -> MatchCounterWeights:
+        return MatchCounterWeights(goals_for=1, goals_against=-1)
+
+    def score(self, match_score: MatchScore) -> tuple[int, int]:
+        goal_difference = match_score.team_score_a.score - match_score.team_score_b.score
+        return goal_difference, -goal_difference
+
+    def score_batch(
+        self,
+        team_a_ids: Sequence[int],
+        team_b_ids: Sequence[int],
+        team_a_scores: Sequence[int],
+        team_b_scores: Sequence[int],
+    ) -> tuple[Sequence[int], Sequence[int]]:
+        if np is not None:
+            goal_differences = np.asarray(team_a_scores, dtype=np.int64) - np.asarray(
+                team_b_scores, dtype=np.int64
+            )
+            return goal_differences, -goal_differences
+        goal_differences = list(map(operator.sub, team_a_scores, team_b_scores))
+        return goal_differences, list(map(operator.neg, goal_differences))
+
+
+class GoalsForMetricScorer(BatchMetricScorer, FusedMetricScorer):
+    def readable_string_from_metric(self, metric: int) -> str:
+        unit_str = "goal" if metric == 1 else "goals"
+        return f"{metric} {unit_str}"
+
+    def default(self) -> int:
+        return 0
+
+    def sort_order(self) -> Literal[-1, 1]:
+        return -1
+
+    def counter_weights(self) -> MatchCounterWeights:
+        return MatchCounterWeights(goals_for=1)
+
+    def score(self, match_score: MatchScore) -> tuple[int, int]:
+        return match_score.team_score_a.score, match_score.team_score_b.score
+
+    def score_batch(
+        self,
+        team_a_ids: Sequence[int],
+        team_b_ids: Sequence[int],
+        team_a_scores: Sequence[int],
+        team_b_scores: Sequence[int],
+    ) -> tuple[Sequence[int], Sequence[int]]:
+        return team_a_scores, team_b_scores
+
+
 class StandardCompetitionSoccerTeamRanker(SoccerTeamRanker):
-    def __init__(self, metric_scorers: list[MetricScorer]):
-        self.teams: set[str] = set()
+    METRIC_TYPECODE = "q"
+
+    DEFAULT_BATCH_SIZE = 4096
+    # NumPy's int64 arithmetic silently wraps around on overflow, so metric totals are only summed
+    # with it while they can't get anywhere near 2 ** 63 (leaving plenty of headroom for points,
+    # which aren't counted within metric_bound), and summed as checked Python ints past that
+    MAX_VECTORIZED_METRIC_BOUND = 2**62
+
+    def __init__(
+        self,
+        metric_scorers: list[MetricScorer],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        top_k: int | None = None,
+        observer: PipelineObserver | None = None,
+    ):
+        if batch_size <= 0:
+            raise ValueError("Batch size must be > 0")
+        elif top_k is not None and top_k <= 0:
+            raise ValueError("Top K must be > 0")
         self.metric_scorers: list[MetricScorer] = metric_scorers
-        self.metrics: list[dict[str, int]] = [
-            defaultdict(metric_scorer.default) for metric_scorer in metric_scorers
-        ]
-        # This a list of ranking groups, nested lists are ranked teams within the same ranking group
-        # (ie both 3rd place)
-        self.rankings: list[list[str]] = []
+        # Match scores are loaded (and scored by any BatchMetricScorer) one batch at a time
+        self.batch_size = batch_size
+        # When set, only the top K rankings (plus any teams tied at rank K) are generated
+        self.top_k = top_k
+        self.observer = observer
+        self.match_count = 0
+        # Upper bound of the absolute value of any metric total (only tracked when vectorized)
+        self.metric_bound = 0
+        # Team names are interned to dense integer IDs (the index of the name within team_names)
+        # once at load time, so that all subsequent lookups are done by integer ID
+        self.team_ids: dict[str, int] = {}
+        self.team_names: list[str] = []
+        # One contiguous column of metric values per metric scorer, indexed by team ID
+        self.metrics: list[array] = [array(self.METRIC_TYPECODE) for _ in metric_scorers]
+        # This a list of ranking groups, nested lists are the IDs of ranked teams within the same
+        # ranking group (ie both 3rd place)
+        self.rankings: list[list[int]] = []
 
     def clear(self):
-        for metric_lookup in self.metrics:
-            metric_lookup.clear()
+        for metric_column in self.metrics:
+            del metric_column[:]
         self.rankings.clear()
-        self.teams.clear()
+        self.team_ids.clear()
+        self.team_names.clear()
+        self.match_count = 0
+        self.metric_bound = 0
 
-    def _metric_scorers_and_lookups(self) -> Iterable[tuple[MetricScorer, dict[str, int]]]:
+    def _metric_scorers_and_columns(self) -> Iterable[tuple[MetricScorer, array]]:
         return zip(self.metric_scorers, self.metrics)
 
+    def _team_id(self, team_name: str) -> int:
+        team_id = self.team_ids.get(team_name)
+        if team_id is None:
+            team_id = len(self.team_names)
+            self.team_ids[team_name] = team_id
+            self.team_names.append(team_name)
+            for metric_scorer, metric_column in self._metric_scorers_and_columns():
+                metric_column.append(metric_scorer.default())
+        return team_id
+
     @property
     def _sort_decorated_teams(self) -> Iterable[tuple[int | str, ...]]:
         """
-        Generate decorated items for easy sorting like so: (metric_a, -metric_b, ..., team_name)
+        Generate decorated items for easy sorting like so:
+        (metric_a, -metric_b, ..., team_name, team_id)
         """
-        return (
-            tuple(
-                [
-                    *(
-                        metric_lookup[team_name] * metric_scorer.sort_order()
-                        for metric_scorer, metric_lookup in self._metric_scorers_and_lookups()
-                    ),
-                    team_name,
-                ]
+        sortable_metric_columns = (
+            (
+                metric_column
+                if metric_scorer.sort_order() == 1
+                else map(operator.mul, metric_column, repeat(metric_scorer.sort_order()))
             )
-            for team_name in self.teams
+            for metric_scorer, metric_column in self._metric_scorers_and_columns()
         )
+        return zip(*sortable_metric_columns, self.team_names, range(len(self.team_names)))
 
-    def _generate_rankings(self):
-        self.rankings.clear()
+    def _decorate_team(self, team_id: int) -> tuple[int | str, ...]:
+        """Generate a single decorated item, identical to the ones from _sort_decorated_teams"""
+        return (
+            *(
+                metric_column[team_id] * metric_scorer.sort_order()
+                for metric_scorer, metric_column in self._metric_scorers_and_columns()
+            ),
+            self.team_names[team_id],
+            team_id,
+        )
+
+    def _comparable_values(self, decorated_team: tuple[int | str, ...]) -> tuple[int | str, ...]:
+        # For the artificial case where there are no scoring metrics configured, the team name
+        # is compared instead. It'd be nice to not show any trailing metric text as well as
+        # split each unique team name into a separate ranking group.
+        return decorated_team[: len(self.metric_scorers) or -1]
+
+    def _iter_rank_groups(
+        self, sorted_decorated_teams: Iterable[tuple[int | str, ...]]
+    ) -> Iterable[list[int]]:
+        """Groups sorted decorated items into lists of team IDs sharing the same ranking"""
         current_rank_group = []
         last_comparable_values = None
 
-        for comparable_values in sorted(self._sort_decorated_teams):
-            *metric_values, team_name = comparable_values
-            if metric_values:
-                # This is for the artificial case where there are no scoring metrics configured.
-                # It'd be nice to not show any trailing metric text as well as split each unique
-                # team name into a separate ranking group.
-                comparable_values = metric_values
+        for decorated_team in sorted_decorated_teams:
+            team_id = cast(int, decorated_team[-1])
+            comparable_values = self._comparable_values(decorated_team)
             if last_comparable_values is None or comparable_values == last_comparable_values:
-                current_rank_group.append(team_name)
+                current_rank_group.append(team_id)
             else:
-                self.rankings.append(current_rank_group)
-                current_rank_group = [team_name]
+                yield current_rank_group
+                current_rank_group = [team_id]
             last_comparable_values = comparable_values
         if current_rank_group:
-            self.rankings.append(current_rank_group)
+            yield current_rank_group
+
+    def _top_k_sorted_decorated_teams(self, top_k: int) -> list[tuple[int | str, ...]]:
+        """
+        Returns the sorted decorated items of the top K teams without sorting every team.
+        Every team tied with the K-th team is also included, so that rank K is never split.
+        """
+        top_decorated_teams = heapq.nsmallest(top_k, self._sort_decorated_teams)
+        if len(top_decorated_teams) < top_k:
+            return top_decorated_teams
+        boundary_comparable_values = self._comparable_values(top_decorated_teams[-1])
+        return sorted(
+            decorated_team
+            for decorated_team in self._sort_decorated_teams
+            if self._comparable_values(decorated_team) <= boundary_comparable_values
+        )
+
+    @staticmethod
+    def _limit_rank_groups(
+        rank_groups: Iterable[list[int]], top_k: int | None
+    ) -> Iterable[list[int]]:
+        """Stops yielding ranking groups once top K teams have been yielded (if given)"""
+        if top_k is None:
+            yield from rank_groups
+            return
+        team_count = 0
+        for rank_group in rank_groups:
+            if team_count >= top_k:
+                break
+            yield rank_group
+            team_count += len(rank_group)
+
+    def _generate_rankings(self):
+        self.rankings.clear()
+        if self.top_k is None:
+            sorted_decorated_teams = sorted(self._sort_decorated_teams)
+        else:
+            sorted_decorated_teams = self._top_k_sorted_decorated_teams(self.top_k)
+        self.rankings.extend(self._iter_rank_groups(sorted_decorated_teams))
+
+    @property
+    def _vectorized(self) -> bool:
+        return np is not None and self.metric_bound <= self.MAX_VECTORIZED_METRIC_BOUND
+
+    def _scatter_add(
+        self, metric_column: array, team_ids: Sequence[int], metric_deltas: Sequence[int]
+    ):
+        """
+        Adds each metric delta to the metric value of the team ID at the same index. Unless
+        vectorized, a total that doesn't fit within its column raises OverflowError.
+        """
+        if self._vectorized:
+            np.add.at(
+                np.frombuffer(metric_column, dtype=np.int64),
+                np.asarray(team_ids, dtype=np.intp),
+                # Viewing as int64 as columns of typecode "q" are wrapped as C long long, which
+                # (while equivalent) makes np.add.at fall off its fast path
+                np.asarray(metric_deltas, dtype=np.int64).view(np.int64),
+            )
+            return
+        if np is not None:
+            # Summed as Python ints rather than (wrapping) NumPy ints
+            team_ids = np.asarray(team_ids).tolist()
+            metric_deltas = np.asarray(metric_deltas).tolist()
+        for team_id, metric_delta in zip(team_ids, metric_deltas):
+            metric_column[team_id] += metric_delta
+
+    def _score_batch(
+        self,
+        team_a_ids: array,
+        team_b_ids: array,
+        team_a_scores: array,
+        team_b_scores: array,
+        match_scores: list[MatchScore],
+    ):
+        self.match_count += len(team_a_ids)
+        if self._vectorized:
+            # No goal-based metric of a match is larger than its largest score
+            self.metric_bound += len(team_a_ids) * int(
+                max(np.max(team_a_scores), np.max(team_b_scores))
+            )
+        fused_metric_scorers_and_columns = [
+            (metric_scorer, metric_column)
+            for metric_scorer, metric_column in self._metric_scorers_and_columns()
+            if isinstance(metric_scorer, FusedMetricScorer)
+        ]
+        if (
+            len(fused_metric_scorers_and_columns) == 1
+            and isinstance(fused_metric_scorers_and_columns[0][0], BatchMetricScorer)
+        ) or (np is not None and not self._vectorized):
+            # Counting a batch once only pays off when it's shared by several fused metric scorers
+            # (and its NumPy counters could overflow, once metric totals get large)
+            fused_metric_scorers_and_columns.clear()
+        for metric_scorer, metric_column in self._metric_scorers_and_columns():
+            if fused_metric_scorers_and_columns and isinstance(metric_scorer, FusedMetricScorer):
+                continue
+            if isinstance(metric_scorer, BatchMetricScorer):
+                metric_deltas_a, metric_deltas_b = metric_scorer.score_batch(
+                    team_a_ids, team_b_ids, team_a_scores, team_b_scores
+                )
+            else:
+                metric_deltas_a, metric_deltas_b = zip(*map(metric_scorer.score, match_scores))
+            self._scatter_add(metric_column, team_a_ids, metric_deltas_a)
+            self._scatter_add(metric_column, team_b_ids, metric_deltas_b)
+        if fused_metric_scorers_and_columns:
+            self._score_fused_batch(
+                fused_metric_scorers_and_columns,
+                team_a_ids,
+                team_b_ids,
+                team_a_scores,
+                team_b_scores,
+            )
+
+    @staticmethod
+    def _count_batch_per_team(
+        team_a_ids: Sequence[int],
+        team_b_ids: Sequence[int],
+        team_a_scores: Sequence[int],
+        team_b_scores: Sequence[int],
+    ) -> tuple[Sequence[int], list[Sequence[int]]]:
+        """
+        Counts a batch of match scores into per-team counters (ordered like MatchCounterWeights) in
+        a single pass. Returns the IDs of the teams within the batch, along with one column per
+        counter aligned with those IDs.
+        """
+        if not len(team_a_ids):
+            return [], [[] for _ in MatchCounterWeights._fields]
+        # Counted per team within the batch only (through IDs local to the batch), so that the cost
+        # of a batch doesn't depend on the total number of teams
+        if np is not None:
+            batch_team_ids, local_team_ids = np.unique(
+                np.concatenate(
+                    (np.asarray(team_a_ids, dtype=np.intp), np.asarray(team_b_ids, dtype=np.intp))
+                ),
+                return_inverse=True,
+            )
+            team_count = len(batch_team_ids)
+            team_a_scores = np.asarray(team_a_scores, dtype=np.int64).view(np.int64)
+            team_b_scores = np.asarray(team_b_scores, dtype=np.int64).view(np.int64)
+            goals_for = np.concatenate((team_a_scores, team_b_scores))
+            goals_against = np.concatenate((team_b_scores, team_a_scores))
+            score_signs = np.sign(goals_for - goals_against)
+            goals_for_counters = np.zeros(team_count, dtype=np.int64)
+            goals_against_counters = np.zeros(team_count, dtype=np.int64)
+            np.add.at(goals_for_counters, local_team_ids, goals_for)
+            np.add.at(goals_against_counters, local_team_ids, goals_against)
+            return batch_team_ids, [
+                np.bincount(local_team_ids[score_signs > 0], minlength=team_count),
+                np.bincount(local_team_ids[score_signs == 0], minlength=team_count),
+                np.bincount(local_team_ids[score_signs < 0], minlength=team_count),
+                goals_for_counters,
+                goals_against_counters,
+            ]
+
+        local_team_id_by_team_id = {
+            team_id: local_team_id
+            for local_team_id, team_id in enumerate(dict.fromkeys(chain(team_a_ids, team_b_ids)))
+        }
+        team_count = len(local_team_id_by_team_id)
+        wins = [0] * team_count
+        ties = [0] * team_count
+        losses = [0] * team_count
+        goals_for = [0] * team_count
+        goals_against = [0] * team_count
+        for team_a_id, team_b_id, team_a_score, team_b_score in zip(
+            map(local_team_id_by_team_id.__getitem__, team_a_ids),
+            map(local_team_id_by_team_id.__getitem__, team_b_ids),
+            team_a_scores,
+            team_b_scores,
+        ):
+            if team_a_score > team_b_score:
+                wins[team_a_id] += 1
+                losses[team_b_id] += 1
+            elif team_a_score == team_b_score:
+                ties[team_a_id] += 1
+                ties[team_b_id] += 1
+            else:
+                losses[team_a_id] += 1
+                wins[team_b_id] += 1
+            goals_for[team_a_id] += team_a_score
+            goals_against[team_a_id] += team_b_score
+            goals_for[team_b_id] += team_b_score
+            goals_against[team_b_id] += team_a_score
+        return list(local_team_id_by_team_id), [wins, ties, losses, goals_for, goals_against]
+
+    def _score_fused_batch(
+        self,
+        fused_metric_scorers_and_columns: list[tuple[FusedMetricScorer, array]],
+        team_a_ids: Sequence[int],
+        team_b_ids: Sequence[int],
+        team_a_scores: Sequence[int],
+        team_b_scores: Sequence[int],
+    ):
+        """
+        Scores a batch for every fused metric scorer at once: each match is only counted once, and
+        every metric is then derived per team from those counters (so the cost of each additional
+        fused metric depends on the number of teams within the batch, not the number of matches)
+        """
+        batch_team_ids, team_counters = self._count_batch_per_team(
+            team_a_ids, team_b_ids, team_a_scores, team_b_scores
+        )
+        for metric_scorer, metric_column in fused_metric_scorers_and_columns:
+            metric_deltas = None
+            for counters, counter_weight in zip(team_counters, metric_scorer.counter_weights()):
+                if not counter_weight:
+                    continue
+                if np is not None:
+                    weighted_counters = counters * counter_weight
+                elif counter_weight == 1:
+                    weighted_counters = counters
+                else:
+                    weighted_counters = list(map(operator.mul, counters, repeat(counter_weight)))
+                if metric_deltas is None:
+                    metric_deltas = weighted_counters
+                elif np is not None:
+                    metric_deltas = metric_deltas + weighted_counters
+                else:
+                    metric_deltas = list(map(operator.add, metric_deltas, weighted_counters))
+            if metric_deltas is not None:
+                self._scatter_add(metric_column, batch_team_ids, metric_deltas)
+
+    def _needs_match_scores(self) -> bool:
+        # Match score objects are only kept around for metric scorers that can't score batches, as
+        # holding on to a batch of objects is expensive (ie more work for the garbage collector)
+        return not all(
+            isinstance(metric_scorer, (BatchMetricScorer, FusedMetricScorer))
+            for metric_scorer in self.metric_scorers
+        )
+
+    def _accumulate_match_score_columns(self, match_score_columns: MatchScoreColumns):
+        team_names = match_score_columns.team_names
+        # Maps the IDs used within the columns to the IDs interned by this ranker
+        ranker_team_ids = array(self.METRIC_TYPECODE, map(self._team_id, team_names))
+        if np is not None:
+            ranker_team_ids_lookup = np.frombuffer(ranker_team_ids, dtype=np.int64)
+        needs_match_scores = self._needs_match_scores()
+
+        for start in range(0, len(match_score_columns.team_a_ids), self.batch_size):
+            end = start + self.batch_size
+            team_a_ids = match_score_columns.team_a_ids[start:end]
+            team_b_ids = match_score_columns.team_b_ids[start:end]
+            team_a_scores = match_score_columns.team_a_scores[start:end]
+            team_b_scores = match_score_columns.team_b_scores[start:end]
+            match_scores = []
+            if needs_match_scores:
+                match_scores = [
+                    MatchScore(
+                        TeamGameScore(team_names[team_a_id], team_a_score),
+                        TeamGameScore(team_names[team_b_id], team_b_score),
+                    )
+                    for team_a_id, team_b_id, team_a_score, team_b_score in zip(
+                        team_a_ids, team_b_ids, team_a_scores, team_b_scores
+                    )
+                ]
+            if np is not None:
+                team_a_ids = ranker_team_ids_lookup[np.asarray(team_a_ids)]
+                team_b_ids = ranker_team_ids_lookup[np.asarray(team_b_ids)]
+            else:
+                team_a_ids = array(
+                    self.METRIC_TYPECODE, map(ranker_team_ids.__getitem__, team_a_ids)
+                )
+                team_b_ids = array(
+                    self.METRIC_TYPECODE, map(ranker_team_ids.__getitem__, team_b_ids)
+                )
+            self._score_batch(team_a_ids, team_b_ids, team_a_scores, team_b_scores, match_scores)
+
+    def _accumulate_match_score_tuples(self, match_score_tuples: Iterable[MatchScoreTuple]):
+        match_score_tuples = iter(match_score_tuples)
+        team_ids = self.team_ids
+        while True:
+            team_a_ids = array(self.METRIC_TYPECODE)
+            team_b_ids = array(self.METRIC_TYPECODE)
+            team_a_scores = array(self.METRIC_TYPECODE)
+            team_b_scores = array(self.METRIC_TYPECODE)
+            for team_name_a, team_score_a, team_name_b, team_score_b in islice(
+                match_score_tuples, self.batch_size
+            ):
+                # Inlining the lookup of already interned team names, as this is the hot path
+                team_id_a = team_ids.get(team_name_a)
+                if team_id_a is None:
+                    team_id_a = self._team_id(team_name_a)
+                team_id_b = team_ids.get(team_name_b)
+                if team_id_b is None:
+                    team_id_b = self._team_id(team_name_b)
+                team_a_ids.append(team_id_a)
+                team_b_ids.append(team_id_b)
+                team_a_scores.append(team_score_a)
+                team_b_scores.append(team_score_b)
+            if not team_a_ids:
+                break
+            self._score_batch(team_a_ids, team_b_ids, team_a_scores, team_b_scores, [])
+
+    def _accumulate_scores(self, loader: SoccerMatchScoresLoader):
+        if isinstance(loader, ColumnarSoccerMatchScoresLoader):
+            for match_score_columns in loader.iter_match_score_columns():
+                self._accumulate_match_score_columns(match_score_columns)
+            return
+
+        keep_match_scores = self._needs_match_scores()
+        if isinstance(loader, TupleSoccerMatchScoresLoader) and not keep_match_scores:
+            self._accumulate_match_score_tuples(loader.iter_match_score_tuples())
+            return
+
+        match_scores = iter(loader.iter_match_scores())
+        while True:
+            team_a_ids = array(self.METRIC_TYPECODE)
+            team_b_ids = array(self.METRIC_TYPECODE)
+            team_a_scores = array(self.METRIC_TYPECODE)
+            team_b_scores = array(self.METRIC_TYPECODE)
+            match_score_batch = []
+            for match_score in islice(match_scores, self.batch_size):
+                team_a_ids.append(self._team_id(match_score.team_score_a.team_name))
+                team_b_ids.append(self._team_id(match_score.team_score_b.team_name))
+                team_a_scores.append(match_score.team_score_a.score)
+                team_b_scores.append(match_score.team_score_b.score)
+                if keep_match_scores:
+                    match_score_batch.append(match_score)
+            if not team_a_ids:
+                break
+            self._score_batch(
+                team_a_ids, team_b_ids, team_a_scores, team_b_scores, match_score_batch
+            )
+
+    @staticmethod
+    @contextmanager
+    def _checking_overflow():
+        try:
+            yield
+        except OverflowError as exc:
+            raise ValueError(f"Metric totals must fit within 64-bit integers ({exc})") from exc
+
+    @contextmanager
+    def _observe_loading(self):
+        if self.observer is None:
+            yield
+            return
+        match_count_before = self.match_count
+        team_count_before = len(self.team_names)
+        with observe_stage(self.observer, "load_scores"):
+            yield
+        self.observer.on_count("matches_parsed", self.match_count - match_count_before)
+        self.observer.on_count("teams_seen", len(self.team_names) - team_count_before)
 
     def load_scores(self, loader: SoccerMatchScoresLoader):
-        for match_score in loader.iter_match_scores():
-            self.teams.add(match_score.team_score_a.team_name)
-            self.teams.add(match_score.team_score_b.team_name)
-            for metric_scorer, metric_lookup in self._metric_scorers_and_lookups():
-                metric_a, metric_b = cast(MetricScorer, metric_scorer).score(match_score)
-                metric_lookup[match_score.team_score_a.team_name] += metric_a
-                metric_lookup[match_score.team_score_b.team_name] += metric_b
-        self._generate_rankings()
+        with self._observe_loading(), self._checking_overflow():
+            self._accumulate_scores(loader)
+            with observe_stage(self.observer, "generate_rankings"):
+                self._generate_rankings()
 
-    def iter_rankings(self) -> Iterable[str]:
+    def partial_totals(self) -> TeamMetricTotals:
+        """Returns the accumulated metric totals relative to each metric scorer's default"""
+        return TeamMetricTotals(
+            team_names=list(self.team_names),
+            metric_totals=[
+                array(
+                    self.METRIC_TYPECODE,
+                    map(operator.sub, metric_column, repeat(metric_scorer.default())),
+                )
+                for metric_scorer, metric_column in self._metric_scorers_and_columns()
+            ],
+            match_count=self.match_count,
+        )
+
+    def merge_totals(self, totals: TeamMetricTotals):
+        if len(totals.metric_totals) != len(self.metric_scorers):
+            raise ValueError("Metric totals must contain one set of totals per metric scorer")
+        team_ids = [self._team_id(team_name) for team_name in totals.team_names]
+        if self._vectorized and team_ids:
+            self.metric_bound += max(
+                (
+                    max(abs(int(np.max(team_metric_totals))), abs(int(np.min(team_metric_totals))))
+                    for team_metric_totals in totals.metric_totals
+                ),
+                default=0,
+            )
+        for metric_column, team_metric_totals in zip(self.metrics, totals.metric_totals):
+            self._scatter_add(metric_column, team_ids, team_metric_totals)
+        self.match_count += totals.match_count
+
+    def load_totals(self, loader: SoccerTeamMetricTotalsLoader):
+        with self._observe_loading(), self._checking_overflow():
+            for totals in loader.iter_metric_totals(self.metric_scorers):
+                self.merge_totals(totals)
+            with observe_stage(self.observer, "generate_rankings"):
+                self._generate_rankings()
+
+    def _format_ranking(self, ranking: int, team_id: int) -> str:
+        ranking_text_parts = [f"{ranking}. {self.team_names[team_id]}"]
+        metrics_text = ", ".join(
+            metric_scorer.readable_string_from_metric(metric_column[team_id])
+            for metric_scorer, metric_column in self._metric_scorers_and_columns()
+        )
+        if metrics_text:
+            ranking_text_parts.append(metrics_text)
+        return ", ".join(ranking_text_parts)
+
+    def _iter_formatted_rankings(self, rank_groups: Iterable[list[int]]) -> Iterable[str]:
         next_ranking = 1
-        for ranking_group in self.rankings:
+        for ranking_group in rank_groups:
             curr_ranking = next_ranking
-            for team_name in ranking_group:
-                ranking_text_parts = [f"{curr_ranking}. {team_name}"]
-                metrics_text = ", ".join(
-                    metric_scorer.readable_string_from_metric(metric_lookup[team_name])
-                    for metric_scorer, metric_lookup in self._metric_scorers_and_lookups()
-                )
-                if metrics_text:
-                    ranking_text_parts.append(metrics_text)
-                yield ", ".join(ranking_text_parts)
+            for team_id in ranking_group:
+                yield self._format_ranking(curr_ranking, team_id)
                 next_ranking += 1
 
+    def iter_rankings(self) -> Iterable[str]:
+        return self._iter_formatted_rankings(self.rankings)
+
+
+class SortedBucketList:
+    """
+    Minimal sorted list (similar to sortedcontainers.SortedList, without the dependency) made up of
+    a list of small sorted buckets, plus a Fenwick tree of bucket sizes for positional lookups.
+    Adding/removing an item costs O(log n + bucket size) instead of O(n) for a flat sorted list.
+    """
+
+    DEFAULT_LOAD = 512
+
+    def __init__(self, load: int = DEFAULT_LOAD):
+        if load <= 0:
+            raise ValueError("Load must be > 0")
+        self.load = load
+        self._buckets: list[list] = []
+        # Last (max) item of each bucket, used to find the bucket an item belongs to
+        self._maxes: list = []
+        self._len = 0
+        # Lazily (re)built whenever buckets are split or removed
+        self._bucket_sizes_tree: list[int] | None = None
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self):
+        return chain.from_iterable(self._buckets)
+
+    def clear(self):
+        self._buckets.clear()
+        self._maxes.clear()
+        self._len = 0
+        self._bucket_sizes_tree = None
+
+    def _update_bucket_size(self, bucket_index: int, delta: int):
+        if self._bucket_sizes_tree is None:
+            return
+        while bucket_index < len(self._bucket_sizes_tree):
+            self._bucket_sizes_tree[bucket_index] += delta
+            bucket_index |= bucket_index + 1
+
+    def _count_before_bucket(self, bucket_index: int) -> int:
+        if self._bucket_sizes_tree is None:
+            self._bucket_sizes_tree = [len(bucket) for bucket in self._buckets]
+            for index in range(len(self._bucket_sizes_tree)):
+                parent_index = index | (index + 1)
+                if parent_index < len(self._bucket_sizes_tree):
+                    self._bucket_sizes_tree[parent_index] += self._bucket_sizes_tree[index]
+        count = 0
+        while bucket_index > 0:
+            count += self._bucket_sizes_tree[bucket_index - 1]
+            bucket_index &= bucket_index - 1
+        return count
+
+    def add(self, item):
+        self._len += 1
+        if not self._buckets:
+            self._buckets.append([item])
+            self._maxes.append(item)
+            self._bucket_sizes_tree = None
+            return
+
+        bucket_index = bisect_left(self._maxes, item)
+        if bucket_index == len(self._buckets):
+            bucket_index -= 1
+            self._buckets[bucket_index].append(item)
+            self._maxes[bucket_index] = item
+        else:
+            insort(self._buckets[bucket_index], item)
+        self._update_bucket_size(bucket_index, 1)
+
+        bucket = self._buckets[bucket_index]
+        if len(bucket) > 2 * self.load:
+            self._buckets.insert(bucket_index + 1, bucket[self.load :])
+            del bucket[self.load :]
+            self._maxes[bucket_index] = bucket[-1]
+            self._maxes.insert(bucket_index + 1, self._buckets[bucket_index + 1][-1])
+            self._bucket_sizes_tree = None
+
+    def remove(self, item):
+        bucket_index = bisect_left(self._maxes, item)
+        if bucket_index < len(self._buckets):
+            bucket = self._buckets[bucket_index]
+            item_index = bisect_left(bucket, item)
+            if item_index < len(bucket) and bucket[item_index] == item:
+                self._len -= 1
+                del bucket[item_index]
+                if bucket:
+                    self._maxes[bucket_index] = bucket[-1]
+                    self._update_bucket_size(bucket_index, -1)
+                else:
+                    del self._buckets[bucket_index]
+                    del self._maxes[bucket_index]
+                    self._bucket_sizes_tree = None
+                return
+        raise ValueError(f"{item!r} not in list")
+
+    def bisect_left(self, item) -> int:
+        """Returns the number of items strictly less than the given item"""
+        bucket_index = bisect_left(self._maxes, item)
+        if bucket_index == len(self._buckets):
+            return self._len
+        return self._count_before_bucket(bucket_index) + bisect_left(
+            self._buckets[bucket_index], item
+        )
+
+
+class IncrementalStandardCompetitionSoccerTeamRanker(StandardCompetitionSoccerTeamRanker):
+    """
+    Ranker for live leaderboards where match scores are loaded in many small batches.
+    Instead of re-sorting every team after each load, only the teams touched by newly loaded match
+    scores are moved within a sorted container of decorated items. Rankings (including shared
+    rankings for ties) are derived from the sorted container when they are read.
+    """
+
+    def __init__(self, metric_scorers: list[MetricScorer], **kwargs):
+        super().__init__(metric_scorers=metric_scorers, **kwargs)
+        self.sorted_teams = SortedBucketList()
+        # Current decorated item of each team within sorted_teams, indexed by team ID
+        self.decorated_teams: list[tuple[int | str, ...] | None] = []
+        self.touched_team_ids: set[int] = set()
+
+    def clear(self):
+        super().clear()
+        self.sorted_teams.clear()
+        self.decorated_teams.clear()
+        self.touched_team_ids.clear()
+
+    def _team_id(self, team_name: str) -> int:
+        team_id = super()._team_id(team_name)
+        if team_id == len(self.decorated_teams):
+            self.decorated_teams.append(None)
+            self.touched_team_ids.add(team_id)
+        return team_id
+
+    def _scatter_add(self, metric_column: array, team_ids: Sequence[int], metric_deltas):
+        super()._scatter_add(metric_column, team_ids, metric_deltas)
+        self.touched_team_ids.update(team_ids)
+
+    def _generate_rankings(self):
+        for team_id in self.touched_team_ids:
+            previous_decorated_team = self.decorated_teams[team_id]
+            decorated_team = self._decorate_team(team_id)
+            if previous_decorated_team == decorated_team:
+                continue
+            if previous_decorated_team is not None:
+                self.sorted_teams.remove(previous_decorated_team)
+            self.sorted_teams.add(decorated_team)
+            self.decorated_teams[team_id] = decorated_team
+        self.touched_team_ids.clear()
+
+    def rank_of(self, team_name: str) -> int | None:
+        """Returns the (standard competition) ranking of a team, or None for an unknown team"""
+        team_id = self.team_ids.get(team_name)
+        if team_id is None or self.decorated_teams[team_id] is None:
+            return None
+        comparable_values = self._comparable_values(
+            cast(tuple[int | str, ...], self.decorated_teams[team_id])
+        )
+        return self.sorted_teams.bisect_left(comparable_values) + 1
+
+    def iter_rankings(self) -> Iterable[str]:
+        return self.iter_top_k_rankings(self.top_k)
+
+    def iter_top_k_rankings(self, top_k: int | None) -> Iterable[str]:
+        """Same as iter_rankings, with the top K given per call (ie per query of a live ranking)"""
+        if top_k is not None and top_k <= 0:
+            raise ValueError("Top K must be > 0")
+        return self._iter_formatted_rankings(
+            self._limit_rank_groups(self._iter_rank_groups(self.sorted_teams), top_k)
+        )
+
+
+class WindowedStandardCompetitionSoccerTeamRanker(IncrementalStandardCompetitionSoccerTeamRanker):
+    """
+    Ranker for form tables, only counting each team's last N (window) matches. The metric deltas
+    of each team's matches within its window are kept, so that when a match leaves the window its
+    deltas are subtracted instead of re-scoring the remaining matches. Combined with the sorted
+    container of the incremental ranker, rankings can be read after every round for about the
+    cost of a single pass over the season.
+    """
+
+    def __init__(self, metric_scorers: list[MetricScorer], window: int, **kwargs):
+        if window <= 0:
+            raise ValueError("Window must be > 0")
+        super().__init__(metric_scorers=metric_scorers, **kwargs)
+        self.window = window
+        # Metric deltas (one per metric scorer) of every match within each team's window, oldest
+        # first, indexed by team ID
+        self.team_windows: list[deque[tuple[int, ...]]] = []
+
+    def clear(self):
+        super().clear()
+        self.team_windows.clear()
+
+    def _team_id(self, team_name: str) -> int:
+        team_id = super()._team_id(team_name)
+        if team_id == len(self.team_windows):
+            self.team_windows.append(deque())
+        return team_id
+
+    def _add_to_window(self, team_id: int, metric_deltas: tuple[int, ...]):
+        team_window = self.team_windows[team_id]
+        team_window.append(metric_deltas)
+        for metric_column, metric_delta in zip(self.metrics, metric_deltas):
+            metric_column[team_id] += metric_delta
+        if len(team_window) > self.window:
+            for metric_column, metric_delta in zip(self.metrics, team_window.popleft()):
+                metric_column[team_id] -= metric_delta
+        self.touched_team_ids.add(team_id)
+
+    def _accumulate_scores(self, loader: SoccerMatchScoresLoader):
+        # Matches are scored one at a time, as the window of a team depends on their order
+        for match_score in loader.iter_match_scores():
+            team_id_a = self._team_id(match_score.team_score_a.team_name)
+            team_id_b = self._team_id(match_score.team_score_b.team_name)
+            metric_deltas = [
+                metric_scorer.score(match_score) for metric_scorer in self.metric_scorers
+            ]
+            self._add_to_window(
+                team_id_a, tuple(metric_delta_a for metric_delta_a, _ in metric_deltas)
+            )
+            self._add_to_window(
+                team_id_b, tuple(metric_delta_b for _, metric_delta_b in metric_deltas)
+            )
+            self.match_count += 1
+
+    def merge_totals(self, totals: TeamMetricTotals):
+        raise ValueError("Windowed rankings can only be loaded from match scores, not totals")
+
+
+class HeadToHeadStandardCompetitionSoccerTeamRanker(StandardCompetitionSoccerTeamRanker):
+    """
+    Ranker breaking ties on head-to-head results among the tied teams only: points, then goal
+    difference, then goals scored within the matches played between tied teams. Teams are tied
+    when their first head_to_head_after metrics are equal (ie points only by default), any later
+    metrics only break the ties that head-to-head results leave.
+
+    Results between each pair of teams are accumulated while loading match scores into a sparse
+    pairwise index, keyed by the pair of team IDs packed into a single int, so resolving a tie group
+    of g teams costs O(g²) index lookups and never rescans the match scores.
+    """
+
+    TEAM_ID_BITS = 32
+    # Each pair's row holds: points + goals of the lower team ID, then of the higher team ID
+    PAIR_ROW_SIZE = 4
+    HEAD_TO_HEAD_KEY_SIZE = 3
+
+    def __init__(self, metric_scorers: list[MetricScorer], head_to_head_after: int = 1, **kwargs):
+        if not 0 <= head_to_head_after <= len(metric_scorers):
+            raise ValueError(
+                "Head to head after must be between 0 and the number of metric scorers"
+            )
+        super().__init__(metric_scorers=metric_scorers, **kwargs)
+        self.head_to_head_after = head_to_head_after
+        self.win_points = MatchResultMetricScorer.POINTS_BY_RESULT[SoccerMatchResult.WIN]
+        self.tie_points = MatchResultMetricScorer.POINTS_BY_RESULT[SoccerMatchResult.TIE]
+        self.loss_points = MatchResultMetricScorer.POINTS_BY_RESULT[SoccerMatchResult.LOSS]
+        # Maps each packed pair of team IDs (lower ID first) to the start of its row of results
+        self.pair_rows: dict[int, int] = {}
+        self.pair_results = array(self.METRIC_TYPECODE)
+
+    def clear(self):
+        super().clear()
+        self.pair_rows.clear()
+        del self.pair_results[:]
+
+    def _pair_key(self, team_id_a: int, team_id_b: int) -> int:
+        if team_id_a > team_id_b:
+            team_id_a, team_id_b = team_id_b, team_id_a
+        return team_id_a << self.TEAM_ID_BITS | team_id_b
+
+    def _index_pair_results(
+        self,
+        team_a_ids: Sequence[int],
+        team_b_ids: Sequence[int],
+        team_a_scores: Sequence[int],
+        team_b_scores: Sequence[int],
+    ):
+        pair_rows = self.pair_rows
+        pair_results = self.pair_results
+        # Team IDs may be NumPy integers (ie when loading columns), which are slower as dict keys
+        for team_id_a, team_id_b, team_score_a, team_score_b in zip(
+            map(int, team_a_ids), map(int, team_b_ids), team_a_scores, team_b_scores
+        ):
+            if team_id_a > team_id_b:
+                team_id_a, team_id_b = team_id_b, team_id_a
+                team_score_a, team_score_b = team_score_b, team_score_a
+            pair_key = team_id_a << self.TEAM_ID_BITS | team_id_b
+            pair_row = pair_rows.get(pair_key)
+            if pair_row is None:
+                pair_row = pair_rows[pair_key] = len(pair_results)
+                pair_results.extend(repeat(0, self.PAIR_ROW_SIZE))
+            if team_score_a > team_score_b:
+                pair_results[pair_row] += self.win_points
+                pair_results[pair_row + 2] += self.loss_points
+            elif team_score_a == team_score_b:
+                pair_results[pair_row] += self.tie_points
+                pair_results[pair_row + 2] += self.tie_points
+            else:
+                pair_results[pair_row] += self.loss_points
+                pair_results[pair_row + 2] += self.win_points
+            pair_results[pair_row + 1] += team_score_a
+            pair_results[pair_row + 3] += team_score_b
+
+    def _score_batch(
+        self,
+        team_a_ids: array,
+        team_b_ids: array,
+        team_a_scores: array,
+        team_b_scores: array,
+        match_scores: list[MatchScore],
+    ):
+        super()._score_batch(team_a_ids, team_b_ids, team_a_scores, team_b_scores, match_scores)
+        self._index_pair_results(team_a_ids, team_b_ids, team_a_scores, team_b_scores)
+
+    def merge_totals(self, totals: TeamMetricTotals):
+        raise ValueError("Head to head rankings can only be loaded from match scores, not totals")
+
+    def _head_to_head_key(self, team_id: int, tied_team_ids: list[int]) -> tuple[int, int, int]:
+        """Returns the sortable head-to-head points, goal difference + goals of a tied team"""
+        points = goals_for = goals_against = 0
+        for other_team_id in tied_team_ids:
+            pair_row = self.pair_rows.get(self._pair_key(team_id, other_team_id))
+            if pair_row is None:
+                continue
+            if team_id < other_team_id:
+                team_points, team_goals, _, other_team_goals = self.pair_results[
+                    pair_row : pair_row + self.PAIR_ROW_SIZE
+                ]
+            else:
+                _, other_team_goals, team_points, team_goals = self.pair_results[
+                    pair_row : pair_row + self.PAIR_ROW_SIZE
+                ]
+            points += team_points
+            goals_for += team_goals
+            goals_against += other_team_goals
+        return -points, goals_against - goals_for, -goals_for
+
+    def _resolve_head_to_head(
+        self, sorted_decorated_teams: Iterable[tuple[int | str, ...]]
+    ) -> list[tuple[int | str, ...]]:
+        """
+        Inserts the head-to-head key of each team (within its tie group) into its decorated item
+        right after the metrics that tie groups are made of, and re-sorts each tie group
+        """
+        tie_size = self.head_to_head_after
+        resolved_decorated_teams = []
+        for _, tie_group in groupby(
+            sorted_decorated_teams, key=lambda decorated_team: decorated_team[:tie_size]
+        ):
+            tied_decorated_teams = list(tie_group)
+            # A team never plays itself, so a team alone within its tie group has an all 0 key
+            tied_team_ids = [
+                cast(int, decorated_team[-1]) for decorated_team in tied_decorated_teams
+            ]
+            resolved_decorated_teams.extend(
+                sorted(
+                    (
+                        *decorated_team[:tie_size],
+                        *self._head_to_head_key(cast(int, decorated_team[-1]), tied_team_ids),
+                        *decorated_team[tie_size:],
+                    )
+                    for decorated_team in tied_decorated_teams
+                )
+            )
+        return resolved_decorated_teams
+
+    def _comparable_values(self, decorated_team: tuple[int | str, ...]) -> tuple[int | str, ...]:
+        # Only used on decorated items that include the head-to-head key
+        return decorated_team[: len(self.metric_scorers) + self.HEAD_TO_HEAD_KEY_SIZE]
+
+    def _top_k_tie_groups(self, top_k: int) -> list[tuple[int | str, ...]]:
+        """
+        Returns the sorted decorated items of every tie group that may hold one of the top K teams,
+        without sorting every team (head-to-head results can reorder teams within a tie group)
+        """
+        top_decorated_teams = heapq.nsmallest(top_k, self._sort_decorated_teams)
+        if len(top_decorated_teams) < top_k:
+            return top_decorated_teams
+        tie_size = self.head_to_head_after
+        boundary_tie_values = top_decorated_teams[-1][:tie_size]
+        return sorted(
+            decorated_team
+            for decorated_team in self._sort_decorated_teams
+            if decorated_team[:tie_size] <= boundary_tie_values
+        )
+
+    def _generate_rankings(self):
+        self.rankings.clear()
+        if self.top_k is None:
+            sorted_decorated_teams = sorted(self._sort_decorated_teams)
+        else:
+            sorted_decorated_teams = self._top_k_tie_groups(self.top_k)
+        self.rankings.extend(
+            self._limit_rank_groups(
+                self._iter_rank_groups(self._resolve_head_to_head(sorted_decorated_teams)),
+                self.top_k,
+            )
+        )
+
+
+class ExternalMemoryStandardCompetitionSoccerTeamRanker(StandardCompetitionSoccerTeamRanker):
+    """
+    Ranker for ranking tables too large to sort in memory. Decorated items are sorted in runs that
+    fit within a (approximate) memory budget, each run is spilled to a temporary file, and the runs
+    are k-way merged while rankings are read. Rankings (including ties) are identical to
+    StandardCompetitionSoccerTeamRanker.
+    """
+
+    # Approximate size of a decorated item, on top of its team name + metrics (ie tuple + ints)
+    DECORATED_TEAM_OVERHEAD_SIZE = 128
+    METRIC_SIZE = 32
+    RUN_BUFFER_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        metric_scorers: list[MetricScorer],
+        memory_budget: int,
+        spill_dir: Path | None = None,
+        **kwargs,
+    ):
+        if memory_budget <= 0:
+            raise ValueError("Memory budget must be > 0")
+        super().__init__(metric_scorers=metric_scorers, **kwargs)
+        # Max (approximate) number of bytes of decorated items sorted in memory at once
+        self.memory_budget = memory_budget
+        self.spill_dir = spill_dir
+        # Each record is: signed metrics, team ID, length of the UTF-8 encoded team name + the name
+        self.run_record_struct = struct.Struct(f"={len(metric_scorers)}qqI")
+        self.spilled_runs: list[BinaryIO] = []
+        # Decorated items of the last run, kept in memory rather than spilled
+        self.in_memory_run: list[tuple[int | str, ...]] = []
+
+    def _clear_runs(self):
+        for spilled_run in self.spilled_runs:
+            spilled_run.close()
+        self.spilled_runs.clear()
+        self.in_memory_run.clear()
+
+    def clear(self):
+        super().clear()
+        self._clear_runs()
+
+    def _decorated_team_size(self, decorated_team: tuple[int | str, ...]) -> int:
+        return (
+            self.DECORATED_TEAM_OVERHEAD_SIZE
+            + len(cast(str, decorated_team[-2]))
+            + self.METRIC_SIZE * len(self.metric_scorers)
+        )
+
+    def _spill_run(self, run: list[tuple[int | str, ...]]):
+        run.sort()
+        spilled_run = tempfile.TemporaryFile(dir=self.spill_dir, buffering=self.RUN_BUFFER_SIZE)
+        for decorated_team in run:
+            *sortable_metrics, team_name, team_id = decorated_team
+            encoded_team_name = cast(str, team_name).encode()
+            spilled_run.write(
+                self.run_record_struct.pack(*sortable_metrics, team_id, len(encoded_team_name))
+            )
+            spilled_run.write(encoded_team_name)
+        self.spilled_runs.append(spilled_run)
+        run.clear()
+
+    def _iter_spilled_run(self, spilled_run: BinaryIO) -> Iterable[tuple[int | str, ...]]:
+        # Every run has its own file position, so rankings can only be read by one reader at a time
+        spilled_run.seek(0)
+        record_size = self.run_record_struct.size
+        while record := spilled_run.read(record_size):
+            *sortable_metrics, team_id, team_name_size = self.run_record_struct.unpack(record)
+            yield (*sortable_metrics, spilled_run.read(team_name_size).decode(), team_id)
+
+    def _generate_rankings(self):
+        self.rankings.clear()
+        self._clear_runs()
+        run = self.in_memory_run
+        run_size = 0
+        for decorated_team in self._sort_decorated_teams:
+            run.append(decorated_team)
+            run_size += self._decorated_team_size(decorated_team)
+            if run_size >= self.memory_budget:
+                self._spill_run(run)
+                run_size = 0
+        run.sort()
+
+    def _sorted_decorated_teams(self) -> Iterable[tuple[int | str, ...]]:
+        if not self.spilled_runs:
+            return self.in_memory_run
+        return heapq.merge(*map(self._iter_spilled_run, self.spilled_runs), self.in_memory_run)
+
+    def iter_rankings(self) -> Iterable[str]:
+        return self._iter_formatted_rankings(
+            self._limit_rank_groups(
+                self._iter_rank_groups(self._sorted_decorated_teams()), self.top_k
+            )
+        )
+
 
 class ToIORankingDumper(RankingDumper):
-    def __init__(self, fileio: TextIO):
+    DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+    def __init__(
+        self,
+        fileio: TextIO,
+        buffer_size: int | None = None,
+        flush_interval: float | None = None,
+        observer: PipelineObserver | None = None,
+    ):
+        """
+        By default, every ranking is written + flushed one line at a time (ie for interactive use).
+        If a buffer size (in characters) is given, rankings are instead joined into blocks of
+        roughly that size, each written with a single call. Blocks are only flushed at the end, or
+        also once at least flush_interval seconds have passed since the last flush (if given).
+        """
+        if buffer_size is not None and buffer_size <= 0:
+            raise ValueError("Buffer size must be > 0")
+        elif flush_interval is not None and flush_interval < 0:
+            raise ValueError("Flush interval must be >= 0")
         self.fileio = fileio
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.observer = observer
 
-    def dump_rankings(self, ranker: SoccerTeamRanker):
+    def _dump_buffered_rankings(self, ranker: SoccerTeamRanker, buffer_size: int) -> int:
+        last_flush_time = time.monotonic()
+        rankings_written = 0
+        buffered_rank_values = []
+        buffered_size = 0
+        for rank_value in ranker.iter_rankings():
+            buffered_rank_values.append(rank_value)
+            buffered_size += len(rank_value) + 1
+            if buffered_size < buffer_size:
+                continue
+            rankings_written += len(buffered_rank_values)
+            buffered_rank_values.append("")
+            self.fileio.write("\n".join(buffered_rank_values))
+            buffered_rank_values.clear()
+            buffered_size = 0
+            if (
+                self.flush_interval is not None
+                and time.monotonic() - last_flush_time >= self.flush_interval
+            ):
+                self.fileio.flush()
+                last_flush_time = time.monotonic()
+        if buffered_rank_values:
+            rankings_written += len(buffered_rank_values)
+            buffered_rank_values.append("")
+            self.fileio.write("\n".join(buffered_rank_values))
+        self.fileio.flush()
+        return rankings_written
+
+    def _dump_line_by_line_rankings(self, ranker: SoccerTeamRanker) -> int:
+        rankings_written = 0
         for rank_value in ranker.iter_rankings():
             self.fileio.write(rank_value)
             self.fileio.write("\n")
             self.fileio.flush()
+            rankings_written += 1
+        return rankings_written
+
+    def dump_rankings(self, ranker: SoccerTeamRanker):
+        with observe_stage(self.observer, "dump_rankings"):
+            if self.buffer_size is not None:
+                rankings_written = self._dump_buffered_rankings(ranker, self.buffer_size)
+            else:
+                rankings_written = self._dump_line_by_line_rankings(ranker)
+        if self.observer is not None:
+            self.observer.on_count("rankings_written", rankings_written)
+
 
+class DeltaRankingDumper(RankingDumper):
+    """
+    Writes only the changes between previous rankings (ie read back from a previous output) and the
+    current rankings of a ranker, as JSON lines, so that downstream consumers of huge tables only
+    ingest the handful of teams that changed. Every line is a JSON object with the keys:
+    - op: "insert" (new team), "remove" (team no longer ranked), "move" (rank changed) or "update"
+      (same rank, but its metrics changed)
+    - team: the team name
+    - old_rank, new_rank: the previous + current ranking (null when inserted/removed)
+    - old_metrics, new_metrics: the previous + current readable metrics (null when inserted/removed)
+    Inserts, moves + updates are written in current ranking order, then removals in previous order.
+    """
 
-def handle_input_args() -> Path | None:
-    # Opted to use sys.argv but argparse or click (additional package dependency) would also work
-    script_args = sys.argv[1:]
-    if len(script_args) > 1:
-        sys.exit("Invalid: Only 1 argument consisting of a file path is allowed.\n")
-    elif script_args == ["--help"]:
-        print("Usage:\n<file_path> (Input File to use as input)\n<No Args> (Use STDIN as input)\n")
-        sys.exit()
+    def __init__(
+        self,
+        fileio: TextIO,
+        previous_rankings: Iterable[str],
+        metric_count: int,
+        observer: PipelineObserver | None = None,
+    ):
+        self.fileio = fileio
+        self.previous_rankings = previous_rankings
+        # Number of metrics within each ranking, as team names may contain ", " too
+        self.metric_count = metric_count
+        self.observer = observer
+
+    def parse_ranking(self, ranking: str) -> tuple[int, str, list[str]]:
+        """Splits a ranking (ie `2. Lions, 5 pts`) into its ranking, team name + readable metrics"""
+        raw_ranking, separator, ranked_team = ranking.partition(". ")
+        ranked_team_parts = ranked_team.rsplit(", ", self.metric_count)
+        if (
+            not separator
+            or not raw_ranking.isdecimal()
+            or len(ranked_team_parts) != self.metric_count + 1
+        ):
+            raise ValueError(f"Invalid ranking: {ranking}")
+        team_name, *metrics = ranked_team_parts
+        return int(raw_ranking), team_name, metrics
+
+    def _write_delta(
+        self,
+        op: str,
+        team_name: str,
+        previous_ranking: tuple[int, list[str]] | None,
+        ranking: tuple[int, list[str]] | None,
+    ):
+        old_rank, old_metrics = previous_ranking or (None, None)
+        new_rank, new_metrics = ranking or (None, None)
+        self.fileio.write(
+            json.dumps(
+                {
+                    "op": op,
+                    "team": team_name,
+                    "old_rank": old_rank,
+                    "new_rank": new_rank,
+                    "old_metrics": old_metrics,
+                    "new_metrics": new_metrics,
+                }
+            )
+        )
+        self.fileio.write("\n")
+
+    def _dump_deltas(self, ranker: SoccerTeamRanker) -> int:
+        previous_rankings: dict[str, tuple[int, list[str]]] = {}
+        for raw_previous_ranking in self.previous_rankings:
+            previous_rank, team_name, previous_metrics = self.parse_ranking(raw_previous_ranking)
+            previous_rankings[team_name] = (previous_rank, previous_metrics)
+
+        deltas_written = 0
+        for raw_ranking in ranker.iter_rankings():
+            rank, team_name, metrics = self.parse_ranking(raw_ranking)
+            # Popped, so that only the removed teams are left once every ranking has been compared
+            previous_ranking = previous_rankings.pop(team_name, None)
+            if previous_ranking is None:
+                op = "insert"
+            elif previous_ranking[0] != rank:
+                op = "move"
+            elif previous_ranking[1] != metrics:
+                op = "update"
+            else:
+                continue
+            self._write_delta(op, team_name, previous_ranking, (rank, metrics))
+            deltas_written += 1
+        # Dicts keep insertion order, ie the previous ranking order
+        for team_name, previous_ranking in previous_rankings.items():
+            self._write_delta("remove", team_name, previous_ranking, None)
+            deltas_written += 1
+        self.fileio.flush()
+        return deltas_written
+
+    def dump_rankings(self, ranker: SoccerTeamRanker):
+        with observe_stage(self.observer, "dump_rankings"):
+            deltas_written = self._dump_deltas(ranker)
+        if self.observer is not None:
+            self.observer.on_count("deltas_written", deltas_written)
 
-    return Path(script_args[0]) if script_args else None
 
+class FollowRankingsEmitter:
+    """
+    Re-emits rankings whenever new match scores are appended to a followed file. Every emitted
+    ranking table is terminated by an empty line. If a checkpoint path is given, the consumed
+    offset + ranker state are checkpointed after every load, so that a restart resumes from the
+    checkpoint instead of re-reading the whole file.
 
-def main(file_path: Path | None):
-    ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=[MatchResultMetricScorer()])
+    Checkpoints are written atomically, in little-endian byte order, as:
+    - Header: magic, consumed byte offset of the followed file
+    - Snapshot of the ranker's partial totals (see FromSnapshotFilesSoccerTeamMetricTotalsLoader)
+    """
 
-    with open(file_path, "r") if file_path is not None else nullcontext() as input_fileio:
-        io_loader = FromIOSoccerMatchScoresLoader(
-            fileio=input_fileio if file_path is not None else stdin
+    CHECKPOINT_MAGIC = b"SOCCCKP1"
+    CHECKPOINT_HEADER = struct.Struct("<8sQ")
+
+    def __init__(
+        self,
+        ranker: StandardCompetitionSoccerTeamRanker,
+        loader: FollowedFileSoccerMatchScoresLoader,
+        fileio: TextIO,
+        checkpoint_path: Path | None = None,
+    ):
+        self.ranker = ranker
+        self.loader = loader
+        self.fileio = fileio
+        self.checkpoint_path = checkpoint_path
+        self.dumper = ToIORankingDumper(
+            fileio=fileio, buffer_size=ToIORankingDumper.DEFAULT_BUFFER_SIZE
         )
-        ranker.load_scores(io_loader)
-    io_dumper = ToIORankingDumper(fileio=stdout)
-    io_dumper.dump_rankings(ranker)
+        self.emitted_match_count: int | None = None
+
+    def restore_checkpoint(self) -> bool:
+        """Restores the offset + ranker state from the checkpoint (if any), returns if restored"""
+        if self.checkpoint_path is None:
+            return False
+        try:
+            checkpoint_fileio = open(self.checkpoint_path, "rb")
+        except FileNotFoundError:
+            return False
+        with checkpoint_fileio:
+            raw_header = checkpoint_fileio.read(self.CHECKPOINT_HEADER.size)
+            if len(raw_header) != self.CHECKPOINT_HEADER.size:
+                raise ValueError("Invalid checkpoint: Truncated file")
+            magic, offset = self.CHECKPOINT_HEADER.unpack(raw_header)
+            if magic != self.CHECKPOINT_MAGIC:
+                raise ValueError("Invalid checkpoint: Unknown file format")
+            totals = FromSnapshotFilesSoccerTeamMetricTotalsLoader.load_matching_snapshot(
+                checkpoint_fileio, self.ranker.metric_scorers
+            )
+        self.ranker.clear()
+        self.ranker.merge_totals(totals)
+        self.loader.offset = offset
+        return True
+
+    def write_checkpoint(self):
+        checkpoint_path = cast(Path, self.checkpoint_path)
+        # Writing to a temporary file first, so that the offset + ranker state are always replaced
+        # together (and a partially written checkpoint is never read)
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=checkpoint_path.parent, prefix=f".{checkpoint_path.name}.", delete=False
+        ) as checkpoint_fileio:
+            checkpoint_fileio.write(
+                self.CHECKPOINT_HEADER.pack(self.CHECKPOINT_MAGIC, self.loader.offset)
+            )
+            FromSnapshotFilesSoccerTeamMetricTotalsLoader.dump_snapshot(
+                checkpoint_fileio, self.ranker.metric_scorers, self.ranker.partial_totals()
+            )
+        os.replace(checkpoint_fileio.name, checkpoint_path)
+
+    def poll(self) -> bool:
+        """Loads newly appended match scores, and re-emits the rankings if they (may have) changed"""
+        offset_before = self.loader.offset
+        self.ranker.load_scores(self.loader)
+        if self.checkpoint_path is not None and self.loader.offset != offset_before:
+            self.write_checkpoint()
+        if self.ranker.match_count == self.emitted_match_count:
+            return False
+        self.dumper.dump_rankings(self.ranker)
+        self.fileio.write("\n")
+        self.fileio.flush()
+        self.emitted_match_count = self.ranker.match_count
+        return True
+
+    def run(self, interval: float):
+        while True:
+            self.poll()
+            time.sleep(interval)
+
+
+# Tiebreaker metrics (applied in the given order, after points) selectable from the CLI
+TIEBREAKER_METRIC_SCORERS: dict[str, type[MetricScorer]] = {
+    "goal-difference": GoalDifferenceMetricScorer,
+    "goals-for": GoalsForMetricScorer,
+}
+# Not a metric, tiebreakers given before it make up the ties that head-to-head results break
+HEAD_TO_HEAD_TIEBREAKER = "head-to-head"
+
+
+def build_metric_scorers(args: argparse.Namespace) -> list[MetricScorer]:
+    """Points, followed by the metric of every --tiebreaker (head-to-head isn't a metric)"""
+    metric_scorers: list[MetricScorer] = [MatchResultMetricScorer()]
+    metric_scorers.extend(
+        TIEBREAKER_METRIC_SCORERS[tiebreaker]()
+        for tiebreaker in args.tiebreakers
+        if tiebreaker != HEAD_TO_HEAD_TIEBREAKER
+    )
+    return metric_scorers
+
+
+def _positive_int(raw_value: str) -> int:
+    value = int(raw_value)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"{raw_value} must be > 0")
+    return value
+
+
+def _expand_file_path_patterns(file_path_patterns: list[str]) -> list[Path]:
+    file_paths = []
+    for file_path_pattern in file_path_patterns:
+        if not glob.has_magic(file_path_pattern):
+            file_paths.append(Path(file_path_pattern))
+            continue
+        matching_file_paths = sorted(glob.glob(file_path_pattern))
+        if not matching_file_paths:
+            sys.exit(f"Invalid: No input files match {file_path_pattern}\n")
+        file_paths.extend(map(Path, matching_file_paths))
+    return file_paths
+
+
+def handle_input_args() -> argparse.Namespace:
+    arg_parser = argparse.ArgumentParser(
+        description="Outputs the ranking table for a league given a set of match scores"
+    )
+    arg_parser.add_argument(
+        "file_paths",
+        nargs="*",
+        metavar="file_path",
+        help=(
+            "Input File(s) or glob pattern(s) to use as input, combined into a single ranking"
+            " (STDIN is used as input if omitted)"
+        ),
+    )
+    arg_parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        help="Max number of worker processes parsing input files or STDIN (default: CPU count)",
+    )
+    arg_parser.add_argument(
+        "--top-k",
+        type=_positive_int,
+        help="Only output the top K rankings (every team tied at rank K is also output)",
+    )
+    arg_parser.add_argument(
+        "--memory-budget",
+        type=_positive_int,
+        help=(
+            "Approximate memory (in MiB) available to sort the ranking table, larger tables are"
+            " sorted in runs spilled to temporary files"
+        ),
+    )
+    arg_parser.add_argument(
+        "--tiebreaker",
+        dest="tiebreakers",
+        action="append",
+        choices=[*TIEBREAKER_METRIC_SCORERS, HEAD_TO_HEAD_TIEBREAKER],
+        default=[],
+        help=(
+            "Metric used to break ties on points (repeatable, applied in the given order)."
+            " head-to-head breaks ties on results between the tied teams only"
+        ),
+    )
+    arg_parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help=(
+            "Directory for binary caches of parsed input files, so that re-ranking an unmodified"
+            " file skips text parsing"
+        ),
+    )
+    arg_parser.add_argument(
+        "--from-snapshots",
+        action="store_true",
+        help="Input files are snapshots (see --emit-snapshot) to merge, rather than match scores",
+    )
+    arg_parser.add_argument(
+        "--emit-snapshot",
+        type=Path,
+        metavar="SNAPSHOT_PATH",
+        help=(
+            "Write a compact binary snapshot of the per-team metric totals instead of the"
+            " rankings (unless --delta-from is given), so that it can be merged with the snapshots"
+            " of other shards or used as a later --delta-from"
+        ),
+    )
+    arg_parser.add_argument(
+        "--delta-from",
+        type=Path,
+        metavar="PREVIOUS_PATH",
+        help=(
+            "Only output the teams inserted, removed, moved or updated since the previous rankings"
+            " (a previous output or snapshot file), as JSON lines"
+        ),
+    )
+    arg_parser.add_argument(
+        "--follow",
+        action="store_true",
+        help=(
+            "Keep following the (single) input file as match scores are appended to it, and"
+            " re-emit the rankings (terminated by an empty line) whenever they change"
+        ),
+    )
+    arg_parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Seconds between checks for appended match scores with --follow (default: 1)",
+    )
+    arg_parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        metavar="CHECKPOINT_PATH",
+        help=(
+            "With --follow, checkpoint the consumed offset + ranker state to this file, and resume"
+            " from it on restart"
+        ),
+    )
+    arg_parser.add_argument(
+        "--window",
+        type=_positive_int,
+        help="Only count each team's last N matches, ie a form table (input is read in order)",
+    )
+    arg_parser.add_argument(
+        "--per-round",
+        action="store_true",
+        help=(
+            "Output the rankings (terminated by an empty line) after every round, ie at each round"
+            " marker line (only '#' characters, optionally followed by a space and a label like"
+            " '# Round 12') and at the end of the input"
+        ),
+    )
+    arg_parser.add_argument(
+        "--max-invalid-lines",
+        type=int,
+        metavar="N",
+        help=(
+            "Lenient mode: skip + quarantine invalid lines rather than failing on the first one,"
+            " and only fail (after reading the whole input) if there are more than N of them"
+        ),
+    )
+    arg_parser.add_argument(
+        "--quarantine",
+        type=Path,
+        metavar="QUARANTINE_PATH",
+        help=(
+            "With --max-invalid-lines, write the invalid lines (with their source + line number)"
+            " to this file as JSON lines (default: STDERR)"
+        ),
+    )
+    arg_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a JSON summary of per-stage timings + counters to STDERR",
+    )
+    args = arg_parser.parse_args(sys.argv[1:])
+    if args.from_snapshots and not args.file_paths:
+        arg_parser.error("--from-snapshots requires at least one snapshot file path")
+    elif args.interval < 0:
+        arg_parser.error("--interval must be >= 0")
+    elif args.checkpoint is not None and not args.follow:
+        arg_parser.error("--checkpoint requires --follow")
+    elif args.follow and (
+        args.from_snapshots
+        or args.emit_snapshot is not None
+        or args.memory_budget is not None
+        or args.cache_dir is not None
+        or args.profile
+    ):
+        arg_parser.error(
+            "--follow can't be combined with --from-snapshots, --emit-snapshot, --memory-budget,"
+            " --cache-dir or --profile"
+        )
+    elif args.max_invalid_lines is not None and args.max_invalid_lines < 0:
+        arg_parser.error("--max-invalid-lines must be >= 0")
+    elif args.quarantine is not None and args.max_invalid_lines is None:
+        arg_parser.error("--quarantine requires --max-invalid-lines")
+    elif args.max_invalid_lines is not None and (
+        args.follow
+        or args.from_snapshots
+        or args.cache_dir is not None
+        or args.window is not None
+        or args.per_round
+    ):
+        arg_parser.error(
+            "--max-invalid-lines can't be combined with --follow, --from-snapshots, --cache-dir,"
+            " --window or --per-round"
+        )
+    elif (args.window is not None or args.per_round) and (
+        args.follow
+        or args.from_snapshots
+        or args.emit_snapshot is not None
+        or args.memory_budget is not None
+        or args.cache_dir is not None
+    ):
+        arg_parser.error(
+            "--window and --per-round can't be combined with --follow, --from-snapshots,"
+            " --emit-snapshot, --memory-budget or --cache-dir"
+        )
+    elif args.delta_from is not None and (args.follow or args.window is not None or args.per_round):
+        arg_parser.error("--delta-from can't be combined with --follow, --window or --per-round")
+    elif args.tiebreakers.count(HEAD_TO_HEAD_TIEBREAKER) > 1:
+        arg_parser.error(f"--tiebreaker {HEAD_TO_HEAD_TIEBREAKER} can only be given once")
+    elif HEAD_TO_HEAD_TIEBREAKER in args.tiebreakers and (
+        args.follow
+        or args.from_snapshots
+        or args.emit_snapshot is not None
+        or args.memory_budget is not None
+        or args.window is not None
+        or args.per_round
+    ):
+        arg_parser.error(
+            f"--tiebreaker {HEAD_TO_HEAD_TIEBREAKER} can't be combined with --follow,"
+            " --from-snapshots, --emit-snapshot, --memory-budget, --window or --per-round"
+        )
+    args.file_paths = _expand_file_path_patterns(args.file_paths)
+    if args.follow and len(args.file_paths) != 1:
+        arg_parser.error("--follow requires exactly one input file path")
+    return args
+
+
+def follow(args: argparse.Namespace, metric_scorers: list[MetricScorer]):
+    emitter = FollowRankingsEmitter(
+        ranker=IncrementalStandardCompetitionSoccerTeamRanker(
+            metric_scorers=metric_scorers, top_k=args.top_k
+        ),
+        loader=FollowedFileSoccerMatchScoresLoader(file_path=args.file_paths[0], fast_parse=True),
+        fileio=stdout,
+        checkpoint_path=args.checkpoint,
+    )
+    emitter.restore_checkpoint()
+    try:
+        emitter.run(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+def _iter_input_lines(file_paths: Sequence[Path]) -> Iterable[bytes]:
+    """Yields the raw lines of every input file in order (or of STDIN if there are none)"""
+    if not file_paths:
+        yield from stdin.buffer
+        return
+    for file_path in file_paths:
+        with open_input_file(file_path) as input_fileio:
+            yield from input_fileio
+
+
+def rank_rounds(
+    args: argparse.Namespace,
+    metric_scorers: list[MetricScorer],
+    observer: PipelineObserver | None = None,
+):
+    ranker: IncrementalStandardCompetitionSoccerTeamRanker
+    if args.window is not None:
+        ranker = WindowedStandardCompetitionSoccerTeamRanker(
+            metric_scorers=metric_scorers, window=args.window, top_k=args.top_k, observer=observer
+        )
+    else:
+        ranker = IncrementalStandardCompetitionSoccerTeamRanker(
+            metric_scorers=metric_scorers, top_k=args.top_k, observer=observer
+        )
+    io_dumper = ToIORankingDumper(
+        fileio=stdout,
+        buffer_size=None if stdout.isatty() else ToIORankingDumper.DEFAULT_BUFFER_SIZE,
+        observer=observer,
+    )
+    if not args.per_round:
+        # Without --per-round, every line (even one starting with "#") is a match score
+        if args.file_paths:
+            ranker.load_scores(FromFilesSoccerMatchScoresLoader(args.file_paths, observer=observer))
+        else:
+            ranker.load_scores(
+                FromBinaryIOSoccerMatchScoresLoader(fileio=stdin.buffer, observer=observer)
+            )
+        io_dumper.dump_rankings(ranker)
+        return
+
+    rounds_loader = FromBinaryLinesSoccerMatchRoundsLoader(
+        raw_lines=_iter_input_lines(args.file_paths), observer=observer
+    )
+    # Each round only moves the teams that played within it, rather than re-ranking every team
+    for round_loader in rounds_loader.iter_round_loaders():
+        ranker.load_scores(round_loader)
+        io_dumper.dump_rankings(ranker)
+        stdout.write("\n")
+
+
+def _iter_previous_rankings(
+    previous_path: Path, metric_scorers: list[MetricScorer], top_k: int | None
+) -> Iterable[str]:
+    """Yields the rankings of a previous output file, or ranks a previous snapshot file"""
+    with open(previous_path, "rb") as previous_fileio:
+        magic = previous_fileio.read(
+            len(FromSnapshotFilesSoccerTeamMetricTotalsLoader.SNAPSHOT_MAGIC)
+        )
+    if magic == FromSnapshotFilesSoccerTeamMetricTotalsLoader.SNAPSHOT_MAGIC:
+        previous_ranker = StandardCompetitionSoccerTeamRanker(
+            metric_scorers=metric_scorers, top_k=top_k
+        )
+        previous_ranker.load_totals(FromSnapshotFilesSoccerTeamMetricTotalsLoader([previous_path]))
+        yield from previous_ranker.iter_rankings()
+        return
+    with open(previous_path, "r") as previous_fileio:
+        for previous_ranking in previous_fileio:
+            yield previous_ranking.rstrip("\n")
+
+
+def main(args: argparse.Namespace):
+    observer = StatsPipelineObserver() if args.profile else None
+    metric_scorers = build_metric_scorers(args)
+    if args.follow:
+        follow(args, metric_scorers)
+        return
+    elif args.window is not None or args.per_round:
+        rank_rounds(args, metric_scorers, observer)
+        if observer is not None:
+            print(json.dumps(observer.summary()), file=sys.stderr)
+        return
+    if args.memory_budget is not None:
+        ranker: StandardCompetitionSoccerTeamRanker = (
+            ExternalMemoryStandardCompetitionSoccerTeamRanker(
+                metric_scorers=metric_scorers,
+                memory_budget=args.memory_budget * 1024 * 1024,
+                top_k=args.top_k,
+                observer=observer,
+            )
+        )
+    elif HEAD_TO_HEAD_TIEBREAKER in args.tiebreakers:
+        ranker = HeadToHeadStandardCompetitionSoccerTeamRanker(
+            metric_scorers=metric_scorers,
+            # Points, then every tiebreaker metric given before head-to-head
+            head_to_head_after=1 + args.tiebreakers.index(HEAD_TO_HEAD_TIEBREAKER),
+            top_k=args.top_k,
+            observer=observer,
+        )
+    else:
+        ranker = StandardCompetitionSoccerTeamRanker(
+            metric_scorers=metric_scorers, top_k=args.top_k, observer=observer
+        )
+
+    # The quarantine file is closed whether loading succeeds or fails, before the budget is checked
+    with ExitStack() as exit_stack:
+        quarantine: InvalidLineQuarantine | None = None
+        if args.max_invalid_lines is not None:
+            quarantine = InvalidLineQuarantine(
+                fileio=(
+                    sys.stderr
+                    if args.quarantine is None
+                    else exit_stack.enter_context(open(args.quarantine, "w"))
+                ),
+                max_invalid_lines=args.max_invalid_lines,
+            )
+
+        if args.from_snapshots:
+            try:
+                ranker.load_totals(FromSnapshotFilesSoccerTeamMetricTotalsLoader(args.file_paths))
+            except ValueError as exc:
+                sys.exit(f"Invalid: {exc}\n")
+        elif args.file_paths and args.cache_dir is not None:
+            ranker.load_scores(
+                ChainedSoccerMatchScoresLoader(
+                    [
+                        CachedFromFileSoccerMatchScoresLoader(
+                            file_path=file_path,
+                            cache_dir=args.cache_dir,
+                            fast_parse=True,
+                            observer=observer,
+                        )
+                        for file_path in args.file_paths
+                    ]
+                )
+            )
+        elif args.file_paths and isinstance(ranker, HeadToHeadStandardCompetitionSoccerTeamRanker):
+            # Head-to-head results are indexed from match scores, which per-chunk totals don't keep
+            ranker.load_scores(
+                FromFilesSoccerMatchScoresLoader(
+                    args.file_paths, observer=observer, quarantine=quarantine
+                )
+            )
+        elif args.file_paths:
+            ranker.load_totals(
+                ParallelFromFilesSoccerTeamMetricTotalsLoader(
+                    file_paths=args.file_paths,
+                    max_workers=args.workers,
+                    fast_parse=True,
+                    observer=observer,
+                    quarantine=quarantine,
+                )
+            )
+        elif isinstance(ranker, HeadToHeadStandardCompetitionSoccerTeamRanker):
+            invalid_lines: list[InvalidLine] = []
+            ranker.load_scores(
+                FromBinaryIOSoccerMatchScoresLoader(
+                    fileio=stdin.buffer,
+                    observer=observer,
+                    invalid_lines=None if quarantine is None else invalid_lines,
+                )
+            )
+            if quarantine is not None:
+                quarantine.quarantine("<stdin>", invalid_lines)
+        else:
+            ranker.load_totals(
+                PipelinedFromStreamSoccerTeamMetricTotalsLoader(
+                    fileio=stdin.buffer,
+                    max_workers=args.workers,
+                    fast_parse=True,
+                    observer=observer,
+                    quarantine=quarantine,
+                )
+            )
+
+    if quarantine is not None:
+        try:
+            quarantine.check_error_budget()
+        except ValueError as exc:
+            sys.exit(f"Invalid: {exc}\n")
+    if args.emit_snapshot is not None:
+        with open(args.emit_snapshot, "wb") as snapshot_fileio:
+            FromSnapshotFilesSoccerTeamMetricTotalsLoader.dump_snapshot(
+                snapshot_fileio, metric_scorers, ranker.partial_totals()
+            )
+    if args.delta_from is not None:
+        delta_dumper = DeltaRankingDumper(
+            fileio=stdout,
+            previous_rankings=_iter_previous_rankings(args.delta_from, metric_scorers, args.top_k),
+            metric_count=len(metric_scorers),
+            observer=observer,
+        )
+        try:
+            delta_dumper.dump_rankings(ranker)
+        except ValueError as exc:
+            sys.exit(f"Invalid: {exc}\n")
+    elif args.emit_snapshot is None:
+        # Flushing every line is only useful when someone is watching the output in a terminal
+        io_dumper = ToIORankingDumper(
+            fileio=stdout,
+            buffer_size=None if stdout.isatty() else ToIORankingDumper.DEFAULT_BUFFER_SIZE,
+            observer=observer,
+        )
+        io_dumper.dump_rankings(ranker)
+
+    if observer is not None:
+        print(json.dumps(observer.summary()), file=sys.stderr)
 
 
 if __name__ == "__main__":
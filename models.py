@@ -1,8 +1,13 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
+from typing import NamedTuple, Sequence
 
+# Scores are stored within signed 64-bit columns (ie array("q")), so they can't be larger than this
+# (per-team totals summed from them are checked for overflow by rankers instead)
+MAX_SCORE = 2**63 - 1
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class TeamGameScore:
     team_name: str
     score: int
@@ -14,9 +19,11 @@ class TeamGameScore:
             raise ValueError("Name must be not empty")
         elif self.score < 0:
             raise ValueError("Score must be >= 0")
+        elif self.score > MAX_SCORE:
+            raise ValueError(f"Score must be <= {MAX_SCORE}")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MatchScore:
     team_score_a: TeamGameScore
     team_score_b: TeamGameScore
@@ -28,7 +35,77 @@ class MatchScore:
             raise ValueError("A valid match must contain mutually exclusive team scores")
 
 
+# Plain tuple version of a MatchScore for trusted hot paths:
+# (team_name_a, team_score_a, team_name_b, team_score_b)
+MatchScoreTuple = tuple[str, int, str, int]
+
+
+class InvalidLine(NamedTuple):
+    """An invalid input line skipped by a lenient loader, rather than aborting the whole run"""
+
+    # Starting at 1 within the loader's input
+    line_number: int
+    # Without its line terminator
+    raw_line: str
+    error: str
+
+
 class SoccerMatchResult(Enum):
     WIN = "WIN"
     TIE = "TIE"
     LOSS = "LOSS"
+
+
+class MatchCounterWeights(NamedTuple):
+    """
+    Weights of a metric that is a linear combination of a team's per-match counters, ie points
+    are 3 * wins + 1 * ties and goal difference is goals_for - goals_against
+    """
+
+    wins: int = 0
+    ties: int = 0
+    losses: int = 0
+    goals_for: int = 0
+    goals_against: int = 0
+
+
+@dataclass
+class TeamMetricTotals:
+    """
+    Partial per-team metric totals accumulated over a subset of match scores (ie a chunk of a file).
+    Totals are stored relative to each metric scorer's default, so partial totals can be summed.
+    """
+
+    team_names: list[str]
+    # One list per metric scorer, aligned with team_names
+    metric_totals: list[Sequence[int]]
+    match_count: int = 0
+    lines_read: int = 0
+    # Only collected when loading leniently, numbered within the subset of match scores
+    invalid_lines: list[InvalidLine] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class MatchScoreColumns:
+    """
+    A batch of (already validated) match scores stored as columns, where index i of each column
+    belongs to the same match score. Team IDs are indexes into team_names.
+    """
+
+    team_names: Sequence[str]
+    team_a_ids: Sequence[int]
+    team_b_ids: Sequence[int]
+    team_a_scores: Sequence[int]
+    team_b_scores: Sequence[int]
+
+
+@dataclass(frozen=True)
+class SeasonRankingResult:
+    """Outcome of ranking a single season file as part of a batch of independent seasons"""
+
+    season_path: str
+    output_path: str
+    seconds: float
+    match_count: int = 0
+    # Set when the season could not be ranked (no output file is written in that case)
+    error: str | None = None
@@ -0,0 +1,202 @@
+"""
+Long running ranking server, keeping a ranker warm in memory between requests.
+
+Clients connect over a Unix socket or a localhost TCP port and send newline terminated lines:
+- Match scores in the same text format as the input files (ie `Lions 3, Snakes 3`) are ingested
+- `/rankings` returns the full ranking table
+- `/top <K>` returns the top K rankings (every team tied at rank K is also returned)
+- `/rank <team name>` returns the ranking of a single team
+
+Ingested lines are not replied to, unless they are invalid. Every reply is a block of lines
+terminated by an empty line, and errors are replied to as `ERROR <message>`.
+"""
+
+import argparse
+import asyncio
+import sys
+from io import StringIO
+from pathlib import Path
+from typing import Iterable
+
+from base import TupleSoccerMatchScoresLoader
+from main import (
+    TIEBREAKER_METRIC_SCORERS,
+    FromIOSoccerMatchScoresLoader,
+    IncrementalStandardCompetitionSoccerTeamRanker,
+    ParallelFromFilesSoccerTeamMetricTotalsLoader,
+    _expand_file_path_patterns,
+    build_metric_scorers,
+)
+from models import MatchScore, MatchScoreTuple, TeamGameScore
+
+
+class FromTuplesSoccerMatchScoresLoader(TupleSoccerMatchScoresLoader):
+    """Loader for match scores that were already parsed + validated (ie by the server)"""
+
+    def __init__(self, match_score_tuples: Iterable[MatchScoreTuple]):
+        self.match_score_tuples = match_score_tuples
+
+    def iter_match_score_tuples(self) -> Iterable[MatchScoreTuple]:
+        return self.match_score_tuples
+
+    def iter_match_scores(self) -> Iterable[MatchScore]:
+        for team_name_a, team_score_a, team_name_b, team_score_b in self.match_score_tuples:
+            yield MatchScore(
+                TeamGameScore(team_name_a, team_score_a), TeamGameScore(team_name_b, team_score_b)
+            )
+
+
+class RankingServer:
+    # Max number of match scores a client can send before they are loaded into the ranker, and the
+    # event loop is yielded to other clients (ie so that a large ingest doesn't block queries)
+    DEFAULT_INGEST_BATCH_SIZE = 4096
+
+    COMMAND_PREFIX = "/"
+
+    def __init__(
+        self,
+        ranker: IncrementalStandardCompetitionSoccerTeamRanker,
+        ingest_batch_size: int = DEFAULT_INGEST_BATCH_SIZE,
+    ):
+        if ingest_batch_size <= 0:
+            raise ValueError("Ingest batch size must be > 0")
+        self.ranker = ranker
+        self.ingest_batch_size = ingest_batch_size
+        # Only used to parse + validate single lines, never reads from its fileio
+        self.match_score_parser = FromIOSoccerMatchScoresLoader(fileio=StringIO(), fast_parse=True)
+
+    def ingest(self, match_score_tuples: list[MatchScoreTuple]):
+        if match_score_tuples:
+            self.ranker.load_scores(FromTuplesSoccerMatchScoresLoader(match_score_tuples))
+
+    def handle_command(self, command: str) -> list[str]:
+        """Returns the reply lines to a command line (without the command prefix)"""
+        command_name, _, command_arg = command.partition(" ")
+        if command_name == "rankings" and not command_arg:
+            return list(self.ranker.iter_rankings())
+        elif command_name == "top":
+            try:
+                top_k = int(command_arg)
+            except ValueError:
+                return [f"ERROR Top K must be an integer: {command_arg}"]
+            try:
+                return list(self.ranker.iter_top_k_rankings(top_k))
+            except ValueError as exc:
+                return [f"ERROR {exc}"]
+        elif command_name == "rank" and command_arg:
+            ranking = self.ranker.rank_of(command_arg)
+            if ranking is None:
+                return [f"ERROR Unknown team {command_arg}"]
+            return [str(ranking)]
+        return [f"ERROR Unknown command {command}"]
+
+    @staticmethod
+    async def _reply(writer: asyncio.StreamWriter, reply_lines: list[str]):
+        writer.write("".join(f"{reply_line}\n" for reply_line in reply_lines).encode())
+        writer.write(b"\n")
+        await writer.drain()
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        pending_match_score_tuples: list[MatchScoreTuple] = []
+        try:
+            while raw_line := await reader.readline():
+                try:
+                    line = raw_line.decode().rstrip("\r\n")
+                except UnicodeDecodeError as exc:
+                    invalid_line = raw_line.decode(errors="replace").rstrip("\r\n")
+                    await self._reply(writer, [f"ERROR {exc}: {invalid_line}"])
+                    continue
+                if line.startswith(self.COMMAND_PREFIX):
+                    # Match scores sent before a query are always part of the reply
+                    self.ingest(pending_match_score_tuples)
+                    pending_match_score_tuples.clear()
+                    await self._reply(writer, self.handle_command(line[len(self.COMMAND_PREFIX) :]))
+                    continue
+                elif not line:
+                    continue
+                try:
+                    pending_match_score_tuples.append(
+                        self.match_score_parser.parse_match_score_tuple(line)
+                    )
+                except ValueError as exc:
+                    await self._reply(writer, [f"ERROR {exc}: {line}"])
+                    continue
+                if len(pending_match_score_tuples) >= self.ingest_batch_size:
+                    self.ingest(pending_match_score_tuples)
+                    pending_match_score_tuples.clear()
+                    # Reading already buffered lines doesn't yield to the event loop by itself
+                    await asyncio.sleep(0)
+            self.ingest(pending_match_score_tuples)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def start_server(
+        self, unix_socket_path: Path | None = None, host: str = "127.0.0.1", port: int = 0
+    ) -> asyncio.AbstractServer:
+        if unix_socket_path is not None:
+            return await asyncio.start_unix_server(self.handle_client, path=unix_socket_path)
+        return await asyncio.start_server(self.handle_client, host=host, port=port)
+
+
+def handle_input_args() -> argparse.Namespace:
+    arg_parser = argparse.ArgumentParser(
+        description="Serves a live ranking table for a league over a local socket"
+    )
+    arg_parser.add_argument(
+        "file_paths",
+        nargs="*",
+        metavar="file_path",
+        help="Input File(s) or glob pattern(s) of match scores to load before serving",
+    )
+    listen_group = arg_parser.add_mutually_exclusive_group()
+    listen_group.add_argument(
+        "--unix-socket", type=Path, help="Path of the Unix socket to listen on"
+    )
+    listen_group.add_argument(
+        "--port", type=int, default=8765, help="Localhost TCP port to listen on (default: 8765)"
+    )
+    arg_parser.add_argument(
+        "--tiebreaker",
+        dest="tiebreakers",
+        action="append",
+        choices=list(TIEBREAKER_METRIC_SCORERS),
+        default=[],
+        help="Metric used to break ties on points (repeatable, applied in the given order)",
+    )
+    args = arg_parser.parse_args(sys.argv[1:])
+    args.file_paths = _expand_file_path_patterns(args.file_paths)
+    return args
+
+
+async def serve(args: argparse.Namespace):
+    metric_scorers = build_metric_scorers(args)
+    ranker = IncrementalStandardCompetitionSoccerTeamRanker(metric_scorers=metric_scorers)
+    if args.file_paths:
+        ranker.load_totals(
+            ParallelFromFilesSoccerTeamMetricTotalsLoader(
+                file_paths=args.file_paths, fast_parse=True
+            )
+        )
+
+    server = await RankingServer(ranker).start_server(
+        unix_socket_path=args.unix_socket, port=args.port
+    )
+    async with server:
+        await server.serve_forever()
+
+
+def main(args: argparse.Namespace):
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main(handle_input_args())
@@ -0,0 +1,151 @@
+import gzip
+import json
+import lzma
+from pathlib import Path
+
+import pytest
+
+import batch
+from batch import BatchSeasonRanker, handle_input_args
+from main import MatchResultMetricScorer
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+
+
+@pytest.fixture
+def season_paths(tmp_path):
+    input_dir = tmp_path / "seasons"
+    input_dir.mkdir()
+    sample_input = (FIXTURES_DIR / "sample-input-1.txt").read_text()
+    season_paths = []
+    for season in ("2021", "2022", "2023"):
+        season_path = input_dir / f"league-{season}.txt"
+        season_path.write_text(sample_input)
+        season_paths.append(season_path)
+    # Each season is ranked independently (ie the 2023 season only contains a single match)
+    season_paths[-1].write_text("Lions 1, Snakes 0\n")
+    return season_paths
+
+
+class TestBatchSeasonRanker:
+    @pytest.mark.parametrize("max_workers", (1, 2))
+    def test_ranks_each_season_independently(self, tmp_path, season_paths, max_workers):
+        output_dir = tmp_path / "output"
+        batch_ranker = BatchSeasonRanker(
+            metric_scorers=[MatchResultMetricScorer()], max_workers=max_workers
+        )
+
+        season_results = list(batch_ranker.iter_rank_seasons(season_paths, output_dir))
+
+        assert [season_result.season_path for season_result in season_results] == list(
+            map(str, season_paths)
+        )
+        assert [season_result.match_count for season_result in season_results] == [5, 5, 1]
+        assert all(season_result.error is None for season_result in season_results)
+        expected_output = (FIXTURES_DIR / "expected-output-1.txt").read_text()
+        assert (output_dir / "league-2021.txt").read_text() == expected_output
+        assert (output_dir / "league-2022.txt").read_text() == expected_output
+        assert (output_dir / "league-2023.txt").read_text() == "1. Lions, 3 pts\n2. Snakes, 0 pts\n"
+
+    @pytest.mark.parametrize("max_workers", (1, 2))
+    def test_failed_season_does_not_abort_batch(self, tmp_path, season_paths, max_workers):
+        season_paths[0].write_text("Lions 3, Snakes 3\nSomething totally wrong\n")
+        season_paths[1].write_text(f"Lions {2**63}, Snakes 3\n")
+        season_paths.insert(1, season_paths[0].parent / "missing.txt")
+        output_dir = tmp_path / "output"
+        batch_ranker = BatchSeasonRanker(
+            metric_scorers=[MatchResultMetricScorer()], max_workers=max_workers
+        )
+
+        season_results = list(batch_ranker.iter_rank_seasons(season_paths, output_dir))
+
+        assert season_results[0].error == "Invalid Match Score found in input"
+        assert "No such file or directory" in season_results[1].error
+        assert [season_result.error for season_result in season_results[2:]] == [
+            f"Score must be <= {2**63 - 1}",
+            None,
+        ]
+        # No partial output for failed seasons
+        assert sorted(path.name for path in output_dir.iterdir()) == ["league-2023.txt"]
+
+    def test_duplicate_season_file_names(self, tmp_path, season_paths):
+        other_season_path = tmp_path / season_paths[0].name
+        other_season_path.write_text("")
+        batch_ranker = BatchSeasonRanker(metric_scorers=[MatchResultMetricScorer()])
+
+        with pytest.raises(ValueError, match="Season file names must be unique"):
+            list(batch_ranker.iter_rank_seasons([*season_paths, other_season_path], tmp_path))
+
+    def test_compressed_seasons(self, tmp_path, season_paths):
+        compressed_season_path = season_paths[0].with_name("league-2024.txt.gz")
+        compressed_season_path.write_bytes(gzip.compress(season_paths[0].read_bytes()))
+        truncated_season_path = season_paths[0].with_name("league-2025.txt.xz")
+        truncated_season_path.write_bytes(lzma.compress(season_paths[0].read_bytes())[:-8])
+        output_dir = tmp_path / "output"
+        batch_ranker = BatchSeasonRanker(metric_scorers=[MatchResultMetricScorer()])
+
+        compressed_season_result, truncated_season_result = batch_ranker.iter_rank_seasons(
+            [compressed_season_path, truncated_season_path], output_dir
+        )
+
+        assert compressed_season_result.error is None
+        assert truncated_season_result.error.startswith("Invalid compressed input")
+        # Output files are named without the compression extension
+        assert sorted(path.name for path in output_dir.iterdir()) == ["league-2024.txt"]
+        assert (output_dir / "league-2024.txt").read_text() == (
+            FIXTURES_DIR / "expected-output-1.txt"
+        ).read_text()
+
+    def test_invalid_max_workers(self):
+        with pytest.raises(ValueError, match="Max workers must be > 0"):
+            BatchSeasonRanker(metric_scorers=[], max_workers=0)
+
+
+class TestCLI:
+    def test_manifest(self, mocker, tmp_path, season_paths):
+        manifest_path = tmp_path / "manifest.txt"
+        manifest_path.write_text("seasons/league-2021.txt\n\nseasons/league-2023.txt\n")
+        mocker.patch(
+            "sys.argv", ["arbitrary", str(tmp_path / "output"), "--manifest", str(manifest_path)]
+        )
+
+        args = handle_input_args()
+
+        assert args.season_paths == [season_paths[0], season_paths[2]]
+
+    def test_input_dir(self, mocker, tmp_path, season_paths):
+        (season_paths[0].parent / "notes.md").write_text("")
+        mocker.patch(
+            "sys.argv",
+            ["arbitrary", str(tmp_path / "output"), "--input-dir", str(season_paths[0].parent)],
+        )
+
+        args = handle_input_args()
+
+        assert args.season_paths == season_paths
+
+    def test_main_reports_each_season(self, mocker, tmp_path, season_paths, capsys):
+        season_paths[1].write_text("Something totally wrong\n")
+        mocker.patch(
+            "sys.argv",
+            [
+                "arbitrary",
+                str(tmp_path / "output"),
+                "--input-dir",
+                str(season_paths[0].parent),
+                "--workers",
+                "1",
+            ],
+        )
+        mock_sys_exit = mocker.patch("sys.exit")
+
+        batch.main(handle_input_args())
+
+        season_results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [season_result["error"] for season_result in season_results] == [
+            None,
+            "Invalid Match Score found in input",
+            None,
+        ]
+        assert all(season_result["seconds"] >= 0 for season_result in season_results)
+        mock_sys_exit.assert_called_once_with("Failed: 1 of 3 seasons\n")
@@ -0,0 +1,91 @@
+from io import StringIO
+
+import pytest
+
+from benchmarks.season_generator import SeasonConfig, generate_season
+from benchmarks.suite import STAGES, find_regressions, run_suite
+from main import FromIOSoccerMatchScoresLoader
+
+
+class TestSeasonGenerator:
+    def test_deterministic(self):
+        config = SeasonConfig(match_count=100, team_count=10, seed=7)
+        assert list(generate_season(config)) == list(generate_season(config))
+        assert list(generate_season(config)) != list(
+            generate_season(SeasonConfig(match_count=100, team_count=10, seed=8))
+        )
+
+    def test_valid_season(self):
+        config = SeasonConfig(
+            match_count=500, team_count=20, name_length_min=1, name_length_max=40, tie_rate=0.5
+        )
+        loader = FromIOSoccerMatchScoresLoader(fileio=StringIO("".join(generate_season(config))))
+        match_scores = list(loader.iter_match_scores())
+
+        team_names = {
+            team_score.team_name
+            for match_score in match_scores
+            for team_score in (match_score.team_score_a, match_score.team_score_b)
+        }
+        tie_count = sum(
+            match_score.team_score_a.score == match_score.team_score_b.score
+            for match_score in match_scores
+        )
+        assert len(match_scores) == 500
+        assert len(team_names) == 20
+        assert 200 <= tie_count <= 300
+
+    @pytest.mark.parametrize("tie_rate", (0, 1))
+    def test_tie_rate_bounds(self, tie_rate):
+        config = SeasonConfig(match_count=100, team_count=5, tie_rate=tie_rate)
+        loader = FromIOSoccerMatchScoresLoader(fileio=StringIO("".join(generate_season(config))))
+
+        assert all(
+            (match_score.team_score_a.score == match_score.team_score_b.score) == bool(tie_rate)
+            for match_score in loader.iter_match_scores()
+        )
+
+    @pytest.mark.parametrize(
+        "invalid_kwargs, error_message",
+        (
+            ({"match_count": -1}, "Match count must be >= 0"),
+            ({"team_count": 1}, "Team count must be >= 2"),
+            ({"name_length_min": 5, "name_length_max": 4}, "Name lengths must satisfy"),
+            ({"tie_rate": 1.5}, "Tie rate must be within"),
+            ({"max_score": 0}, "Max score must be >= 1"),
+        ),
+    )
+    def test_invalid_config(self, invalid_kwargs, error_message):
+        with pytest.raises(ValueError, match=error_message):
+            SeasonConfig(**invalid_kwargs)
+
+
+class TestSuite:
+    def test_run_suite(self):
+        results = run_suite(SeasonConfig(match_count=50, team_count=5), repeat=1)
+
+        assert list(results["stages"]) == list(STAGES)
+        for measurements in results["stages"].values():
+            assert measurements["seconds"] >= 0
+            assert measurements["peak_memory_bytes"] >= 0
+
+    def test_find_regressions(self):
+        baseline = {
+            "stages": {
+                "load_scores": {"seconds": 1.0, "peak_memory_bytes": 100},
+                "dump_rankings": {"seconds": 1.0, "peak_memory_bytes": 100},
+            }
+        }
+        results = {
+            "stages": {
+                "load_scores": {"seconds": 1.05, "peak_memory_bytes": 200},
+                "dump_rankings": {"seconds": 1.5, "peak_memory_bytes": 100},
+                "iter_rankings": {"seconds": 9.0, "peak_memory_bytes": 100},
+            }
+        }
+
+        regressions = find_regressions(results, baseline, threshold=0.1)
+
+        assert len(regressions) == 2
+        assert regressions[0].startswith("load_scores peak_memory_bytes")
+        assert regressions[1].startswith("dump_rankings seconds")
@@ -1,28 +1,534 @@
+import bz2
+import gzip
+import json
+from io import BytesIO, StringIO, TextIOWrapper
+from pathlib import Path
+
+import pytest
+
+import main
 from main import handle_input_args
 
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+
 
 class TestCLIArgs:
-    def test_help_flag(self, mocker):
-        mock_print = mocker.patch("builtins.print")
-        mock_sys_exit = mocker.patch("sys.exit")
-        mock_sys_argv = mocker.patch("sys.argv", ["arbitrary", "--help"])
-        handle_input_args()
+    def test_help_flag(self, mocker, capsys):
+        mocker.patch("sys.argv", ["arbitrary", "--help"])
+        with pytest.raises(SystemExit) as exc_info:
+            handle_input_args()
 
-        mock_print.assert_called_once_with(
-            "Usage:\n<file_path> (Input File to use as input)\n<No Args> (Use STDIN as input)\n"
-        )
-        mock_sys_exit.assert_called_once_with()
+        assert exc_info.value.code == 0
+        help_text = capsys.readouterr().out
+        assert "file_path" in help_text
+        assert "--workers" in help_text
+        assert "--profile" in help_text
+        assert "--top-k" in help_text
+        assert "--tiebreaker" in help_text
 
     def test_no_args(self, mocker):
         mocker.patch("sys.argv", ["arbitrary"])
-        assert handle_input_args() is None
+        args = handle_input_args()
+        assert args.file_paths == []
+        assert args.top_k is None
+        assert args.workers is None
+        assert args.tiebreakers == []
+
+    def test_multiple_file_paths(self, mocker):
+        mocker.patch("sys.argv", ["arbitrary", "test.txt", "other.txt", "--workers", "4"])
+        args = handle_input_args()
+        assert args.file_paths == [Path("test.txt"), Path("other.txt")]
+        assert args.workers == 4
 
-    def test_too_many_args(self, mocker):
-        mocker.patch("sys.argv", ["arbitrary", "test.txt", "wrong_additional_arg"])
+    def test_glob_file_paths(self, mocker, tmp_path):
+        for file_name in ("day-2.txt", "day-1.txt", "other.csv"):
+            (tmp_path / file_name).write_text("")
+        mocker.patch("sys.argv", ["arbitrary", str(tmp_path / "day-*.txt"), "test.txt"])
+        args = handle_input_args()
+        assert args.file_paths == [
+            tmp_path / "day-1.txt",
+            tmp_path / "day-2.txt",
+            Path("test.txt"),
+        ]
+
+    def test_glob_without_matches(self, mocker, tmp_path):
+        mocker.patch("sys.argv", ["arbitrary", str(tmp_path / "*.txt")])
         mock_sys_exit = mocker.patch("sys.exit")
 
         handle_input_args()
 
         mock_sys_exit.assert_called_once_with(
-            "Invalid: Only 1 argument consisting of a file path is allowed.\n"
+            f"Invalid: No input files match {tmp_path / '*.txt'}\n"
+        )
+
+    def test_top_k(self, mocker):
+        mocker.patch("sys.argv", ["arbitrary", "test.txt", "--top-k", "20"])
+        args = handle_input_args()
+        assert args.file_paths == [Path("test.txt")]
+        assert args.top_k == 20
+
+    @pytest.mark.parametrize("invalid_top_k", ("0", "-1", "foo"))
+    def test_invalid_top_k(self, mocker, invalid_top_k):
+        mocker.patch("sys.argv", ["arbitrary", "--top-k", invalid_top_k])
+        with pytest.raises(SystemExit) as exc_info:
+            handle_input_args()
+
+        assert exc_info.value.code == 2
+
+    def test_follow(self, mocker):
+        mocker.patch(
+            "sys.argv",
+            ["arbitrary", "feed.txt", "--follow", "--interval", "0.5", "--checkpoint", "feed.ckpt"],
+        )
+        args = handle_input_args()
+        assert args.follow
+        assert args.interval == 0.5
+        assert args.checkpoint == Path("feed.ckpt")
+
+    @pytest.mark.parametrize(
+        "cli_args",
+        (
+            ["--follow"],
+            ["a.txt", "b.txt", "--follow"],
+            ["a.txt", "--checkpoint", "a.ckpt"],
+            ["a.txt", "--follow", "--interval", "-1"],
+            ["a.txt", "--follow", "--from-snapshots"],
+            ["a.txt", "--follow", "--emit-snapshot", "a.snapshot"],
+            ["a.txt", "--follow", "--memory-budget", "1"],
+            ["a.txt", "--follow", "--cache-dir", "cache"],
+            ["a.txt", "--follow", "--profile"],
+        ),
+    )
+    def test_invalid_follow(self, mocker, cli_args):
+        mocker.patch("sys.argv", ["arbitrary", *cli_args])
+        with pytest.raises(SystemExit) as exc_info:
+            handle_input_args()
+
+        assert exc_info.value.code == 2
+
+    def test_window_per_round(self, mocker):
+        mocker.patch("sys.argv", ["arbitrary", "season.txt", "--window", "5", "--per-round"])
+        args = handle_input_args()
+        assert args.window == 5
+        assert args.per_round
+
+    @pytest.mark.parametrize(
+        "cli_args",
+        (
+            ["--window", "0"],
+            ["a.txt", "--window", "5", "--follow"],
+            ["a.txt", "--per-round", "--memory-budget", "1"],
+            ["a.txt", "--per-round", "--emit-snapshot", "a.snapshot"],
+            ["a.snapshot", "--window", "5", "--from-snapshots"],
+            ["a.txt", "--window", "5", "--cache-dir", "cache"],
+        ),
+    )
+    def test_invalid_window_per_round(self, mocker, cli_args):
+        mocker.patch("sys.argv", ["arbitrary", *cli_args])
+        with pytest.raises(SystemExit) as exc_info:
+            handle_input_args()
+
+        assert exc_info.value.code == 2
+
+    @pytest.mark.parametrize(
+        "cli_args",
+        (
+            ["a.txt", "--delta-from", "previous.txt", "--follow"],
+            ["a.txt", "--delta-from", "previous.txt", "--window", "5"],
+            ["a.txt", "--delta-from", "previous.txt", "--per-round"],
+        ),
+    )
+    def test_invalid_delta_from(self, mocker, cli_args):
+        mocker.patch("sys.argv", ["arbitrary", *cli_args])
+        with pytest.raises(SystemExit) as exc_info:
+            handle_input_args()
+
+        assert exc_info.value.code == 2
+
+    @pytest.mark.parametrize(
+        "cli_args",
+        (
+            ["a.txt", "--max-invalid-lines", "-1"],
+            ["a.txt", "--quarantine", "quarantine.jsonl"],
+            ["a.txt", "--max-invalid-lines", "1", "--follow"],
+            ["a.txt", "--max-invalid-lines", "1", "--cache-dir", "cache"],
+            ["a.txt", "--max-invalid-lines", "1", "--from-snapshots"],
+            ["a.txt", "--max-invalid-lines", "1", "--per-round"],
+        ),
+    )
+    def test_invalid_max_invalid_lines(self, mocker, cli_args):
+        mocker.patch("sys.argv", ["arbitrary", *cli_args])
+        with pytest.raises(SystemExit) as exc_info:
+            handle_input_args()
+
+        assert exc_info.value.code == 2
+
+    def test_from_snapshots_without_file_paths(self, mocker):
+        mocker.patch("sys.argv", ["arbitrary", "--from-snapshots"])
+        with pytest.raises(SystemExit) as exc_info:
+            handle_input_args()
+
+        assert exc_info.value.code == 2
+
+    def test_tiebreakers(self, mocker):
+        mocker.patch(
+            "sys.argv",
+            ["arbitrary", "--tiebreaker", "goal-difference", "--tiebreaker", "goals-for"],
         )
+        args = handle_input_args()
+        assert args.tiebreakers == ["goal-difference", "goals-for"]
+
+    @pytest.mark.parametrize(
+        "cli_args",
+        (
+            ["--tiebreaker", "head-to-head", "--tiebreaker", "head-to-head"],
+            ["a.txt", "--tiebreaker", "head-to-head", "--follow"],
+            ["a.txt", "--tiebreaker", "head-to-head", "--memory-budget", "1"],
+            ["a.txt", "--tiebreaker", "head-to-head", "--emit-snapshot", "a.snapshot"],
+            ["a.txt", "--tiebreaker", "head-to-head", "--per-round"],
+        ),
+    )
+    def test_invalid_head_to_head(self, mocker, cli_args):
+        mocker.patch("sys.argv", ["arbitrary", *cli_args])
+        with pytest.raises(SystemExit) as exc_info:
+            handle_input_args()
+
+        assert exc_info.value.code == 2
+
+    def test_invalid_tiebreaker(self, mocker):
+        mocker.patch("sys.argv", ["arbitrary", "--tiebreaker", "goals-against"])
+        with pytest.raises(SystemExit) as exc_info:
+            handle_input_args()
+
+        assert exc_info.value.code == 2
+
+
+class TestMain:
+    @pytest.fixture
+    def mock_stdout(self, mocker):
+        mock_stdout = StringIO()
+        mocker.patch.object(main, "stdout", mock_stdout)
+        return mock_stdout
+
+    def run_main(self, mocker, *cli_args):
+        mocker.patch("sys.argv", ["arbitrary", *cli_args])
+        main.main(handle_input_args())
+
+    def test_file_input(self, mocker, mock_stdout):
+        self.run_main(mocker, str(FIXTURES_DIR / "sample-input-1.txt"))
+
+        assert mock_stdout.getvalue() == (FIXTURES_DIR / "expected-output-1.txt").read_text()
+
+    @pytest.mark.parametrize("cache_dir", (False, True))
+    def test_compressed_file_input(self, mocker, mock_stdout, tmp_path, cache_dir):
+        input_path = tmp_path / "sample-input-1.txt.bz2"
+        input_path.write_bytes(bz2.compress((FIXTURES_DIR / "sample-input-1.txt").read_bytes()))
+        cli_args = [str(input_path)]
+        if cache_dir:
+            cli_args.extend(("--cache-dir", str(tmp_path / "cache")))
+        self.run_main(mocker, *cli_args)
+
+        assert mock_stdout.getvalue() == (FIXTURES_DIR / "expected-output-1.txt").read_text()
+
+    def test_stdin_input(self, mocker, mock_stdout):
+        mocker.patch.object(
+            main,
+            "stdin",
+            TextIOWrapper(BytesIO((FIXTURES_DIR / "sample-input-1.txt").read_bytes())),
+        )
+        self.run_main(mocker)
+
+        assert mock_stdout.getvalue() == (FIXTURES_DIR / "expected-output-1.txt").read_text()
+
+    def test_emit_and_merge_snapshots(self, mocker, mock_stdout, tmp_path):
+        raw_match_score_lines = (
+            (FIXTURES_DIR / "sample-input-1.txt").read_text().splitlines(keepends=True)
+        )
+        snapshot_paths = []
+        for shard_index, shard_lines in enumerate(
+            (raw_match_score_lines[:3], raw_match_score_lines[3:])
+        ):
+            shard_path = tmp_path / f"shard-{shard_index}.txt"
+            shard_path.write_text("".join(shard_lines))
+            snapshot_paths.append(tmp_path / f"shard-{shard_index}.snapshot")
+            self.run_main(mocker, str(shard_path), "--emit-snapshot", str(snapshot_paths[-1]))
+        assert mock_stdout.getvalue() == ""
+
+        self.run_main(mocker, "--from-snapshots", *map(str, snapshot_paths))
+
+        assert mock_stdout.getvalue() == (FIXTURES_DIR / "expected-output-1.txt").read_text()
+
+    def test_merge_mismatched_snapshots(self, mocker, mock_stdout, tmp_path):
+        snapshot_path = tmp_path / "shard.snapshot"
+        self.run_main(
+            mocker,
+            str(FIXTURES_DIR / "sample-input-1.txt"),
+            "--emit-snapshot",
+            str(snapshot_path),
+        )
+        mock_sys_exit = mocker.patch("sys.exit")
+
+        self.run_main(mocker, "--from-snapshots", str(snapshot_path), "--tiebreaker", "goals-for")
+
+        mock_sys_exit.assert_called_once_with(
+            "Invalid: Snapshot metric scorers ['MatchResultMetricScorer'] don't match"
+            " ['MatchResultMetricScorer', 'GoalsForMetricScorer']\n"
+        )
+
+    def test_per_round(self, mocker, mock_stdout, tmp_path):
+        round_1_path = tmp_path / "round-1.txt"
+        round_1_path.write_text("# Round 1\nLions 3, Snakes 3\nTarantulas 1, FC Awesome 0\n")
+        round_2_path = tmp_path / "round-2.txt.gz"
+        round_2_path.write_bytes(gzip.compress(b"# Round 2\nLions 1, FC Awesome 1"))
+        self.run_main(mocker, str(round_1_path), str(round_2_path), "--per-round")
+
+        assert mock_stdout.getvalue() == (
+            "1. Tarantulas, 3 pts\n2. Lions, 1 pt\n2. Snakes, 1 pt\n4. FC Awesome, 0 pts\n\n"
+            "1. Tarantulas, 3 pts\n2. Lions, 2 pts\n3. FC Awesome, 1 pt\n3. Snakes, 1 pt\n\n"
+        )
+
+    def test_per_round_hash_prefixed_team_name(self, mocker, mock_stdout, tmp_path):
+        input_path = tmp_path / "season.txt"
+        input_path.write_text("# Round 1\n#1 Lions 3, Snakes 1\n# Round 2\n#1 Lions 0, Snakes 1\n")
+        self.run_main(mocker, str(input_path), "--per-round")
+
+        assert mock_stdout.getvalue() == (
+            "1. #1 Lions, 3 pts\n2. Snakes, 0 pts\n\n1. #1 Lions, 3 pts\n1. Snakes, 3 pts\n\n"
+        )
+
+    def test_window_without_per_round_ignores_markers(self, mocker, mock_stdout, tmp_path):
+        input_path = tmp_path / "season.txt"
+        input_path.write_text("#1 Lions 3, Snakes 1\nLions 1, Snakes 1\n")
+        self.run_main(mocker, str(input_path), "--window", "5")
+
+        assert mock_stdout.getvalue() == "1. #1 Lions, 3 pts\n2. Lions, 1 pt\n2. Snakes, 1 pt\n"
+
+    def test_window(self, mocker, mock_stdout):
+        mocker.patch.object(
+            main,
+            "stdin",
+            TextIOWrapper(BytesIO((FIXTURES_DIR / "sample-input-1.txt").read_bytes())),
+        )
+        self.run_main(mocker, "--window", "1")
+
+        assert mock_stdout.getvalue() == (
+            "1. Lions, 3 pts\n"
+            "1. Tarantulas, 3 pts\n"
+            "3. FC Awesome, 1 pt\n"
+            "4. Grouches, 0 pts\n"
+            "4. Snakes, 0 pts\n"
+        )
+
+    @pytest.mark.parametrize("previous_format", ("rankings", "snapshot"))
+    def test_delta_from(self, mocker, mock_stdout, tmp_path, previous_format):
+        previous_input_path = tmp_path / "previous.txt"
+        previous_input_path.write_text("Lions 3, Snakes 3\nTarantulas 1, FC Awesome 0\n")
+        if previous_format == "snapshot":
+            previous_path = tmp_path / "previous.snapshot"
+            self.run_main(mocker, str(previous_input_path), "--emit-snapshot", str(previous_path))
+        else:
+            previous_path = tmp_path / "previous-rankings.txt"
+            self.run_main(mocker, str(previous_input_path))
+            previous_path.write_text(mock_stdout.getvalue())
+            mock_stdout.truncate(0)
+            mock_stdout.seek(0)
+        next_snapshot_path = tmp_path / "next.snapshot"
+
+        self.run_main(
+            mocker,
+            str(FIXTURES_DIR / "sample-input-1.txt"),
+            "--delta-from",
+            str(previous_path),
+            "--emit-snapshot",
+            str(next_snapshot_path),
+        )
+
+        assert [
+            (delta["op"], delta["team"], delta["old_rank"], delta["new_rank"])
+            for delta in map(json.loads, mock_stdout.getvalue().splitlines())
+        ] == [
+            ("update", "Tarantulas", 1, 1),
+            ("update", "Lions", 2, 2),
+            ("move", "FC Awesome", 4, 3),
+            ("move", "Snakes", 2, 3),
+            ("insert", "Grouches", None, 5),
+        ]
+        # The snapshot of the current rankings is also written, for the next delta
+        assert next_snapshot_path.read_bytes().startswith(b"SOCCSNP1")
+
+    def test_delta_from_mismatched_snapshot(self, mocker, mock_stdout, tmp_path):
+        previous_path = tmp_path / "previous.snapshot"
+        self.run_main(
+            mocker, str(FIXTURES_DIR / "sample-input-1.txt"), "--emit-snapshot", str(previous_path)
+        )
+        mock_sys_exit = mocker.patch("sys.exit")
+
+        self.run_main(
+            mocker,
+            str(FIXTURES_DIR / "sample-input-1.txt"),
+            "--delta-from",
+            str(previous_path),
+            "--tiebreaker",
+            "goals-for",
+        )
+
+        mock_sys_exit.assert_called_once()
+        assert mock_sys_exit.call_args.args[0].startswith("Invalid: Snapshot metric scorers")
+
+    def test_memory_budget(self, mocker, mock_stdout):
+        self.run_main(mocker, str(FIXTURES_DIR / "sample-input-1.txt"), "--memory-budget", "1")
+
+        assert mock_stdout.getvalue() == (FIXTURES_DIR / "expected-output-1.txt").read_text()
+
+    def test_tiebreakers(self, mocker, mock_stdout):
+        self.run_main(
+            mocker,
+            str(FIXTURES_DIR / "sample-input-1.txt"),
+            "--tiebreaker",
+            "goal-difference",
+            "--tiebreaker",
+            "goals-for",
+        )
+
+        assert mock_stdout.getvalue() == (
+            "1. Tarantulas, 6 pts, 3 GD, 4 goals\n"
+            "2. Lions, 5 pts, 4 GD, 8 goals\n"
+            "3. FC Awesome, 1 pt, -1 GD, 1 goal\n"
+            "4. Snakes, 1 pt, -2 GD, 4 goals\n"
+            "5. Grouches, 0 pts, -4 GD, 0 goals\n"
+        )
+
+    @pytest.mark.parametrize("cache_dir", (False, True))
+    def test_head_to_head(self, mocker, mock_stdout, tmp_path, cache_dir):
+        input_path = tmp_path / "input.txt"
+        input_path.write_text("Lions 1, Snakes 0\nSnakes 2, Bears 0\nBears 1, Lions 0\n")
+        cli_args = [str(input_path), "--tiebreaker", "head-to-head"]
+        if cache_dir:
+            cli_args.extend(("--cache-dir", str(tmp_path / "cache")))
+        self.run_main(mocker, *cli_args)
+
+        assert mock_stdout.getvalue() == "1. Snakes, 3 pts\n2. Lions, 3 pts\n3. Bears, 3 pts\n"
+
+    @pytest.mark.parametrize("tiebreakers", ([], ["--tiebreaker", "head-to-head"]))
+    @pytest.mark.parametrize("stdin_input", (False, True))
+    def test_max_invalid_lines(self, mocker, mock_stdout, tmp_path, tiebreakers, stdin_input):
+        input_path = tmp_path / "input.txt"
+        input_path.write_text(
+            "Lions 3, Snakes 3\n"
+            "Something totally wrong\n"
+            "Lions 1, Lions 1\n"
+            "Tarantulas 1, FC Awesome 0\n"
+        )
+        quarantine_path = tmp_path / "quarantine.jsonl"
+        cli_args = ["--max-invalid-lines", "2", "--quarantine", str(quarantine_path), *tiebreakers]
+        if stdin_input:
+            mocker.patch.object(main, "stdin", TextIOWrapper(BytesIO(input_path.read_bytes())))
+        else:
+            cli_args.append(str(input_path))
+        self.run_main(mocker, *cli_args)
+
+        assert mock_stdout.getvalue() == (
+            "1. Tarantulas, 3 pts\n2. Lions, 1 pt\n2. Snakes, 1 pt\n4. FC Awesome, 0 pts\n"
+        )
+        source = "<stdin>" if stdin_input else str(input_path)
+        assert list(map(json.loads, quarantine_path.read_text().splitlines())) == [
+            {
+                "source": source,
+                "line_number": 2,
+                "line": "Something totally wrong",
+                "error": "Invalid Match Score found in input",
+            },
+            {
+                "source": source,
+                "line_number": 3,
+                "line": "Lions 1, Lions 1",
+                "error": "A valid match must contain mutually exclusive team scores",
+            },
+        ]
+
+    def test_score_too_large(self, mocker, mock_stdout, tmp_path):
+        input_path = tmp_path / "input.txt"
+        input_path.write_text(f"Lions 3, Snakes 1\nLions {2**63}, Snakes 1\n")
+        with pytest.raises(ValueError, match=f"Score must be <= {2**63 - 1}"):
+            self.run_main(mocker, str(input_path))
+
+        quarantine_path = tmp_path / "quarantine.jsonl"
+        self.run_main(
+            mocker,
+            str(input_path),
+            "--max-invalid-lines",
+            "1",
+            "--quarantine",
+            str(quarantine_path),
+        )
+
+        assert mock_stdout.getvalue() == "1. Lions, 3 pts\n2. Snakes, 0 pts\n"
+        assert json.loads(quarantine_path.read_text()) == {
+            "source": str(input_path),
+            "line_number": 2,
+            "line": f"Lions {2**63}, Snakes 1",
+            "error": f"Score must be <= {2**63 - 1}",
+        }
+
+    def test_max_invalid_lines_exceeded(self, mocker, mock_stdout, tmp_path, capsys):
+        input_paths = [tmp_path / "input-1.txt", tmp_path / "input-2.txt"]
+        input_paths[0].write_text("Lions 3, Snakes 3\nSomething totally wrong\n")
+        input_paths[1].write_text("Lions -1, Snakes 0\nTarantulas 1, FC Awesome 0\n\n")
+        with pytest.raises(SystemExit) as exc_info:
+            self.run_main(mocker, *map(str, input_paths), "--max-invalid-lines", "2")
+
+        assert exc_info.value.code == (
+            "Invalid: Found 3 invalid lines in input, more than the error budget of 2\n"
+        )
+        assert mock_stdout.getvalue() == ""
+        # Every invalid line is still reported (to STDERR by default), in a single pass
+        assert [
+            (invalid_line["source"], invalid_line["line_number"])
+            for invalid_line in map(json.loads, capsys.readouterr().err.splitlines())
+        ] == [(str(input_paths[0]), 2), (str(input_paths[1]), 1), (str(input_paths[1]), 3)]
+
+    def test_quarantine_closed_on_error(self, mocker, mock_stdout, tmp_path):
+        input_path = tmp_path / "input.txt.gz"
+        input_path.write_bytes(gzip.compress(b"Lions 3, Snakes 3\nSomething totally wrong\n")[:-8])
+        quarantine_path = tmp_path / "quarantine.jsonl"
+        opened_fileios = []
+
+        def spy_open(*args, **kwargs):
+            opened_fileios.append(open(*args, **kwargs))
+            return opened_fileios[-1]
+
+        mocker.patch.object(main, "open", create=True, side_effect=spy_open)
+        with pytest.raises(ValueError, match="Invalid compressed input"):
+            self.run_main(
+                mocker,
+                str(input_path),
+                "--tiebreaker",
+                "head-to-head",
+                "--max-invalid-lines",
+                "5",
+                "--quarantine",
+                str(quarantine_path),
+            )
+
+        (quarantine_fileio,) = (
+            fileio for fileio in opened_fileios if fileio.name == str(quarantine_path)
+        )
+        assert quarantine_fileio.closed
+
+    def test_profile(self, mocker, mock_stdout, capsys):
+        self.run_main(mocker, str(FIXTURES_DIR / "sample-input-1.txt"), "--profile")
+
+        assert mock_stdout.getvalue() == (FIXTURES_DIR / "expected-output-1.txt").read_text()
+        profile_summary = json.loads(capsys.readouterr().err)
+        assert profile_summary["counters"] == {
+            "lines_read": 5,
+            "matches_parsed": 5,
+            "teams_seen": 5,
+            "rankings_written": 5,
+        }
+        assert set(profile_summary["stage_seconds"]) == {
+            "load_scores",
+            "generate_rankings",
+            "dump_rankings",
+        }
+        assert profile_summary["throughput"]["matches_per_second"] > 0
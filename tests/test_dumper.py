@@ -1,10 +1,11 @@
+import json
 from io import StringIO
 from typing import Iterable
 
 import pytest
 
 from base import SoccerMatchScoresLoader, SoccerTeamRanker
-from main import ToIORankingDumper
+from main import DeltaRankingDumper, ToIORankingDumper
 
 
 class MockRanker(SoccerTeamRanker):
@@ -44,3 +45,171 @@ class TestToIORankingDumper:
 
         mock_output.seek(0)
         assert mock_output.read() == "test\nother\nfoo\nbar\nbaz\n"
+
+
+class TestBufferedToIORankingDumper:
+    @pytest.fixture
+    def mock_output(self, mocker):
+        mock_output = StringIO()
+        mocker.spy(mock_output, "write")
+        mocker.spy(mock_output, "flush")
+        return mock_output
+
+    def test_empty(self, mock_output):
+        dumper = ToIORankingDumper(fileio=mock_output, buffer_size=1024)
+        dumper.dump_rankings(MockRanker())
+
+        assert mock_output.getvalue() == ""
+        assert mock_output.write.call_count == 0
+        assert mock_output.flush.call_count == 1
+
+    def test_single_block(self, mock_output):
+        dumper = ToIORankingDumper(fileio=mock_output, buffer_size=1024)
+        dumper.dump_rankings(MockRanker("test", "other", "foo", "bar", "baz"))
+
+        assert mock_output.getvalue() == "test\nother\nfoo\nbar\nbaz\n"
+        assert mock_output.write.call_count == 1
+        assert mock_output.flush.call_count == 1
+
+    def test_multiple_blocks(self, mock_output):
+        dumper = ToIORankingDumper(fileio=mock_output, buffer_size=10)
+        dumper.dump_rankings(MockRanker("test", "other", "foo", "bar", "baz"))
+
+        assert mock_output.getvalue() == "test\nother\nfoo\nbar\nbaz\n"
+        # Blocks are written once they reach 10 characters: "test\nother\n" + "foo\nbar\nbaz\n"
+        assert mock_output.write.call_count == 2
+        assert mock_output.flush.call_count == 1
+
+    def test_flush_interval(self, mock_output):
+        dumper = ToIORankingDumper(fileio=mock_output, buffer_size=1, flush_interval=0)
+        dumper.dump_rankings(MockRanker("test", "other", "foo"))
+
+        assert mock_output.getvalue() == "test\nother\nfoo\n"
+        assert mock_output.write.call_count == 3
+        # Once per block + once at the end
+        assert mock_output.flush.call_count == 4
+
+    @pytest.mark.parametrize(
+        "invalid_kwargs, error_message",
+        (
+            ({"buffer_size": 0}, "Buffer size must be > 0"),
+            ({"buffer_size": 1, "flush_interval": -1}, "Flush interval must be >= 0"),
+        ),
+    )
+    def test_invalid_args(self, invalid_kwargs, error_message):
+        with pytest.raises(ValueError, match=error_message):
+            ToIORankingDumper(fileio=StringIO(), **invalid_kwargs)
+
+
+class TestDeltaRankingDumper:
+    PREVIOUS_RANKINGS = (
+        "1. Tarantulas, 6 pts",
+        "2. Lions, 5 pts",
+        "3. FC Awesome, 1 pt",
+        "3. Snakes, 1 pt",
+        "5. Grouches, 0 pts",
+    )
+
+    @staticmethod
+    def deltas(mock_output):
+        return [json.loads(line) for line in mock_output.getvalue().splitlines()]
+
+    def test_no_changes(self):
+        mock_output = StringIO()
+        dumper = DeltaRankingDumper(
+            fileio=mock_output, previous_rankings=self.PREVIOUS_RANKINGS, metric_count=1
+        )
+        dumper.dump_rankings(MockRanker(*self.PREVIOUS_RANKINGS))
+
+        assert mock_output.getvalue() == ""
+
+    def test_changes(self):
+        mock_output = StringIO()
+        dumper = DeltaRankingDumper(
+            fileio=mock_output, previous_rankings=self.PREVIOUS_RANKINGS, metric_count=1
+        )
+        dumper.dump_rankings(
+            MockRanker(
+                "1. Lions, 8 pts",
+                "2. Tarantulas, 6 pts",
+                "3. FC Awesome, 2 pts",
+                "4. Snakes, 1 pt",
+                "5. Bears, Inc., 0 pts",
+            )
+        )
+
+        assert self.deltas(mock_output) == [
+            {
+                "op": "move",
+                "team": "Lions",
+                "old_rank": 2,
+                "new_rank": 1,
+                "old_metrics": ["5 pts"],
+                "new_metrics": ["8 pts"],
+            },
+            {
+                "op": "move",
+                "team": "Tarantulas",
+                "old_rank": 1,
+                "new_rank": 2,
+                "old_metrics": ["6 pts"],
+                "new_metrics": ["6 pts"],
+            },
+            {
+                "op": "update",
+                "team": "FC Awesome",
+                "old_rank": 3,
+                "new_rank": 3,
+                "old_metrics": ["1 pt"],
+                "new_metrics": ["2 pts"],
+            },
+            {
+                "op": "move",
+                "team": "Snakes",
+                "old_rank": 3,
+                "new_rank": 4,
+                "old_metrics": ["1 pt"],
+                "new_metrics": ["1 pt"],
+            },
+            {
+                "op": "insert",
+                "team": "Bears, Inc.",
+                "old_rank": None,
+                "new_rank": 5,
+                "old_metrics": None,
+                "new_metrics": ["0 pts"],
+            },
+            {
+                "op": "remove",
+                "team": "Grouches",
+                "old_rank": 5,
+                "new_rank": None,
+                "old_metrics": ["0 pts"],
+                "new_metrics": None,
+            },
+        ]
+
+    @pytest.mark.parametrize(
+        "ranking, metric_count, expected",
+        (
+            ("1. Lions", 0, (1, "Lions", [])),
+            ("12. Lions, Inc., 5 pts, 3 GD", 2, (12, "Lions, Inc.", ["5 pts", "3 GD"])),
+        ),
+    )
+    def test_parse_ranking(self, ranking, metric_count, expected):
+        dumper = DeltaRankingDumper(
+            fileio=StringIO(), previous_rankings=(), metric_count=metric_count
+        )
+
+        assert dumper.parse_ranking(ranking) == expected
+
+    @pytest.mark.parametrize("ranking", ("Lions, 5 pts", "1. Lions", "One. Lions, 5 pts", ""))
+    def test_invalid_previous_ranking(self, ranking):
+        mock_output = StringIO()
+        dumper = DeltaRankingDumper(
+            fileio=mock_output, previous_rankings=(ranking,), metric_count=1
+        )
+
+        with pytest.raises(ValueError, match="Invalid ranking"):
+            dumper.dump_rankings(MockRanker())
+        assert mock_output.getvalue() == ""
@@ -0,0 +1,100 @@
+from io import StringIO
+
+import pytest
+
+from main import (
+    FollowedFileSoccerMatchScoresLoader,
+    FollowRankingsEmitter,
+    GoalsForMetricScorer,
+    IncrementalStandardCompetitionSoccerTeamRanker,
+    MatchResultMetricScorer,
+)
+
+
+class TestFollowRankingsEmitter:
+    @pytest.fixture
+    def input_path(self, tmp_path):
+        input_path = tmp_path / "feed.txt"
+        input_path.write_text("Lions 3, Snakes 3\nTarantulas 1, FC Awesome 0\nLions 1,")
+        return input_path
+
+    @staticmethod
+    def emitter(input_path, checkpoint_path=None, metric_scorers=None):
+        return FollowRankingsEmitter(
+            ranker=IncrementalStandardCompetitionSoccerTeamRanker(
+                metric_scorers=metric_scorers or [MatchResultMetricScorer()]
+            ),
+            loader=FollowedFileSoccerMatchScoresLoader(file_path=input_path),
+            fileio=StringIO(),
+            checkpoint_path=checkpoint_path,
+        )
+
+    @staticmethod
+    def append(input_path, raw_match_scores):
+        with open(input_path, "a") as input_fileio:
+            input_fileio.write(raw_match_scores)
+
+    def test_re_emits_rankings_when_appended(self, input_path):
+        emitter = self.emitter(input_path)
+
+        assert emitter.poll()
+        assert not emitter.poll()
+        self.append(input_path, " FC Awesome 1\n")
+        assert emitter.poll()
+
+        assert emitter.fileio.getvalue() == (
+            "1. Tarantulas, 3 pts\n2. Lions, 1 pt\n2. Snakes, 1 pt\n4. FC Awesome, 0 pts\n\n"
+            "1. Tarantulas, 3 pts\n2. Lions, 2 pts\n3. FC Awesome, 1 pt\n3. Snakes, 1 pt\n\n"
+        )
+
+    def test_unterminated_last_line_not_counted(self, input_path):
+        # The unterminated "Lions 1," line is being written, so it's not counted (however many
+        # polls happen) until its newline is written
+        emitter = self.emitter(input_path)
+
+        assert emitter.poll()
+        assert not emitter.poll()
+        assert emitter.ranker.match_count == 2
+        assert emitter.loader.offset == len("Lions 3, Snakes 3\nTarantulas 1, FC Awesome 0\n")
+        self.append(input_path, " FC Awesome 1")
+        assert not emitter.poll()
+        assert emitter.ranker.match_count == 2
+        self.append(input_path, "\n")
+        assert emitter.poll()
+        assert emitter.ranker.match_count == 3
+
+    def test_resumes_from_checkpoint(self, input_path, tmp_path):
+        checkpoint_path = tmp_path / "feed.checkpoint"
+        emitter = self.emitter(input_path, checkpoint_path)
+        assert not emitter.restore_checkpoint()
+        emitter.poll()
+
+        self.append(input_path, " FC Awesome 1\n")
+        restarted_emitter = self.emitter(input_path, checkpoint_path)
+        assert restarted_emitter.restore_checkpoint()
+        assert restarted_emitter.loader.offset == emitter.loader.offset
+        assert restarted_emitter.poll()
+
+        assert restarted_emitter.ranker.match_count == 3
+        assert restarted_emitter.fileio.getvalue() == (
+            "1. Tarantulas, 3 pts\n2. Lions, 2 pts\n3. FC Awesome, 1 pt\n3. Snakes, 1 pt\n\n"
+        )
+
+    def test_checkpoint_of_other_metric_scorers(self, input_path, tmp_path):
+        checkpoint_path = tmp_path / "feed.checkpoint"
+        self.emitter(input_path, checkpoint_path).poll()
+        emitter = self.emitter(
+            input_path,
+            checkpoint_path,
+            metric_scorers=[MatchResultMetricScorer(), GoalsForMetricScorer()],
+        )
+
+        with pytest.raises(ValueError, match="Snapshot metric scorers .* don't match"):
+            emitter.restore_checkpoint()
+
+    def test_invalid_checkpoint(self, input_path, tmp_path):
+        checkpoint_path = tmp_path / "feed.checkpoint"
+        checkpoint_path.write_bytes(b"NOTACHECKPOINT" + b"\0" * 8)
+
+        with pytest.raises(ValueError, match="Invalid checkpoint: Unknown file format"):
+            self.emitter(input_path, checkpoint_path).restore_checkpoint()
@@ -1,9 +1,33 @@
-from io import StringIO
+import gzip
+import json
+import os
+import threading
+from io import BytesIO, StringIO, TextIOWrapper
 
 import pytest
 
-from main import FromIOSoccerMatchScoresLoader
-from models import MatchScore, TeamGameScore
+import main
+from main import (
+    CachedFromFileSoccerMatchScoresLoader,
+    ChainedSoccerMatchScoresLoader,
+    FollowedFileSoccerMatchScoresLoader,
+    FromBinaryIOSoccerMatchScoresLoader,
+    FromBinaryLinesSoccerMatchRoundsLoader,
+    FromFilesSoccerMatchScoresLoader,
+    FromIOSoccerMatchScoresLoader,
+    FromSnapshotFilesSoccerTeamMetricTotalsLoader,
+    GoalDifferenceMetricScorer,
+    InvalidLineQuarantine,
+    MatchResultMetricScorer,
+    ParallelFromFilesSoccerTeamMetricTotalsLoader,
+    PipelinedDecompressingReader,
+    PipelinedFromStreamSoccerTeamMetricTotalsLoader,
+    StandardCompetitionSoccerTeamRanker,
+    StatsPipelineObserver,
+    detect_compression,
+    open_input_file,
+)
+from models import InvalidLine, MatchScore, TeamGameScore, TeamMetricTotals
 
 
 class TestFromIOSoccerMatchScoresLoader:
@@ -11,9 +35,81 @@ class TestFromIOSoccerMatchScoresLoader:
     def mock_input(self):
         return StringIO()
 
-    @pytest.fixture
-    def loader(self, mock_input):
-        return FromIOSoccerMatchScoresLoader(fileio=mock_input)
+    @pytest.fixture(params=(False, True), ids=("regex_parse", "fast_parse"))
+    def loader(self, request, mock_input):
+        return FromIOSoccerMatchScoresLoader(fileio=mock_input, fast_parse=request.param)
+
+    LENIENT_INPUT = (
+        "Foo 1, Bar 1\n"
+        "Something totally wrong\n"
+        "Foo 1, Foo 2\r\n"
+        "Baz -1, Bar 1\n"
+        "\n"
+        "Baz 2, Foo 0"
+    )
+
+    @pytest.mark.parametrize("fast_parse", (False, True))
+    def test_iter_match_scores_lenient(self, fast_parse):
+        invalid_lines = []
+        loader = FromIOSoccerMatchScoresLoader(
+            fileio=StringIO(self.LENIENT_INPUT), fast_parse=fast_parse, invalid_lines=invalid_lines
+        )
+
+        assert list(loader.iter_match_scores()) == [
+            MatchScore(TeamGameScore("Foo", 1), TeamGameScore("Bar", 1)),
+            MatchScore(TeamGameScore("Baz", 2), TeamGameScore("Foo", 0)),
+        ]
+        assert loader.lines_read == 6
+        assert invalid_lines == [
+            InvalidLine(2, "Something totally wrong", "Invalid Match Score found in input"),
+            InvalidLine(
+                3, "Foo 1, Foo 2", "A valid match must contain mutually exclusive team scores"
+            ),
+            InvalidLine(4, "Baz -1, Bar 1", "Invalid Match Score found in input"),
+            InvalidLine(5, "", "Invalid Match Score found in input"),
+        ]
+
+    @pytest.mark.parametrize("fast_parse", (False, True))
+    def test_invalid_utf8_lenient(self, fast_parse):
+        invalid_lines = []
+        loader = FromIOSoccerMatchScoresLoader(
+            fileio=TextIOWrapper(
+                BytesIO(b"Foo 1, Bar 0\nF\xffo 1, Bar 2\n\xc3\x89quipe 1, Bar 0\n"),
+                encoding="utf-8",
+            ),
+            fast_parse=fast_parse,
+            invalid_lines=invalid_lines,
+        )
+
+        assert list(loader.iter_match_score_tuples()) == [
+            ("Foo", 1, "Bar", 0),
+            ("\u00c9quipe", 1, "Bar", 0),
+        ]
+        ((line_number, raw_line, error),) = invalid_lines
+        assert (line_number, raw_line) == (2, "F\ufffdo 1, Bar 2")
+        assert "can't decode byte 0xff" in error
+
+    def test_invalid_utf8(self):
+        loader = FromIOSoccerMatchScoresLoader(
+            fileio=TextIOWrapper(BytesIO(b"Foo 1, Bar 0\nF\xffo 1, Bar 2\n"), encoding="utf-8")
+        )
+
+        with pytest.raises(UnicodeDecodeError):
+            list(loader.iter_match_score_tuples())
+
+    @pytest.mark.parametrize("score", (2**63, 10**20))
+    def test_score_too_large(self, loader, score):
+        # Scores are stored within 64-bit columns, so are rejected as invalid rather than overflowing
+        with pytest.raises(ValueError, match=f"Score must be <= {2**63 - 1}"):
+            loader.parse_match_score(f"Foo {score}, Bar 1")
+        with pytest.raises(ValueError, match=f"Score must be <= {2**63 - 1}"):
+            loader.parse_match_score_tuple(f"Foo 1, Bar {score}")
+        assert loader.parse_match_score_tuple(f"Foo {2**63 - 1}, Bar 3000000000") == (
+            "Foo",
+            2**63 - 1,
+            "Bar",
+            3000000000,
+        )
 
     def test_iter_match_scores_empty(self, loader, mock_input):
         mock_input.write("\n")  # Equivalent to CTRL+D in STDIN
@@ -90,3 +186,964 @@ class TestFromIOSoccerMatchScoresLoader:
         assert valid_match_score == MatchScore(
             TeamGameScore(team_name="Foo", score=20), TeamGameScore(team_name="Bar", score=5)
         )
+
+    def test_iter_match_score_tuples_valid(self, loader, mock_input):
+        mock_input.write("Foo 1, Bar 1\nName With Spaces 1, Numb3r Nam3 0\n")
+        mock_input.seek(0)
+
+        assert list(loader.iter_match_score_tuples()) == [
+            ("Foo", 1, "Bar", 1),
+            ("Name With Spaces", 1, "Numb3r Nam3", 0),
+        ]
+        assert loader.lines_read == 2
+
+    @pytest.mark.parametrize(
+        "raw_match_score",
+        (
+            "Foo 1, Bar 1\n",
+            "Baz 1, Baz 2\n",
+            "Foo -1, Bar 1\n",
+            "Something totally wrong\n",
+        ),
+    )
+    def test_parse_match_score_tuple_matches_parse_match_score(self, loader, raw_match_score):
+        def parse(parse_function):
+            try:
+                match_score = parse_function(raw_match_score)
+            except ValueError as exc:
+                return str(exc)
+            if isinstance(match_score, MatchScore):
+                return (
+                    match_score.team_score_a.team_name,
+                    match_score.team_score_a.score,
+                    match_score.team_score_b.team_name,
+                    match_score.team_score_b.score,
+                )
+            return match_score
+
+        assert parse(loader.parse_match_score_tuple) == parse(loader.parse_match_score)
+
+    @pytest.mark.parametrize(
+        "raw_match_score",
+        (
+            "Foo 1, Bar 1",
+            "Foo 1, Bar 1\n",
+            "Name, With Comma 1, Other, Comma 2\n",
+            "Foo 1, Bar 2, Baz 3\n",
+            "Foo 1, Bar 2 3\n",
+            "Foo 1, Bar 2x\n",
+            "Foo 1, Bar 2 \n",
+            "Foo 1 2, Bar 3\n",
+            "Foo 1,  Bar 1\n",
+            "Foo  1, Bar 1\n",
+            "Foo\t1, Bar 1\n",
+            "Foo 1, Bar\t1\n",
+            "F 1, B 1\n",
+            "\u00a0Foo 1, Bar 1\n",
+            "Foo\u00a0 1, Bar 1\n",
+            "Foo \u0663, Bar \u0661\n",
+            "Foo \u00b2, Bar 1\n",
+            "Foo 1,Bar 1\n",
+            "Foo 1, , Bar 1\n",
+            " 1, Bar 1\n",
+            "1, Bar 1\n",
+            "Foo 1, 1\n",
+            "Foo 1, Bar\n",
+            "Foo +1, Bar 1\n",
+            "\n",
+            "",
+        ),
+    )
+    def test_fast_parse_matches_regex_parse(self, raw_match_score):
+        def parse(fast_parse):
+            loader = FromIOSoccerMatchScoresLoader(fileio=StringIO(), fast_parse=fast_parse)
+            try:
+                return loader.parse_match_score(raw_match_score)
+            except ValueError as exc:
+                return str(exc)
+
+        assert parse(fast_parse=True) == parse(fast_parse=False)
+
+
+class TestFromBinaryIOSoccerMatchScoresLoader:
+    @staticmethod
+    def load(loader_class, raw_input: bytes):
+        if loader_class is FromBinaryIOSoccerMatchScoresLoader:
+            loader = loader_class(fileio=BytesIO(raw_input))
+        else:
+            loader = loader_class(fileio=TextIOWrapper(BytesIO(raw_input), encoding="utf-8"))
+        match_score_tuples = []
+        try:
+            match_score_tuples.extend(loader.iter_match_score_tuples())
+        except ValueError as exc:
+            match_score_tuples.append(str(exc))
+        return match_score_tuples, loader.lines_read
+
+    @pytest.mark.parametrize(
+        "raw_input",
+        (
+            "Foo 1, Bar 1\nName With Spaces 12, Numb3r Nam3 0",
+            "Foo 1, Bar 1\r\nBaz 2, Foo 0\r\n",
+            "Foo 1, Bar 1\rBaz 2, Foo 0\r",
+            "Équipe 1, チーム 2\n",
+            "\u00a0Foo 1, Bar 1\n",
+            "Foo\u3000 1, Bar 1\n",
+            "Foo\x1c 1, Bar 1\n",
+            "\x01Foo 1, Bar\x7f 1\n",
+            "Спартак 1, Österreich 0\nÖsterreich 2, Спартак\u00a0 2\n",
+            "Foo \u0663, Bar \u0661\n",
+            "Foo 1, Foo 2\n",
+            "Foo 1, Bar 2x\n",
+            "Name, With Comma 1, Other, Comma 2\n",
+            "Foo 1,  Bar 1\n",
+            "Foo 1, Bar 1\n\nBaz 1, Bar 1\n",
+            "Foo -1, Bar 1\n",
+            f"Foo {2**63}, Bar 1\n",
+            "Foo 2147483647, Bar 0000000001\n",
+            "Foo 2147483648, Bar 1\n",
+            f"Foo {2**63 - 1}, Bar 0{2**63 - 1}\n",
+            "",
+        ),
+    )
+    def test_matches_text_loader(self, raw_input):
+        raw_input_bytes = raw_input.encode()
+
+        assert self.load(FromBinaryIOSoccerMatchScoresLoader, raw_input_bytes) == self.load(
+            FromIOSoccerMatchScoresLoader, raw_input_bytes
+        )
+
+    def test_team_names_decoded_once(self):
+        loader = FromBinaryIOSoccerMatchScoresLoader(
+            fileio=BytesIO("Les Équipes 1, Bar 1\nBar 2, Les Équipes 0\n".encode())
+        )
+
+        (team_name_a, _, team_name_b, _), (team_name_c, _, team_name_d, _) = (
+            loader.iter_match_score_tuples()
+        )
+
+        assert (team_name_a, team_name_b) == ("Les Équipes", "Bar")
+        assert team_name_a is team_name_d
+        assert team_name_b is team_name_c
+        assert loader.team_names == {"Les Équipes".encode(): "Les Équipes", b"Bar": "Bar"}
+
+    def test_non_ascii_team_names_cached(self, mocker):
+        loader = FromBinaryIOSoccerMatchScoresLoader(
+            fileio=BytesIO("Спартак 1, Österreich 0\nÖsterreich 2, Спартак 2\n".encode())
+        )
+        text_parse_spy = mocker.spy(loader.text_parser, "parse_match_score_tuple")
+
+        assert list(loader.iter_match_score_tuples()) == [
+            ("Спартак", 1, "Österreich", 0),
+            ("Österreich", 2, "Спартак", 2),
+        ]
+        # Never falls back to the text parser
+        text_parse_spy.assert_not_called()
+        assert loader.team_names == {
+            "Спартак".encode(): "Спартак",
+            "Österreich".encode(): "Österreich",
+        }
+
+    def test_iter_match_scores(self):
+        loader = FromBinaryIOSoccerMatchScoresLoader(fileio=BytesIO(b"Foo 1, Bar 2\n"))
+
+        assert list(loader.iter_match_scores()) == [
+            MatchScore(TeamGameScore("Foo", 1), TeamGameScore("Bar", 2))
+        ]
+
+    @pytest.mark.parametrize(
+        "raw_input",
+        (
+            TestFromIOSoccerMatchScoresLoader.LENIENT_INPUT,
+            "Foo 1, Bar 1\rBaz 2, Baz 0\rFoo 1, Bar 1\r",
+            "Équipe 1, Équipe 2\nFoo\u3000 1, Bar 1\nFoo \u0663, Bar \u0661\n",
+        ),
+    )
+    def test_lenient_matches_text_loader(self, raw_input):
+        raw_input_bytes = raw_input.encode()
+        binary_invalid_lines, text_invalid_lines = [], []
+        binary_loader = FromBinaryIOSoccerMatchScoresLoader(
+            fileio=BytesIO(raw_input_bytes), invalid_lines=binary_invalid_lines
+        )
+        text_loader = FromIOSoccerMatchScoresLoader(
+            fileio=TextIOWrapper(BytesIO(raw_input_bytes), encoding="utf-8"),
+            invalid_lines=text_invalid_lines,
+        )
+
+        assert list(binary_loader.iter_match_score_tuples()) == list(
+            text_loader.iter_match_score_tuples()
+        )
+        assert binary_loader.lines_read == text_loader.lines_read
+        assert binary_invalid_lines == text_invalid_lines
+        assert binary_invalid_lines
+
+    def test_invalid_utf8_lenient(self):
+        invalid_lines = []
+        loader = FromBinaryIOSoccerMatchScoresLoader(
+            fileio=BytesIO(b"Foo\xff 1, Bar 2\nFoo 1, Bar 0\n"), invalid_lines=invalid_lines
+        )
+
+        assert list(loader.iter_match_score_tuples()) == [("Foo", 1, "Bar", 0)]
+        ((line_number, raw_line, error),) = invalid_lines
+        assert (line_number, raw_line) == (1, "Foo\ufffd 1, Bar 2")
+        assert "can't decode byte 0xff" in error
+
+    def test_invalid_utf8_within_team_name_lenient(self):
+        # Starts + ends with ASCII characters, so it's only found invalid once decoded
+        invalid_lines = []
+        loader = FromBinaryIOSoccerMatchScoresLoader(
+            fileio=BytesIO(b"F\xffo 1, Bar 2\nFoo 1, Bar 0\n"), invalid_lines=invalid_lines
+        )
+
+        assert list(loader.iter_match_score_tuples()) == [("Foo", 1, "Bar", 0)]
+        ((line_number, raw_line, error),) = invalid_lines
+        assert (line_number, raw_line) == (1, "F\ufffdo 1, Bar 2")
+        assert "can't decode byte 0xff" in error
+
+    def test_invalid_utf8(self):
+        loader = FromBinaryIOSoccerMatchScoresLoader(fileio=BytesIO(b"Foo\xff 1, Bar 2\n"))
+
+        with pytest.raises(UnicodeDecodeError):
+            list(loader.iter_match_score_tuples())
+
+
+class TestParallelFromFilesSoccerTeamMetricTotalsLoader:
+    MATCH_SCORES = (
+        "Lions 3, Snakes 3\n"
+        "Tarantulas 1, FC Awesome 0\n"
+        "Lions 1, FC Awesome 1\n"
+        "Tarantulas 3, Snakes 1\n"
+        "Lions 4, Grouches 0\n"
+        "Name With Spaces 1, Numb3r Nam3 0\n"
+        "SpecialCh@r 6, Numb3r Nam3 1"
+    )
+
+    @staticmethod
+    def serial_rankings(input_path):
+        ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=[MatchResultMetricScorer()])
+        with open(input_path, "r") as input_fileio:
+            ranker.load_scores(FromIOSoccerMatchScoresLoader(fileio=input_fileio))
+        return list(ranker.iter_rankings())
+
+    @staticmethod
+    def parallel_rankings(loader):
+        ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=[MatchResultMetricScorer()])
+        ranker.load_totals(loader)
+        return list(ranker.iter_rankings())
+
+    def test_iter_chunk_ranges_aligned_to_newlines(self, tmp_path):
+        input_path = tmp_path / "input.txt"
+        input_path.write_bytes(b"Foo 1, Bar 1\nBaz 2, Qux 0\nFoo 0, Qux 0")
+        loader = ParallelFromFilesSoccerTeamMetricTotalsLoader(
+            file_paths=[input_path], chunk_size=5
+        )
+
+        assert list(loader.iter_chunk_ranges(input_path)) == [(0, 13), (13, 26), (26, 38)]
+
+    def test_iter_chunk_ranges_empty_file(self, tmp_path):
+        input_path = tmp_path / "input.txt"
+        input_path.write_bytes(b"")
+        loader = ParallelFromFilesSoccerTeamMetricTotalsLoader(file_paths=[input_path])
+
+        assert list(loader.iter_chunk_ranges(input_path)) == []
+        assert self.parallel_rankings(loader) == []
+
+    @pytest.mark.parametrize("chunk_size", (1, 10, 64, 1024 * 1024))
+    def test_matches_serial_rankings(self, tmp_path, chunk_size):
+        input_path = tmp_path / "input.txt"
+        input_path.write_text(self.MATCH_SCORES)
+        loader = ParallelFromFilesSoccerTeamMetricTotalsLoader(
+            file_paths=[input_path], max_workers=2, chunk_size=chunk_size
+        )
+
+        assert self.parallel_rankings(loader) == self.serial_rankings(input_path)
+
+    def test_invalid_match_score(self, tmp_path):
+        input_path = tmp_path / "input.txt"
+        input_path.write_text(f"{self.MATCH_SCORES}\nSomething totally wrong\n")
+        loader = ParallelFromFilesSoccerTeamMetricTotalsLoader(
+            file_paths=[input_path], max_workers=2, chunk_size=10
+        )
+
+        with pytest.raises(ValueError, match="Invalid Match Score found in input"):
+            self.parallel_rankings(loader)
+
+    @pytest.mark.parametrize("max_workers", (1, 2))
+    def test_multiple_files_match_serial_rankings(self, tmp_path, max_workers):
+        combined_input_path = tmp_path / "combined.txt"
+        combined_input_path.write_text(self.MATCH_SCORES)
+        input_paths = []
+        for index, raw_match_score in enumerate(self.MATCH_SCORES.splitlines()):
+            input_path = tmp_path / f"input-{index}.txt"
+            input_path.write_text(raw_match_score)
+            input_paths.append(input_path)
+        loader = ParallelFromFilesSoccerTeamMetricTotalsLoader(
+            file_paths=input_paths, max_workers=max_workers
+        )
+
+        assert self.parallel_rankings(loader) == self.serial_rankings(combined_input_path)
+
+    def test_invalid_max_workers(self, tmp_path):
+        with pytest.raises(ValueError, match="Max workers must be > 0"):
+            ParallelFromFilesSoccerTeamMetricTotalsLoader(file_paths=[], max_workers=0)
+
+    @pytest.mark.parametrize("max_workers", (1, 2))
+    @pytest.mark.parametrize("fast_parse", (False, True))
+    def test_quarantine(self, tmp_path, max_workers, fast_parse):
+        input_paths = [tmp_path / "input-1.txt", tmp_path / "input-2.txt"]
+        input_paths[0].write_bytes(
+            f"{self.MATCH_SCORES}\nSomething totally wrong\n".encode() + b"F\xffo 1, Bar 2\n"
+        )
+        input_paths[1].write_text(f"Foo 1, Foo 1\n{self.MATCH_SCORES}\n\nFoo 1, Bar -1")
+        quarantine_fileio = StringIO()
+        loader = ParallelFromFilesSoccerTeamMetricTotalsLoader(
+            file_paths=input_paths,
+            max_workers=max_workers,
+            chunk_size=10,
+            fast_parse=fast_parse,
+            quarantine=InvalidLineQuarantine(quarantine_fileio),
+        )
+        ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=[MatchResultMetricScorer()])
+        ranker.load_totals(loader)
+
+        combined_input_path = tmp_path / "combined.txt"
+        combined_input_path.write_text(f"{self.MATCH_SCORES}\n{self.MATCH_SCORES}")
+        assert list(ranker.iter_rankings()) == self.serial_rankings(combined_input_path)
+        assert [
+            (invalid_line["source"], invalid_line["line_number"], invalid_line["line"])
+            for invalid_line in map(json.loads, quarantine_fileio.getvalue().splitlines())
+        ] == [
+            (str(input_paths[0]), 8, "Something totally wrong"),
+            (str(input_paths[0]), 9, "F\ufffdo 1, Bar 2"),
+            (str(input_paths[1]), 1, "Foo 1, Foo 1"),
+            (str(input_paths[1]), 9, ""),
+            (str(input_paths[1]), 10, "Foo 1, Bar -1"),
+        ]
+
+
+class TestPipelinedFromStreamSoccerTeamMetricTotalsLoader:
+    MATCH_SCORES = TestParallelFromFilesSoccerTeamMetricTotalsLoader.MATCH_SCORES
+
+    class FailingIO(BytesIO):
+        def read1(self, size=-1):
+            if self.tell() > 0:
+                raise OSError("Broken pipe")
+            return super().read1(size)
+
+    @staticmethod
+    def serial_rankings(raw_match_scores):
+        ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=[MatchResultMetricScorer()])
+        ranker.load_scores(
+            FromIOSoccerMatchScoresLoader(fileio=TextIOWrapper(BytesIO(raw_match_scores)))
+        )
+        return list(ranker.iter_rankings())
+
+    @staticmethod
+    def pipelined_rankings(loader):
+        ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=[MatchResultMetricScorer()])
+        ranker.load_totals(loader)
+        return list(ranker.iter_rankings())
+
+    @pytest.mark.parametrize("block_size", (1, 10, 64, 1024 * 1024))
+    @pytest.mark.parametrize("max_workers", (1, 2))
+    @pytest.mark.parametrize("fast_parse", (False, True))
+    def test_matches_serial_rankings(self, block_size, max_workers, fast_parse):
+        raw_match_scores = self.MATCH_SCORES.encode()
+        loader = PipelinedFromStreamSoccerTeamMetricTotalsLoader(
+            fileio=BytesIO(raw_match_scores),
+            max_workers=max_workers,
+            block_size=block_size,
+            max_pending_blocks=2,
+            fast_parse=fast_parse,
+        )
+
+        assert self.pipelined_rankings(loader) == self.serial_rankings(raw_match_scores)
+
+    @pytest.mark.parametrize(
+        "raw_match_scores",
+        (b"", b"Foo 1, Bar 0\nName With Spaces 12, Baz 10", b"Foo 1, Bar 0\r\nBaz 2, Foo 2\r\n"),
+    )
+    def test_edge_case_streams_match_serial_rankings(self, raw_match_scores):
+        loader = PipelinedFromStreamSoccerTeamMetricTotalsLoader(
+            fileio=BytesIO(raw_match_scores), max_workers=2, block_size=8
+        )
+
+        assert self.pipelined_rankings(loader) == self.serial_rankings(raw_match_scores)
+
+    def test_lines_read_observed(self):
+        observer = StatsPipelineObserver()
+        loader = PipelinedFromStreamSoccerTeamMetricTotalsLoader(
+            fileio=BytesIO(self.MATCH_SCORES.encode()), block_size=16, observer=observer
+        )
+        self.pipelined_rankings(loader)
+
+        assert observer.counters["lines_read"] == len(self.MATCH_SCORES.splitlines())
+
+    @pytest.mark.parametrize("max_workers", (1, 2))
+    def test_invalid_match_score(self, max_workers):
+        raw_match_scores = f"{self.MATCH_SCORES}\nSomething totally wrong\n{self.MATCH_SCORES}"
+        loader = PipelinedFromStreamSoccerTeamMetricTotalsLoader(
+            fileio=BytesIO(raw_match_scores.encode() * 50),
+            max_workers=max_workers,
+            block_size=10,
+            max_pending_blocks=1,
+        )
+
+        with pytest.raises(ValueError, match="Invalid Match Score found in input"):
+            self.pipelined_rankings(loader)
+
+    @pytest.mark.parametrize("max_workers", (1, 2))
+    def test_invalid_match_score_raised_while_stream_open(self, max_workers):
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, b"Foo 1, Bar 0\nSomething totally wrong\n")
+        errors = []
+
+        def load():
+            loader = PipelinedFromStreamSoccerTeamMetricTotalsLoader(
+                fileio=open(read_fd, "rb"), max_workers=max_workers
+            )
+            try:
+                self.pipelined_rankings(loader)
+            except ValueError as exc:
+                errors.append(exc)
+
+        load_thread = threading.Thread(target=load, daemon=True)
+        try:
+            load_thread.start()
+            # Raised while the upstream writer still keeps the stream open (ie without more input)
+            load_thread.join(timeout=10)
+            assert not load_thread.is_alive()
+            assert [str(error) for error in errors] == ["Invalid Match Score found in input"]
+        finally:
+            os.close(write_fd)
+
+    @pytest.mark.parametrize("max_workers", (1, 2))
+    def test_quarantine(self, max_workers):
+        raw_match_scores = f"Foo 1, Foo 1\n{self.MATCH_SCORES}\nSomething totally wrong\n"
+        quarantine_fileio = StringIO()
+        loader = PipelinedFromStreamSoccerTeamMetricTotalsLoader(
+            fileio=BytesIO(raw_match_scores.encode() * 3),
+            max_workers=max_workers,
+            block_size=10,
+            quarantine=InvalidLineQuarantine(quarantine_fileio),
+        )
+
+        assert self.pipelined_rankings(loader) == self.serial_rankings(
+            f"{self.MATCH_SCORES}\n".encode() * 3
+        )
+        assert [
+            (invalid_line["source"], invalid_line["line_number"])
+            for invalid_line in map(json.loads, quarantine_fileio.getvalue().splitlines())
+        ] == [
+            ("<stdin>", 1),
+            ("<stdin>", 9),
+            ("<stdin>", 10),
+            ("<stdin>", 18),
+            ("<stdin>", 19),
+            ("<stdin>", 27),
+        ]
+
+    def test_read_error(self):
+        loader = PipelinedFromStreamSoccerTeamMetricTotalsLoader(
+            fileio=self.FailingIO(self.MATCH_SCORES.encode()), block_size=10
+        )
+
+        with pytest.raises(OSError, match="Broken pipe"):
+            self.pipelined_rankings(loader)
+
+    @pytest.mark.parametrize(
+        "kwargs, message",
+        (
+            ({"block_size": 0}, "Block size must be > 0"),
+            ({"max_workers": 0}, "Max workers must be > 0"),
+            ({"max_pending_blocks": 0}, "Max pending blocks must be > 0"),
+        ),
+    )
+    def test_invalid_args(self, kwargs, message):
+        with pytest.raises(ValueError, match=message):
+            PipelinedFromStreamSoccerTeamMetricTotalsLoader(fileio=BytesIO(), **kwargs)
+
+
+class TestFromFilesSoccerMatchScoresLoader:
+    def test_loads_files_in_order(self, tmp_path):
+        input_paths = [tmp_path / "input-1.txt", tmp_path / "input-2.txt.gz"]
+        input_paths[0].write_text("Foo 1, Bar 0")
+        input_paths[1].write_bytes(gzip.compress(b"Baz 2, Qux 2\nFoo 0, Baz 3\n"))
+        loader = FromFilesSoccerMatchScoresLoader(input_paths)
+
+        assert list(loader.iter_match_score_tuples()) == [
+            ("Foo", 1, "Bar", 0),
+            ("Baz", 2, "Qux", 2),
+            ("Foo", 0, "Baz", 3),
+        ]
+        assert list(loader.iter_match_scores())[0] == MatchScore(
+            TeamGameScore("Foo", 1), TeamGameScore("Bar", 0)
+        )
+
+    def test_quarantine(self, tmp_path):
+        input_paths = [tmp_path / "input-1.txt", tmp_path / "input-2.txt.gz"]
+        input_paths[0].write_text("Foo 1, Bar 0\nFoo 1, Foo 0")
+        input_paths[1].write_bytes(gzip.compress(b"Baz 2, Qux 2\nSomething totally wrong\n"))
+        quarantine_fileio = StringIO()
+        loader = FromFilesSoccerMatchScoresLoader(
+            input_paths, quarantine=InvalidLineQuarantine(quarantine_fileio)
+        )
+
+        assert list(loader.iter_match_score_tuples()) == [
+            ("Foo", 1, "Bar", 0),
+            ("Baz", 2, "Qux", 2),
+        ]
+        assert [
+            (invalid_line["source"], invalid_line["line_number"])
+            for invalid_line in map(json.loads, quarantine_fileio.getvalue().splitlines())
+        ] == [(str(input_paths[0]), 2), (str(input_paths[1]), 2)]
+
+
+class TestInvalidLineQuarantine:
+    def test_quarantine(self):
+        quarantine_fileio = StringIO()
+        quarantine = InvalidLineQuarantine(quarantine_fileio, max_invalid_lines=2)
+        quarantine.quarantine("a.txt", [InvalidLine(1, "Foo", "Invalid")], line_offset=10)
+        quarantine.quarantine("b.txt", [])
+        quarantine.quarantine("b.txt", [InvalidLine(3, "Bar", "Invalid")])
+        quarantine.check_error_budget()
+
+        assert quarantine.invalid_line_count == 2
+        assert list(map(json.loads, quarantine_fileio.getvalue().splitlines())) == [
+            {"source": "a.txt", "line_number": 11, "line": "Foo", "error": "Invalid"},
+            {"source": "b.txt", "line_number": 3, "line": "Bar", "error": "Invalid"},
+        ]
+
+    def test_error_budget_exceeded(self):
+        quarantine = InvalidLineQuarantine(StringIO())
+        quarantine.quarantine("a.txt", [InvalidLine(1, "Foo", "Invalid")])
+
+        with pytest.raises(
+            ValueError, match="Found 1 invalid lines in input, more than the error budget of 0"
+        ):
+            quarantine.check_error_budget()
+
+    def test_invalid_max_invalid_lines(self):
+        with pytest.raises(ValueError, match="Max invalid lines must be >= 0"):
+            InvalidLineQuarantine(StringIO(), max_invalid_lines=-1)
+
+
+class TestCachedFromFileSoccerMatchScoresLoader:
+    MATCH_SCORES = TestParallelFromFilesSoccerTeamMetricTotalsLoader.MATCH_SCORES
+
+    @pytest.fixture
+    def input_path(self, tmp_path):
+        input_path = tmp_path / "input.txt"
+        input_path.write_text(self.MATCH_SCORES)
+        return input_path
+
+    @pytest.fixture
+    def cache_dir(self, tmp_path):
+        return tmp_path / "cache"
+
+    @staticmethod
+    def rankings(loader):
+        ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=[MatchResultMetricScorer()])
+        ranker.load_scores(loader)
+        return list(ranker.iter_rankings())
+
+    @pytest.fixture(params=("numpy", "pure_python"))
+    def vectorization(self, request, monkeypatch):
+        if request.param == "numpy":
+            pytest.importorskip("numpy")
+        else:
+            monkeypatch.setattr(main, "np", None)
+        return request.param
+
+    def test_iter_match_scores(self, input_path, cache_dir):
+        with open(input_path, "r") as input_fileio:
+            expected_match_scores = list(
+                FromIOSoccerMatchScoresLoader(fileio=input_fileio).iter_match_scores()
+            )
+        loader = CachedFromFileSoccerMatchScoresLoader(file_path=input_path, cache_dir=cache_dir)
+
+        # First from parsing the file, then from the cache
+        assert list(loader.iter_match_scores()) == expected_match_scores
+        assert loader.cache_path.exists()
+        assert list(loader.iter_match_scores()) == expected_match_scores
+
+    def test_rankings_from_cache(self, mocker, input_path, cache_dir, vectorization):
+        expected_rankings = TestParallelFromFilesSoccerTeamMetricTotalsLoader.serial_rankings(
+            input_path
+        )
+        loader = CachedFromFileSoccerMatchScoresLoader(file_path=input_path, cache_dir=cache_dir)
+        assert self.rankings(loader) == expected_rankings
+
+        mock_parse = mocker.patch.object(loader, "_parse_match_score_columns")
+        assert self.rankings(loader) == expected_rankings
+        mock_parse.assert_not_called()
+
+    def test_modified_file_invalidates_cache(self, input_path, cache_dir):
+        loader = CachedFromFileSoccerMatchScoresLoader(file_path=input_path, cache_dir=cache_dir)
+        self.rankings(loader)
+        input_path.write_text("Foo 1, Bar 0\n")
+
+        assert self.rankings(loader) == ["1. Foo, 3 pts", "2. Bar, 0 pts"]
+
+    def test_empty_file(self, tmp_path, cache_dir):
+        input_path = tmp_path / "input.txt"
+        input_path.write_text("")
+        loader = CachedFromFileSoccerMatchScoresLoader(file_path=input_path, cache_dir=cache_dir)
+
+        assert self.rankings(loader) == []
+        assert self.rankings(loader) == []
+
+    @pytest.mark.parametrize(
+        "corrupt_cache",
+        (
+            lambda cache_bytes: b"",
+            lambda cache_bytes: cache_bytes[
+                : CachedFromFileSoccerMatchScoresLoader.CACHE_HEADER.size
+            ],
+            lambda cache_bytes: cache_bytes[:-1],
+            lambda cache_bytes: cache_bytes + b"\0",
+        ),
+        ids=("empty", "header_only", "truncated_team_names", "trailing_bytes"),
+    )
+    def test_corrupted_cache_reparsed(
+        self, mocker, input_path, cache_dir, vectorization, corrupt_cache
+    ):
+        loader = CachedFromFileSoccerMatchScoresLoader(file_path=input_path, cache_dir=cache_dir)
+        expected_rankings = self.rankings(loader)
+        loader.cache_path.write_bytes(corrupt_cache(loader.cache_path.read_bytes()))
+        parse_spy = mocker.spy(loader, "_parse_match_score_columns")
+
+        # Treated as a cache miss: the file is parsed again, and its cache rewritten
+        assert self.rankings(loader) == expected_rankings
+        parse_spy.assert_called_once()
+        assert self.rankings(loader) == expected_rankings
+        parse_spy.assert_called_once()
+
+    def test_invalid_match_score_not_cached(self, tmp_path, cache_dir):
+        input_path = tmp_path / "input.txt"
+        input_path.write_text("Foo 1, Bar 0\nSomething totally wrong\n")
+        loader = CachedFromFileSoccerMatchScoresLoader(file_path=input_path, cache_dir=cache_dir)
+
+        with pytest.raises(ValueError, match="Invalid Match Score found in input"):
+            self.rankings(loader)
+        assert not loader.cache_path.exists()
+
+    def test_chained_cached_loaders(self, input_path, tmp_path, cache_dir):
+        other_input_path = tmp_path / "other.txt"
+        other_input_path.write_text("Lions 0, Grouches 5\n")
+        combined_input_path = tmp_path / "combined.txt"
+        combined_input_path.write_text(f"{self.MATCH_SCORES}\nLions 0, Grouches 5\n")
+        loader = ChainedSoccerMatchScoresLoader(
+            [
+                CachedFromFileSoccerMatchScoresLoader(file_path=input_path, cache_dir=cache_dir),
+                CachedFromFileSoccerMatchScoresLoader(
+                    file_path=other_input_path, cache_dir=cache_dir
+                ),
+            ]
+        )
+
+        expected_rankings = TestParallelFromFilesSoccerTeamMetricTotalsLoader.serial_rankings(
+            combined_input_path
+        )
+        assert self.rankings(loader) == expected_rankings
+        assert self.rankings(loader) == expected_rankings
+
+
+class TestCompressedInput:
+    MATCH_SCORES = TestParallelFromFilesSoccerTeamMetricTotalsLoader.MATCH_SCORES
+
+    @pytest.fixture(params=("gzip", "bz2", "xz"))
+    def compression(self, request):
+        return request.param
+
+    def compressed_input_path(self, tmp_path, compression, file_name=None):
+        file_suffix = {"gzip": ".gz", "bz2": ".bz2", "xz": ".xz"}[compression]
+        input_path = tmp_path / (file_name or f"input.txt{file_suffix}")
+        input_path.write_bytes(
+            main.COMPRESSION_MODULES[compression].compress(self.MATCH_SCORES.encode())
+        )
+        return input_path
+
+    def test_detect_compression_from_file_suffix(self, tmp_path, compression):
+        input_path = self.compressed_input_path(tmp_path, compression)
+
+        assert detect_compression(input_path) == compression
+
+    def test_detect_compression_from_magic(self, tmp_path, compression):
+        input_path = self.compressed_input_path(tmp_path, compression, file_name="input")
+
+        assert detect_compression(input_path) == compression
+
+    @pytest.mark.parametrize("raw_input", (b"", b"BZh 1, Foo 0\n", b"BZh9 1, Foo 0\n"))
+    def test_detect_plain_text(self, tmp_path, raw_input):
+        input_path = tmp_path / "input.txt"
+        input_path.write_bytes(raw_input)
+
+        assert detect_compression(input_path) is None
+
+    def test_open_input_file(self, tmp_path, compression):
+        input_path = self.compressed_input_path(tmp_path, compression, file_name="input")
+
+        with open_input_file(input_path) as input_fileio:
+            assert input_fileio.read() == self.MATCH_SCORES.encode()
+
+    def test_pipelined_reader_small_blocks(self, tmp_path, compression):
+        input_path = self.compressed_input_path(tmp_path, compression)
+        compressed_fileio = main.COMPRESSION_MODULES[compression].open(input_path, "rb")
+
+        with PipelinedDecompressingReader(
+            compressed_fileio, block_size=3, max_queued_blocks=1
+        ) as reader:
+            assert reader.read(5) == self.MATCH_SCORES.encode()[:3]
+            assert reader.readall() == self.MATCH_SCORES.encode()[3:]
+        assert compressed_fileio.closed
+
+    def test_pipelined_reader_closed_early(self, tmp_path, compression):
+        input_path = self.compressed_input_path(tmp_path, compression)
+        compressed_fileio = main.COMPRESSION_MODULES[compression].open(input_path, "rb")
+        reader = PipelinedDecompressingReader(compressed_fileio, block_size=1, max_queued_blocks=1)
+
+        assert reader.read(1) == self.MATCH_SCORES.encode()[:1]
+        # The decompress thread is blocked on the full queue, closing must still stop it
+        reader.close()
+        assert not reader.decompress_thread.is_alive()
+
+    @pytest.mark.parametrize(
+        "block_size, max_queued_blocks, error",
+        ((0, 1, "Block size must be > 0"), (1, 0, "Max queued blocks must be > 0")),
+    )
+    def test_pipelined_reader_invalid_args(self, block_size, max_queued_blocks, error):
+        with pytest.raises(ValueError, match=error):
+            PipelinedDecompressingReader(BytesIO(), block_size, max_queued_blocks)
+
+    def test_truncated_compressed_file(self, tmp_path, compression):
+        input_path = self.compressed_input_path(tmp_path, compression)
+        input_path.write_bytes(input_path.read_bytes()[:-8])
+
+        with pytest.raises(ValueError, match="Invalid compressed input"):
+            with open_input_file(input_path) as input_fileio:
+                input_fileio.read()
+
+    def test_corrupted_compressed_file(self, tmp_path, compression):
+        input_path = self.compressed_input_path(tmp_path, compression)
+        # A valid header followed by garbage (bz2 reports it as a bare OSError)
+        input_path.write_bytes(input_path.read_bytes()[:10] + b"garbage" * 10)
+
+        with pytest.raises(ValueError, match="Invalid compressed input"):
+            with open_input_file(input_path) as input_fileio:
+                input_fileio.read()
+
+    @pytest.mark.parametrize("fast_parse", (False, True))
+    def test_parallel_loader_matches_plain_text(self, tmp_path, compression, fast_parse):
+        plain_input_path = tmp_path / "plain.txt"
+        plain_input_path.write_text(self.MATCH_SCORES)
+        loader = ParallelFromFilesSoccerTeamMetricTotalsLoader(
+            file_paths=[self.compressed_input_path(tmp_path, compression), plain_input_path],
+            max_workers=2,
+            chunk_size=10,
+            fast_parse=fast_parse,
+        )
+
+        # Compressed files are never split into chunks
+        assert list(loader.iter_chunk_ranges(loader.file_paths[0])) == [
+            (0, loader.file_paths[0].stat().st_size)
+        ]
+        assert TestParallelFromFilesSoccerTeamMetricTotalsLoader.parallel_rankings(loader) == (
+            TestParallelFromFilesSoccerTeamMetricTotalsLoader.parallel_rankings(
+                ParallelFromFilesSoccerTeamMetricTotalsLoader(
+                    file_paths=[plain_input_path, plain_input_path]
+                )
+            )
+        )
+
+    def test_cached_loader(self, tmp_path, compression):
+        loader = CachedFromFileSoccerMatchScoresLoader(
+            file_path=self.compressed_input_path(tmp_path, compression),
+            cache_dir=tmp_path / "cache",
+            fast_parse=True,
+        )
+
+        assert list(loader.iter_match_scores()) == list(
+            FromIOSoccerMatchScoresLoader(fileio=StringIO(self.MATCH_SCORES)).iter_match_scores()
+        )
+
+
+class TestFromBinaryLinesSoccerMatchRoundsLoader:
+    @staticmethod
+    def rounds(raw_lines):
+        loader = FromBinaryLinesSoccerMatchRoundsLoader(raw_lines=raw_lines)
+        return [
+            list(round_loader.iter_match_score_tuples())
+            for round_loader in loader.iter_round_loaders()
+        ]
+
+    @pytest.mark.parametrize(
+        "raw_input",
+        (
+            b"# Round 1\nFoo 1, Bar 0\nBaz 2, Qux 2\n# Round 2\nFoo 0, Baz 3\n",
+            b"Foo 1, Bar 0\nBaz 2, Qux 2\n# End of round 1\nFoo 0, Baz 3\n# End of round 2\n",
+            b"#\n#\nFoo 1, Bar 0\nBaz 2, Qux 2\n#\n#\nFoo 0, Baz 3",
+        ),
+        ids=("leading_markers", "trailing_markers", "empty_rounds"),
+    )
+    def test_iter_round_loaders(self, raw_input):
+        assert self.rounds(BytesIO(raw_input)) == [
+            [("Foo", 1, "Bar", 0), ("Baz", 2, "Qux", 2)],
+            [("Foo", 0, "Baz", 3)],
+        ]
+
+    def test_lines_without_newline(self):
+        # ie the last lines of chained files
+        assert self.rounds([b"Foo 1, Bar 0", b"Baz 2, Qux 2"]) == [
+            [("Foo", 1, "Bar", 0), ("Baz", 2, "Qux", 2)]
+        ]
+
+    def test_no_rounds(self):
+        assert self.rounds(BytesIO(b"")) == []
+        assert self.rounds(BytesIO(b"# Round 1\n")) == []
+
+    def test_invalid_match_score(self):
+        with pytest.raises(ValueError, match="Invalid Match Score found in input"):
+            self.rounds(BytesIO(b"# Round 1\nFoo 1, Bar 0\n\n"))
+
+    def test_hash_prefixed_team_name(self):
+        assert self.rounds(BytesIO(b"# Round 1\n#1 Lions 3, Snakes 1\n##\nFoo 0, #2 Bar 3\n")) == [
+            [("#1 Lions", 3, "Snakes", 1)],
+            [("Foo", 0, "#2 Bar", 3)],
+        ]
+
+    def test_ambiguous_round_marker(self):
+        with pytest.raises(ValueError, match="Ambiguous round marker"):
+            self.rounds(BytesIO(b"Foo 1, Bar 0\n# Lions 3, Snakes 1\n"))
+
+
+class TestFromSnapshotFilesSoccerTeamMetricTotalsLoader:
+    METRIC_SCORERS = [MatchResultMetricScorer(), GoalDifferenceMetricScorer()]
+
+    def snapshot(self, tmp_path, name, raw_match_scores):
+        ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=self.METRIC_SCORERS)
+        ranker.load_scores(FromIOSoccerMatchScoresLoader(fileio=StringIO(raw_match_scores)))
+        snapshot_path = tmp_path / name
+        with open(snapshot_path, "wb") as snapshot_fileio:
+            FromSnapshotFilesSoccerTeamMetricTotalsLoader.dump_snapshot(
+                snapshot_fileio, self.METRIC_SCORERS, ranker.partial_totals()
+            )
+        return snapshot_path
+
+    def test_round_trip(self, tmp_path):
+        totals = TeamMetricTotals(
+            team_names=["Lions", "Équipe", "チーム"],
+            metric_totals=[[3, 0, 1], [2, -2, 0]],
+            match_count=2,
+        )
+        snapshot_fileio = BytesIO()
+        FromSnapshotFilesSoccerTeamMetricTotalsLoader.dump_snapshot(
+            snapshot_fileio, self.METRIC_SCORERS, totals
+        )
+        snapshot_fileio.seek(0)
+
+        metric_scorer_names, loaded_totals = (
+            FromSnapshotFilesSoccerTeamMetricTotalsLoader.load_snapshot(snapshot_fileio)
+        )
+
+        assert metric_scorer_names == ["MatchResultMetricScorer", "GoalDifferenceMetricScorer"]
+        assert loaded_totals.team_names == totals.team_names
+        assert list(map(list, loaded_totals.metric_totals)) == totals.metric_totals
+        assert loaded_totals.match_count == 2
+
+    def test_merged_snapshots_match_serial_rankings(self, tmp_path):
+        raw_match_scores = TestParallelFromFilesSoccerTeamMetricTotalsLoader.MATCH_SCORES
+        raw_match_score_lines = raw_match_scores.splitlines(keepends=True)
+        snapshot_paths = [
+            self.snapshot(tmp_path, "shard-1.snapshot", "".join(raw_match_score_lines[:2])),
+            self.snapshot(tmp_path, "shard-2.snapshot", "".join(raw_match_score_lines[2:])),
+            self.snapshot(tmp_path, "shard-3.snapshot", ""),
+        ]
+        ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=self.METRIC_SCORERS)
+        ranker.load_totals(FromSnapshotFilesSoccerTeamMetricTotalsLoader(snapshot_paths))
+        serial_ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=self.METRIC_SCORERS)
+        serial_ranker.load_scores(FromIOSoccerMatchScoresLoader(fileio=StringIO(raw_match_scores)))
+
+        assert list(ranker.iter_rankings()) == list(serial_ranker.iter_rankings())
+        assert ranker.match_count == len(raw_match_score_lines)
+
+    def test_mismatched_metric_scorers(self, tmp_path):
+        snapshot_path = self.snapshot(tmp_path, "shard.snapshot", "Lions 1, Snakes 0\n")
+        ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=[MatchResultMetricScorer()])
+
+        with pytest.raises(ValueError, match="Snapshot metric scorers .* don't match"):
+            ranker.load_totals(FromSnapshotFilesSoccerTeamMetricTotalsLoader([snapshot_path]))
+
+    @pytest.mark.parametrize(
+        "raw_snapshot, error",
+        (
+            (b"", "Invalid snapshot: Truncated file"),
+            (b"NOTASNAPSHOT" + b"\0" * 20, "Invalid snapshot: Unknown file format"),
+        ),
+    )
+    def test_invalid_snapshot(self, raw_snapshot, error):
+        with pytest.raises(ValueError, match=error):
+            FromSnapshotFilesSoccerTeamMetricTotalsLoader.load_snapshot(BytesIO(raw_snapshot))
+
+    def test_truncated_snapshot(self, tmp_path):
+        snapshot_path = self.snapshot(tmp_path, "shard.snapshot", "Lions 1, Snakes 0\n")
+        raw_snapshot = snapshot_path.read_bytes()
+
+        with pytest.raises(ValueError, match="Invalid snapshot: Truncated file"):
+            FromSnapshotFilesSoccerTeamMetricTotalsLoader.load_snapshot(BytesIO(raw_snapshot[:-1]))
+
+
+class TestFollowedFileSoccerMatchScoresLoader:
+    def test_only_loads_appended_complete_lines(self, tmp_path):
+        input_path = tmp_path / "feed.txt"
+        input_path.write_text("Lions 3, Snakes 3\nTarantulas 1, FC")
+        loader = FollowedFileSoccerMatchScoresLoader(file_path=input_path)
+
+        assert list(loader.iter_match_score_tuples()) == [("Lions", 3, "Snakes", 3)]
+        assert loader.offset == len("Lions 3, Snakes 3\n")
+        # The partial trailing line is only loaded once it's complete
+        assert list(loader.iter_match_score_tuples()) == []
+        with open(input_path, "a") as input_fileio:
+            input_fileio.write(" Awesome 0\nLions 1, FC Awesome 1\n")
+        assert list(loader.iter_match_scores()) == [
+            MatchScore(TeamGameScore("Tarantulas", 1), TeamGameScore("FC Awesome", 0)),
+            MatchScore(TeamGameScore("Lions", 1), TeamGameScore("FC Awesome", 1)),
+        ]
+        assert loader.offset == input_path.stat().st_size
+
+    @pytest.mark.parametrize("fast_parse", (False, True))
+    @pytest.mark.parametrize("scan_chunk_size", (1, 4, 1024))
+    def test_appended_lines_read_incrementally(
+        self, tmp_path, monkeypatch, fast_parse, scan_chunk_size
+    ):
+        # The end of the last complete line is found by scanning backwards in bounded chunks
+        monkeypatch.setattr(FollowedFileSoccerMatchScoresLoader, "SCAN_CHUNK_SIZE", scan_chunk_size)
+        input_path = tmp_path / "feed.txt"
+        input_path.write_text("Lions 3, Snakes 3\nTarantulas 1, FC Awesome 0\nLions 1, FC")
+        loader = FollowedFileSoccerMatchScoresLoader(file_path=input_path, fast_parse=fast_parse)
+
+        assert list(loader.iter_match_score_tuples()) == [
+            ("Lions", 3, "Snakes", 3),
+            ("Tarantulas", 1, "FC Awesome", 0),
+        ]
+        assert loader.offset == len("Lions 3, Snakes 3\nTarantulas 1, FC Awesome 0\n")
+
+    def test_invalid_line_is_not_consumed(self, tmp_path):
+        input_path = tmp_path / "feed.txt"
+        input_path.write_text("Lions 3, Snakes 3\nSomething totally wrong\n")
+        loader = FollowedFileSoccerMatchScoresLoader(file_path=input_path)
+
+        with pytest.raises(ValueError, match="Invalid Match Score found in input"):
+            list(loader.iter_match_score_tuples())
+        assert loader.offset == 0
+
+    def test_truncated_file(self, tmp_path):
+        input_path = tmp_path / "feed.txt"
+        input_path.write_text("Lions 3, Snakes 3\n")
+        loader = FollowedFileSoccerMatchScoresLoader(file_path=input_path, offset=100)
+
+        with pytest.raises(ValueError, match="Followed file is smaller than the offset"):
+            list(loader.iter_match_score_tuples())
+
+    def test_invalid_offset(self, tmp_path):
+        with pytest.raises(ValueError, match="Offset must be >= 0"):
+            FollowedFileSoccerMatchScoresLoader(file_path=tmp_path / "feed.txt", offset=-1)
@@ -1,8 +1,26 @@
-from typing import Iterable
+import random
+from functools import partial
+from io import StringIO
+from typing import Iterable, Literal
 
-from base import SoccerMatchScoresLoader
-from main import MatchResultMetricScorer, StandardCompetitionSoccerTeamRanker
-from models import MatchScore, TeamGameScore
+import pytest
+
+import main
+from base import MetricScorer, SoccerMatchScoresLoader
+from main import (
+    CachedFromFileSoccerMatchScoresLoader,
+    ExternalMemoryStandardCompetitionSoccerTeamRanker,
+    FromIOSoccerMatchScoresLoader,
+    GoalDifferenceMetricScorer,
+    GoalsForMetricScorer,
+    HeadToHeadStandardCompetitionSoccerTeamRanker,
+    IncrementalStandardCompetitionSoccerTeamRanker,
+    MatchResultMetricScorer,
+    SortedBucketList,
+    StandardCompetitionSoccerTeamRanker,
+    WindowedStandardCompetitionSoccerTeamRanker,
+)
+from models import MatchScore, TeamGameScore, TeamMetricTotals
 
 
 class MockScoreLoader(SoccerMatchScoresLoader):
@@ -14,6 +32,22 @@ class MockScoreLoader(SoccerMatchScoresLoader):
             yield score
 
 
+class MockGoalsMetricScorer(MetricScorer):
+    """Scorer without a batch implementation, so it is always scored one match at a time"""
+
+    def readable_string_from_metric(self, metric: int) -> str:
+        return f"{metric} goals"
+
+    def default(self) -> int:
+        return 0
+
+    def sort_order(self) -> Literal[-1, 1]:
+        return -1
+
+    def score(self, match_score: MatchScore) -> tuple[int, int]:
+        return match_score.team_score_a.score, match_score.team_score_b.score
+
+
 class TestStandardCompetitionSoccerTeamRanker:
     def test_no_scorers(self):
         """
@@ -182,3 +216,735 @@ class TestStandardCompetitionSoccerTeamRanker:
             "9. b, 0 pts",
         ]
         assert list(ranker.iter_rankings()) == expected_rankings
+
+    def test_merge_totals(self):
+        ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=[MatchResultMetricScorer()])
+        ranker.merge_totals(TeamMetricTotals(team_names=["a", "b"], metric_totals=[[3, 1]]))
+        ranker.merge_totals(TeamMetricTotals(team_names=["b", "c"], metric_totals=[[3, 0]]))
+        ranker._generate_rankings()
+
+        assert list(ranker.iter_rankings()) == ["1. b, 4 pts", "2. a, 3 pts", "3. c, 0 pts"]
+
+    def test_partial_totals_round_trip(self):
+        mock_score_loader = MockScoreLoader(
+            MatchScore(
+                TeamGameScore(team_name="a", score=2), TeamGameScore(team_name="b", score=1)
+            ),
+            MatchScore(
+                TeamGameScore(team_name="b", score=1), TeamGameScore(team_name="c", score=1)
+            ),
+        )
+        ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=[MatchResultMetricScorer()])
+        ranker.load_scores(mock_score_loader)
+        merged_ranker = StandardCompetitionSoccerTeamRanker(
+            metric_scorers=[MatchResultMetricScorer()]
+        )
+        merged_ranker.merge_totals(ranker.partial_totals())
+        merged_ranker._generate_rankings()
+
+        assert list(merged_ranker.iter_rankings()) == list(ranker.iter_rankings())
+
+    def test_merge_totals_mismatched_metric_scorers(self):
+        ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=[MatchResultMetricScorer()])
+        with pytest.raises(ValueError, match="one set of totals per metric scorer"):
+            ranker.merge_totals(TeamMetricTotals(team_names=["a"], metric_totals=[]))
+
+    def test_team_names_interned_to_dense_ids(self):
+        mock_score_loader = MockScoreLoader(
+            MatchScore(
+                TeamGameScore(team_name="a", score=2), TeamGameScore(team_name="b", score=1)
+            ),
+            MatchScore(
+                TeamGameScore(team_name="b", score=1), TeamGameScore(team_name="c", score=1)
+            ),
+        )
+        ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=[MatchResultMetricScorer()])
+        ranker.load_scores(mock_score_loader)
+
+        assert ranker.team_ids == {"a": 0, "b": 1, "c": 2}
+        assert ranker.team_names == ["a", "b", "c"]
+        assert list(ranker.metrics[0]) == [3, 1, 1]
+        assert ranker.rankings == [[0], [1, 2]]
+
+    def test_clear(self):
+        mock_score_loader = MockScoreLoader(
+            MatchScore(
+                TeamGameScore(team_name="a", score=2), TeamGameScore(team_name="b", score=1)
+            ),
+        )
+        ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=[MatchResultMetricScorer()])
+        ranker.load_scores(mock_score_loader)
+        ranker.clear()
+
+        assert ranker.team_ids == {}
+        assert ranker.team_names == []
+        assert list(ranker.metrics[0]) == []
+        assert list(ranker.iter_rankings()) == []
+
+    @pytest.mark.parametrize("batch_size", (1, 2, 3, 1024))
+    @pytest.mark.parametrize("vectorization", ("numpy", "pure_python"))
+    def test_batched_scoring(self, monkeypatch, batch_size, vectorization):
+        if vectorization == "numpy":
+            pytest.importorskip("numpy")
+        else:
+            monkeypatch.setattr(main, "np", None)
+        mock_score_loader = MockScoreLoader(
+            MatchScore(
+                TeamGameScore(team_name="a", score=2), TeamGameScore(team_name="b", score=1)
+            ),
+            MatchScore(
+                TeamGameScore(team_name="b", score=1), TeamGameScore(team_name="c", score=1)
+            ),
+            MatchScore(
+                TeamGameScore(team_name="c", score=4), TeamGameScore(team_name="a", score=0)
+            ),
+            MatchScore(
+                TeamGameScore(team_name="a", score=1), TeamGameScore(team_name="b", score=1)
+            ),
+        )
+        ranker = StandardCompetitionSoccerTeamRanker(
+            metric_scorers=[MatchResultMetricScorer(), MockGoalsMetricScorer()],
+            batch_size=batch_size,
+        )
+        ranker.load_scores(mock_score_loader)
+
+        assert list(ranker.iter_rankings()) == [
+            "1. c, 4 pts, 5 goals",
+            "2. a, 4 pts, 3 goals",
+            "3. b, 2 pts, 3 goals",
+        ]
+
+    @pytest.mark.parametrize("vectorization", ("numpy", "pure_python"))
+    def test_large_scores(self, monkeypatch, vectorization):
+        if vectorization == "numpy":
+            pytest.importorskip("numpy")
+        else:
+            monkeypatch.setattr(main, "np", None)
+        metric_scorers = [
+            MatchResultMetricScorer(),
+            GoalDifferenceMetricScorer(),
+            GoalsForMetricScorer(),
+        ]
+        match_scores = [
+            MatchScore(TeamGameScore("a", 2**62), TeamGameScore("b", 3000000000)),
+            MatchScore(TeamGameScore("b", 1), TeamGameScore("a", 2**62 - 1)),
+        ]
+        ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=metric_scorers, batch_size=1)
+        ranker.load_scores(MockScoreLoader(*match_scores))
+
+        # Summed exactly up to the largest value a 64-bit total can hold
+        assert list(ranker.iter_rankings()) == [
+            f"1. a, 6 pts, {2**63 - 3000000002} GD, {2**63 - 1} goals",
+            f"2. b, 0 pts, {3000000002 - 2**63} GD, 3000000001 goals",
+        ]
+        with pytest.raises(ValueError, match="Metric totals must fit within 64-bit integers"):
+            ranker.load_scores(
+                MockScoreLoader(MatchScore(TeamGameScore("a", 1), TeamGameScore("c", 0)))
+            )
+
+    # Many more teams than matches per batch, so that each batch only counts a sparse subset of them
+    @pytest.mark.parametrize("team_count", (12, 1000))
+    @pytest.mark.parametrize("vectorization", ("numpy", "pure_python"))
+    def test_fused_scoring_matches_per_metric_scoring(self, monkeypatch, vectorization, team_count):
+        if vectorization == "numpy":
+            pytest.importorskip("numpy")
+        else:
+            monkeypatch.setattr(main, "np", None)
+
+        class UnfusedMetricScorer(MetricScorer):
+            """Delegates everything but counter_weights, so it is scored one match at a time"""
+
+            def __init__(self, metric_scorer):
+                self.metric_scorer = metric_scorer
+
+            def readable_string_from_metric(self, metric: int) -> str:
+                return self.metric_scorer.readable_string_from_metric(metric)
+
+            def default(self) -> int:
+                return self.metric_scorer.default()
+
+            def sort_order(self) -> Literal[-1, 1]:
+                return self.metric_scorer.sort_order()
+
+            def score(self, match_score: MatchScore) -> tuple[int, int]:
+                return self.metric_scorer.score(match_score)
+
+        random_generator = random.Random(13)
+        team_names = [f"team {i}" for i in range(team_count)]
+        match_scores = []
+        for _ in range(500):
+            team_name_a, team_name_b = random_generator.sample(team_names, 2)
+            match_scores.append(
+                MatchScore(
+                    TeamGameScore(team_name_a, random_generator.randint(0, 5)),
+                    TeamGameScore(team_name_b, random_generator.randint(0, 5)),
+                )
+            )
+        metric_scorers = [
+            MatchResultMetricScorer(),
+            GoalDifferenceMetricScorer(),
+            GoalsForMetricScorer(),
+        ]
+        fused_ranker = StandardCompetitionSoccerTeamRanker(
+            metric_scorers=metric_scorers, batch_size=64
+        )
+        fused_ranker.load_scores(MockScoreLoader(*match_scores))
+        unfused_ranker = StandardCompetitionSoccerTeamRanker(
+            metric_scorers=[UnfusedMetricScorer(scorer) for scorer in metric_scorers],
+            batch_size=64,
+        )
+        unfused_ranker.load_scores(MockScoreLoader(*match_scores))
+
+        assert list(fused_ranker.iter_rankings()) == list(unfused_ranker.iter_rankings())
+        assert fused_ranker.partial_totals() == unfused_ranker.partial_totals()
+
+    def test_single_fused_scorer_not_counted_per_team(self, mocker):
+        count_batch_per_team = mocker.spy(
+            StandardCompetitionSoccerTeamRanker, "_count_batch_per_team"
+        )
+        ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=[MatchResultMetricScorer()])
+        ranker.load_scores(FromIOSoccerMatchScoresLoader(fileio=StringIO("a 3, b 3\nb 2, c 1\n")))
+
+        assert list(ranker.iter_rankings()) == ["1. b, 4 pts", "2. a, 1 pt", "3. c, 0 pts"]
+        count_batch_per_team.assert_not_called()
+
+        ranker = StandardCompetitionSoccerTeamRanker(
+            metric_scorers=[MatchResultMetricScorer(), GoalsForMetricScorer()]
+        )
+        ranker.load_scores(FromIOSoccerMatchScoresLoader(fileio=StringIO("a 3, b 3\nb 2, c 1\n")))
+
+        assert count_batch_per_team.call_count == 1
+
+    def test_tuple_loader_matches_match_score_loader(self):
+        raw_match_scores = "a 3, b 3\nb 2, c 1\na 25, d 0\nc 0, a 1\n" * 3
+        rankings = []
+        for loader in (
+            FromIOSoccerMatchScoresLoader(fileio=StringIO(raw_match_scores)),
+            MockScoreLoader(
+                *FromIOSoccerMatchScoresLoader(
+                    fileio=StringIO(raw_match_scores)
+                ).iter_match_scores()
+            ),
+        ):
+            ranker = StandardCompetitionSoccerTeamRanker(
+                metric_scorers=[MatchResultMetricScorer()], batch_size=2
+            )
+            ranker.load_scores(loader)
+            rankings.append(list(ranker.iter_rankings()))
+            assert ranker.match_count == 12
+
+        assert rankings[0] == rankings[1]
+
+    def test_invalid_batch_size(self):
+        with pytest.raises(ValueError, match="Batch size must be > 0"):
+            StandardCompetitionSoccerTeamRanker(metric_scorers=[], batch_size=0)
+
+
+class TestSortedBucketList:
+    def test_matches_sorted_list(self):
+        rng = random.Random(42)
+        sorted_bucket_list = SortedBucketList(load=4)
+        expected_items = []
+        for _ in range(2000):
+            if expected_items and rng.random() < 0.4:
+                item = rng.choice(expected_items)
+                expected_items.remove(item)
+                sorted_bucket_list.remove(item)
+            else:
+                item = (rng.randint(-20, 20), rng.randint(0, 1000))
+                expected_items.append(item)
+                sorted_bucket_list.add(item)
+            expected_items.sort()
+
+            probe = (rng.randint(-20, 20),)
+            assert sorted_bucket_list.bisect_left(probe) == sum(
+                expected_item < probe for expected_item in expected_items
+            )
+        assert list(sorted_bucket_list) == expected_items
+        assert len(sorted_bucket_list) == len(expected_items)
+
+    def test_remove_missing_item(self):
+        sorted_bucket_list = SortedBucketList()
+        sorted_bucket_list.add(1)
+        with pytest.raises(ValueError, match="not in list"):
+            sorted_bucket_list.remove(2)
+
+
+class TestIncrementalStandardCompetitionSoccerTeamRanker:
+    MATCH_SCORES = (
+        MatchScore(TeamGameScore(team_name="a", score=2), TeamGameScore(team_name="x", score=1)),
+        MatchScore(TeamGameScore(team_name="x", score=2), TeamGameScore(team_name="b", score=1)),
+        MatchScore(TeamGameScore(team_name="b", score=0), TeamGameScore(team_name="a", score=1)),
+        MatchScore(TeamGameScore(team_name="c", score=1), TeamGameScore(team_name="d", score=1)),
+        MatchScore(TeamGameScore(team_name="d", score=1), TeamGameScore(team_name="c", score=1)),
+        MatchScore(TeamGameScore(team_name="e", score=1), TeamGameScore(team_name="f", score=1)),
+        MatchScore(TeamGameScore(team_name="g", score=3), TeamGameScore(team_name="a", score=1)),
+        MatchScore(TeamGameScore(team_name="h", score=1), TeamGameScore(team_name="g", score=1)),
+    )
+
+    def test_matches_full_rankings_after_every_load(self):
+        incremental_ranker = IncrementalStandardCompetitionSoccerTeamRanker(
+            metric_scorers=[MatchResultMetricScorer()]
+        )
+        ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=[MatchResultMetricScorer()])
+        for match_score in self.MATCH_SCORES:
+            incremental_ranker.load_scores(MockScoreLoader(match_score))
+            ranker.load_scores(MockScoreLoader(match_score))
+
+            assert list(incremental_ranker.iter_rankings()) == list(ranker.iter_rankings())
+
+    def test_no_scorers(self):
+        incremental_ranker = IncrementalStandardCompetitionSoccerTeamRanker(metric_scorers=[])
+        incremental_ranker.load_scores(MockScoreLoader(*self.MATCH_SCORES))
+
+        assert list(incremental_ranker.iter_rankings()) == [
+            "1. a",
+            "2. b",
+            "3. c",
+            "4. d",
+            "5. e",
+            "6. f",
+            "7. g",
+            "8. h",
+            "9. x",
+        ]
+        assert incremental_ranker.rank_of("e") == 5
+
+    def test_rank_of(self):
+        incremental_ranker = IncrementalStandardCompetitionSoccerTeamRanker(
+            metric_scorers=[MatchResultMetricScorer()]
+        )
+        incremental_ranker.load_scores(MockScoreLoader(*self.MATCH_SCORES))
+
+        # a: 6 pts, g: 4 pts, x: 3 pts, c/d: 2 pts, e/f/h: 1 pt, b: 0 pts
+        assert incremental_ranker.rank_of("a") == 1
+        assert incremental_ranker.rank_of("g") == 2
+        assert incremental_ranker.rank_of("x") == 3
+        assert incremental_ranker.rank_of("c") == 4
+        assert incremental_ranker.rank_of("d") == 4
+        assert incremental_ranker.rank_of("h") == 6
+        assert incremental_ranker.rank_of("b") == 9
+        assert incremental_ranker.rank_of("unknown") is None
+
+    def test_clear(self):
+        incremental_ranker = IncrementalStandardCompetitionSoccerTeamRanker(
+            metric_scorers=[MatchResultMetricScorer()]
+        )
+        incremental_ranker.load_scores(MockScoreLoader(*self.MATCH_SCORES))
+        incremental_ranker.clear()
+
+        assert list(incremental_ranker.iter_rankings()) == []
+        assert incremental_ranker.rank_of("a") is None
+
+
+class TestWindowedStandardCompetitionSoccerTeamRanker:
+    MATCH_SCORES = TestIncrementalStandardCompetitionSoccerTeamRanker.MATCH_SCORES
+
+    @pytest.mark.parametrize("window", (1, 2, 3, 100))
+    def test_matches_brute_force_form_table(self, window):
+        random_generator = random.Random(21)
+        team_names = [f"team {i}" for i in range(10)]
+        match_scores = []
+        for _ in range(100):
+            team_name_a, team_name_b = random_generator.sample(team_names, 2)
+            match_scores.append(
+                MatchScore(
+                    TeamGameScore(team_name_a, random_generator.randint(0, 3)),
+                    TeamGameScore(team_name_b, random_generator.randint(0, 3)),
+                )
+            )
+        metric_scorers = [MatchResultMetricScorer(), GoalDifferenceMetricScorer()]
+        ranker = WindowedStandardCompetitionSoccerTeamRanker(
+            metric_scorers=metric_scorers, window=window
+        )
+        # Loaded over several rounds, as windows carry over between loads
+        for start in range(0, len(match_scores), 7):
+            ranker.load_scores(MockScoreLoader(*match_scores[start : start + 7]))
+
+        # Brute force: re-scoring each team's last N matches from scratch
+        team_metric_deltas = {}
+        for match_score in match_scores:
+            metric_deltas = [metric_scorer.score(match_score) for metric_scorer in metric_scorers]
+            for team_score, side in ((match_score.team_score_a, 0), (match_score.team_score_b, 1)):
+                team_metric_deltas.setdefault(team_score.team_name, []).append(
+                    [metric_delta[side] for metric_delta in metric_deltas]
+                )
+        totals = ranker.partial_totals()
+        assert {
+            team_name: [metric_total[team_id] for metric_total in totals.metric_totals]
+            for team_id, team_name in enumerate(totals.team_names)
+        } == {
+            team_name: [sum(column) for column in zip(*metric_deltas[-window:])]
+            for team_name, metric_deltas in team_metric_deltas.items()
+        }
+        assert totals.match_count == len(match_scores)
+
+    def test_form_table(self):
+        ranker = WindowedStandardCompetitionSoccerTeamRanker(
+            metric_scorers=[MatchResultMetricScorer()], window=1
+        )
+        ranker.load_scores(MockScoreLoader(*self.MATCH_SCORES))
+
+        # Last matches, a: lost to g, b: lost to a, g: drew with h, x: beat b
+        assert list(ranker.iter_rankings()) == [
+            "1. x, 3 pts",
+            "2. c, 1 pt",
+            "2. d, 1 pt",
+            "2. e, 1 pt",
+            "2. f, 1 pt",
+            "2. g, 1 pt",
+            "2. h, 1 pt",
+            "8. a, 0 pts",
+            "8. b, 0 pts",
+        ]
+
+    def test_no_scorers(self):
+        ranker = WindowedStandardCompetitionSoccerTeamRanker(metric_scorers=[], window=1, top_k=2)
+        ranker.load_scores(MockScoreLoader(*self.MATCH_SCORES))
+
+        assert list(ranker.iter_rankings()) == ["1. a", "2. b"]
+
+    def test_clear(self):
+        ranker = WindowedStandardCompetitionSoccerTeamRanker(
+            metric_scorers=[MatchResultMetricScorer()], window=1
+        )
+        ranker.load_scores(MockScoreLoader(*self.MATCH_SCORES))
+        ranker.clear()
+        ranker.load_scores(MockScoreLoader(*self.MATCH_SCORES[:1]))
+
+        assert list(ranker.iter_rankings()) == ["1. a, 3 pts", "2. x, 0 pts"]
+
+    def test_merge_totals(self):
+        ranker = WindowedStandardCompetitionSoccerTeamRanker(metric_scorers=[], window=1)
+
+        with pytest.raises(ValueError, match="Windowed rankings can only be loaded from match"):
+            ranker.merge_totals(TeamMetricTotals(team_names=[], metric_totals=[]))
+
+    def test_invalid_window(self):
+        with pytest.raises(ValueError, match="Window must be > 0"):
+            WindowedStandardCompetitionSoccerTeamRanker(metric_scorers=[], window=0)
+
+
+class TestHeadToHeadStandardCompetitionSoccerTeamRanker:
+    # a/b/c are tied on 6 pts: a beat b, b beat c (by 2), c beat a
+    MATCH_SCORES = (
+        MatchScore(TeamGameScore(team_name="a", score=1), TeamGameScore(team_name="b", score=0)),
+        MatchScore(TeamGameScore(team_name="b", score=2), TeamGameScore(team_name="c", score=0)),
+        MatchScore(TeamGameScore(team_name="c", score=1), TeamGameScore(team_name="a", score=0)),
+        MatchScore(TeamGameScore(team_name="a", score=5), TeamGameScore(team_name="e", score=0)),
+        MatchScore(TeamGameScore(team_name="b", score=1), TeamGameScore(team_name="e", score=0)),
+        MatchScore(TeamGameScore(team_name="c", score=3), TeamGameScore(team_name="e", score=0)),
+        MatchScore(TeamGameScore(team_name="d", score=3), TeamGameScore(team_name="e", score=0)),
+        MatchScore(TeamGameScore(team_name="d", score=1), TeamGameScore(team_name="e", score=1)),
+    )
+
+    @staticmethod
+    def brute_force_rankings(match_scores, metric_scorers, head_to_head_after):
+        """Rescans every match score between the teams of each tie group"""
+        ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=metric_scorers)
+        ranker.load_scores(MockScoreLoader(*match_scores))
+        tie_values = {}
+        metric_values = {}
+        for team_id, team_name in enumerate(ranker.team_names):
+            metric_values[team_name] = [
+                metric_column[team_id] * metric_scorer.sort_order()
+                for metric_scorer, metric_column in ranker._metric_scorers_and_columns()
+            ]
+            tie_values[team_name] = tuple(metric_values[team_name][:head_to_head_after])
+        sort_keys = {}
+        for team_name in ranker.team_names:
+            tied_team_names = {
+                other_team_name
+                for other_team_name in ranker.team_names
+                if tie_values[other_team_name] == tie_values[team_name]
+            }
+            head_to_head_ranker = StandardCompetitionSoccerTeamRanker(
+                metric_scorers=[
+                    MatchResultMetricScorer(),
+                    GoalDifferenceMetricScorer(),
+                    GoalsForMetricScorer(),
+                ]
+            )
+            head_to_head_ranker.load_scores(
+                MockScoreLoader(
+                    *(
+                        match_score
+                        for match_score in match_scores
+                        if {match_score.team_score_a.team_name, match_score.team_score_b.team_name}
+                        <= tied_team_names
+                    )
+                )
+            )
+            head_to_head_key = (0, 0, 0)
+            if team_name in head_to_head_ranker.team_ids:
+                head_to_head_key = tuple(
+                    -metric_column[head_to_head_ranker.team_ids[team_name]]
+                    for metric_column in head_to_head_ranker.metrics
+                )
+            sort_keys[team_name] = (
+                *tie_values[team_name],
+                *head_to_head_key,
+                *metric_values[team_name][head_to_head_after:],
+            )
+        rankings = []
+        sorted_team_names = sorted(ranker.team_names, key=lambda name: (sort_keys[name], name))
+        for index, team_name in enumerate(sorted_team_names):
+            ranking = index + 1
+            if index and sort_keys[team_name] == sort_keys[sorted_team_names[index - 1]]:
+                ranking = rankings[-1][0]
+            rankings.append((ranking, team_name))
+        return [
+            ranker._format_ranking(ranking, ranker.team_ids[team_name])
+            for ranking, team_name in rankings
+        ]
+
+    def test_in_order_by_head_to_head(self):
+        ranker = HeadToHeadStandardCompetitionSoccerTeamRanker(
+            metric_scorers=[MatchResultMetricScorer()]
+        )
+        ranker.load_scores(MockScoreLoader(*self.MATCH_SCORES))
+
+        # Among a/b/c, all have 3 pts but b has the best goal difference (+1), then a (0), then c
+        assert list(ranker.iter_rankings()) == [
+            "1. b, 6 pts",
+            "2. a, 6 pts",
+            "3. c, 6 pts",
+            "4. d, 4 pts",
+            "5. e, 1 pt",
+        ]
+
+    def test_head_to_head_after_tiebreaker(self):
+        ranker = HeadToHeadStandardCompetitionSoccerTeamRanker(
+            metric_scorers=[MatchResultMetricScorer(), GoalDifferenceMetricScorer()],
+            head_to_head_after=2,
+        )
+        ranker.load_scores(MockScoreLoader(*self.MATCH_SCORES))
+
+        # a (+5 GD) is no longer tied, b and c (+2 GD) are, with b beating c head-to-head
+        assert list(ranker.iter_rankings()) == [
+            "1. a, 6 pts, 5 GD",
+            "2. b, 6 pts, 2 GD",
+            "3. c, 6 pts, 2 GD",
+            "4. d, 4 pts, 3 GD",
+            "5. e, 1 pt, -12 GD",
+        ]
+
+    def test_tied_head_to_head(self):
+        ranker = HeadToHeadStandardCompetitionSoccerTeamRanker(
+            metric_scorers=[MatchResultMetricScorer()]
+        )
+        ranker.load_scores(
+            MockScoreLoader(
+                MatchScore(TeamGameScore("a", 1), TeamGameScore("b", 1)),
+                MatchScore(TeamGameScore("c", 1), TeamGameScore("d", 0)),
+            )
+        )
+
+        assert list(ranker.iter_rankings()) == [
+            "1. c, 3 pts",
+            "2. a, 1 pt",
+            "2. b, 1 pt",
+            "4. d, 0 pts",
+        ]
+
+    @pytest.mark.parametrize("top_k", (None, 1, 3, 10))
+    @pytest.mark.parametrize("head_to_head_after", (0, 1, 2))
+    def test_matches_brute_force_rankings(self, top_k, head_to_head_after):
+        random_generator = random.Random(22)
+        team_names = [f"team {i}" for i in range(12)]
+        match_scores = []
+        for _ in range(40):
+            team_name_a, team_name_b = random_generator.sample(team_names, 2)
+            match_scores.append(
+                MatchScore(
+                    TeamGameScore(team_name_a, random_generator.randint(0, 2)),
+                    TeamGameScore(team_name_b, random_generator.randint(0, 2)),
+                )
+            )
+        metric_scorers = [MatchResultMetricScorer(), GoalsForMetricScorer()]
+        ranker = HeadToHeadStandardCompetitionSoccerTeamRanker(
+            metric_scorers=metric_scorers,
+            head_to_head_after=head_to_head_after,
+            batch_size=7,
+            top_k=top_k,
+        )
+        ranker.load_scores(MockScoreLoader(*match_scores))
+
+        expected_rankings = self.brute_force_rankings(
+            match_scores, metric_scorers, head_to_head_after
+        )
+        if top_k is not None:
+            boundary_ranking = expected_rankings[top_k - 1].split(".")[0]
+            expected_rankings = [
+                ranking
+                for index, ranking in enumerate(expected_rankings)
+                if index < top_k or ranking.split(".")[0] == boundary_ranking
+            ]
+        assert list(ranker.iter_rankings()) == expected_rankings
+
+    @pytest.mark.parametrize("vectorization", ("numpy", "pure_python"))
+    def test_columnar_loader(self, monkeypatch, tmp_path, vectorization):
+        if vectorization == "numpy":
+            pytest.importorskip("numpy")
+        else:
+            monkeypatch.setattr(main, "np", None)
+        input_path = tmp_path / "input.txt"
+        input_path.write_text(
+            "".join(
+                f"{match_score.team_score_a.team_name} {match_score.team_score_a.score}, "
+                f"{match_score.team_score_b.team_name} {match_score.team_score_b.score}\n"
+                for match_score in self.MATCH_SCORES
+            )
+        )
+        ranker = HeadToHeadStandardCompetitionSoccerTeamRanker(
+            metric_scorers=[MatchResultMetricScorer()]
+        )
+        expected_ranker = HeadToHeadStandardCompetitionSoccerTeamRanker(
+            metric_scorers=[MatchResultMetricScorer()]
+        )
+        expected_ranker.load_scores(MockScoreLoader(*self.MATCH_SCORES))
+
+        # Loaded twice, parsing the file then reading its cache
+        for _ in range(2):
+            ranker.clear()
+            ranker.load_scores(
+                CachedFromFileSoccerMatchScoresLoader(
+                    file_path=input_path, cache_dir=tmp_path / "cache"
+                )
+            )
+
+            assert list(ranker.iter_rankings()) == list(expected_ranker.iter_rankings())
+            assert all(type(pair_key) is int for pair_key in ranker.pair_rows)
+
+    def test_clear(self):
+        ranker = HeadToHeadStandardCompetitionSoccerTeamRanker(
+            metric_scorers=[MatchResultMetricScorer()]
+        )
+        ranker.load_scores(MockScoreLoader(*self.MATCH_SCORES))
+        ranker.clear()
+
+        assert ranker.pair_rows == {}
+        assert list(ranker.pair_results) == []
+
+    def test_merge_totals(self):
+        ranker = HeadToHeadStandardCompetitionSoccerTeamRanker(
+            metric_scorers=[], head_to_head_after=0
+        )
+
+        with pytest.raises(ValueError, match="Head to head rankings can only be loaded from match"):
+            ranker.merge_totals(TeamMetricTotals(team_names=[], metric_totals=[]))
+
+    @pytest.mark.parametrize("head_to_head_after", (-1, 2))
+    def test_invalid_head_to_head_after(self, head_to_head_after):
+        with pytest.raises(ValueError, match="Head to head after must be between 0 and the number"):
+            HeadToHeadStandardCompetitionSoccerTeamRanker(
+                metric_scorers=[MatchResultMetricScorer()], head_to_head_after=head_to_head_after
+            )
+
+
+class TestExternalMemoryStandardCompetitionSoccerTeamRanker:
+    MATCH_SCORES = TestIncrementalStandardCompetitionSoccerTeamRanker.MATCH_SCORES
+
+    @pytest.mark.parametrize("memory_budget", (1, 300, 1000, 1024 * 1024))
+    def test_matches_in_memory_rankings(self, tmp_path, memory_budget):
+        random_generator = random.Random(16)
+        team_names = [f"team {i}" for i in range(50)] + ["équipe", "チーム"]
+        match_scores = []
+        for _ in range(300):
+            team_name_a, team_name_b = random_generator.sample(team_names, 2)
+            match_scores.append(
+                MatchScore(
+                    TeamGameScore(team_name_a, random_generator.randint(0, 3)),
+                    TeamGameScore(team_name_b, random_generator.randint(0, 3)),
+                )
+            )
+        metric_scorers = [MatchResultMetricScorer(), GoalDifferenceMetricScorer()]
+        external_memory_ranker = ExternalMemoryStandardCompetitionSoccerTeamRanker(
+            metric_scorers=metric_scorers, memory_budget=memory_budget, spill_dir=tmp_path
+        )
+        external_memory_ranker.load_scores(MockScoreLoader(*match_scores))
+        ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=metric_scorers)
+        ranker.load_scores(MockScoreLoader(*match_scores))
+
+        assert list(external_memory_ranker.iter_rankings()) == list(ranker.iter_rankings())
+        # Rankings can be read more than once
+        assert list(external_memory_ranker.iter_rankings()) == list(ranker.iter_rankings())
+
+    def test_spills_sorted_runs(self):
+        ranker = ExternalMemoryStandardCompetitionSoccerTeamRanker(
+            metric_scorers=[MatchResultMetricScorer()], memory_budget=300
+        )
+        ranker.load_scores(MockScoreLoader(*self.MATCH_SCORES))
+
+        assert len(ranker.spilled_runs) == 4
+        assert list(ranker.iter_rankings()) == (
+            TestTopKStandardCompetitionSoccerTeamRanker.FULL_RANKINGS
+        )
+
+    def test_no_scorers(self):
+        ranker = ExternalMemoryStandardCompetitionSoccerTeamRanker(
+            metric_scorers=[], memory_budget=1, top_k=3
+        )
+        ranker.load_scores(MockScoreLoader(*self.MATCH_SCORES))
+
+        assert list(ranker.iter_rankings()) == ["1. a", "2. b", "3. c"]
+
+    def test_clear(self):
+        ranker = ExternalMemoryStandardCompetitionSoccerTeamRanker(
+            metric_scorers=[MatchResultMetricScorer()], memory_budget=1
+        )
+        ranker.load_scores(MockScoreLoader(*self.MATCH_SCORES))
+        spilled_runs = list(ranker.spilled_runs)
+        ranker.clear()
+
+        assert all(spilled_run.closed for spilled_run in spilled_runs)
+        assert ranker.spilled_runs == []
+        assert list(ranker.iter_rankings()) == []
+
+    def test_invalid_memory_budget(self):
+        with pytest.raises(ValueError, match="Memory budget must be > 0"):
+            ExternalMemoryStandardCompetitionSoccerTeamRanker(metric_scorers=[], memory_budget=0)
+
+
+class TestTopKStandardCompetitionSoccerTeamRanker:
+    MATCH_SCORES = TestIncrementalStandardCompetitionSoccerTeamRanker.MATCH_SCORES
+    # a: 6 pts, g: 4 pts, x: 3 pts, c/d: 2 pts, e/f/h: 1 pt, b: 0 pts
+    FULL_RANKINGS = [
+        "1. a, 6 pts",
+        "2. g, 4 pts",
+        "3. x, 3 pts",
+        "4. c, 2 pts",
+        "4. d, 2 pts",
+        "6. e, 1 pt",
+        "6. f, 1 pt",
+        "6. h, 1 pt",
+        "9. b, 0 pts",
+    ]
+
+    @pytest.mark.parametrize(
+        "top_k, expected_ranking_count",
+        ((1, 1), (3, 3), (4, 5), (5, 5), (6, 8), (7, 8), (8, 8), (9, 9), (100, 9)),
+    )
+    @pytest.mark.parametrize(
+        "ranker_class",
+        (
+            StandardCompetitionSoccerTeamRanker,
+            IncrementalStandardCompetitionSoccerTeamRanker,
+            partial(ExternalMemoryStandardCompetitionSoccerTeamRanker, memory_budget=300),
+        ),
+    )
+    def test_top_k_includes_ties_at_boundary(self, ranker_class, top_k, expected_ranking_count):
+        ranker = ranker_class(metric_scorers=[MatchResultMetricScorer()], top_k=top_k)
+        ranker.load_scores(MockScoreLoader(*self.MATCH_SCORES))
+
+        assert list(ranker.iter_rankings()) == self.FULL_RANKINGS[:expected_ranking_count]
+
+    def test_top_k_no_scorers(self):
+        ranker = StandardCompetitionSoccerTeamRanker(metric_scorers=[], top_k=2)
+        ranker.load_scores(MockScoreLoader(*self.MATCH_SCORES))
+
+        assert list(ranker.iter_rankings()) == ["1. a", "2. b"]
+
+    def test_invalid_top_k(self):
+        with pytest.raises(ValueError, match="Top K must be > 0"):
+            StandardCompetitionSoccerTeamRanker(metric_scorers=[], top_k=0)
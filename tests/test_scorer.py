@@ -1,7 +1,21 @@
 import pytest
 
-from main import MatchResultMetricScorer
-from models import MatchScore, TeamGameScore
+import main
+from main import (
+    GoalDifferenceMetricScorer,
+    GoalsForMetricScorer,
+    MatchResultMetricScorer,
+)
+from models import MatchCounterWeights, MatchScore, TeamGameScore
+
+
+@pytest.fixture(params=("numpy", "pure_python"))
+def vectorization(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(main, "np", None)
+    return request.param
 
 
 class TestMatchResultMetricScorer:
@@ -40,3 +54,83 @@ class TestMatchResultMetricScorer:
 
     def test_readable_string_from_metric_equal_to_zero(self, scorer):
         assert scorer.readable_string_from_metric(0) == "0 pts"
+
+    def test_score_batch(self, scorer, vectorization):
+        metric_deltas_a, metric_deltas_b = scorer.score_batch(
+            [0, 2, 4, 6], [1, 3, 5, 0], [3, 2, 3, 0], [1, 10, 3, 0]
+        )
+
+        assert list(metric_deltas_a) == [3, 0, 1, 1]
+        assert list(metric_deltas_b) == [0, 3, 1, 1]
+
+    def test_score_batch_empty(self, scorer, vectorization):
+        metric_deltas_a, metric_deltas_b = scorer.score_batch([], [], [], [])
+
+        assert list(metric_deltas_a) == []
+        assert list(metric_deltas_b) == []
+
+    def test_counter_weights(self, scorer):
+        assert scorer.counter_weights() == MatchCounterWeights(wins=3, ties=1, losses=0)
+
+
+class TestGoalDifferenceMetricScorer:
+    @pytest.fixture
+    def scorer(self):
+        return GoalDifferenceMetricScorer()
+
+    def test_score(self, scorer):
+        assert scorer.score(
+            MatchScore(
+                TeamGameScore(team_name="a", score=2), TeamGameScore(team_name="b", score=10)
+            )
+        ) == (-8, 8)
+
+    def test_sort_order(self, scorer):
+        assert scorer.sort_order() == -1
+
+    def test_readable_string_from_metric(self, scorer):
+        assert scorer.readable_string_from_metric(-3) == "-3 GD"
+
+    def test_score_batch(self, scorer, vectorization):
+        metric_deltas_a, metric_deltas_b = scorer.score_batch(
+            [0, 2, 4], [1, 3, 5], [3, 2, 3], [1, 10, 3]
+        )
+
+        assert list(metric_deltas_a) == [2, -8, 0]
+        assert list(metric_deltas_b) == [-2, 8, 0]
+
+    def test_counter_weights(self, scorer):
+        assert scorer.counter_weights() == MatchCounterWeights(goals_for=1, goals_against=-1)
+
+
+class TestGoalsForMetricScorer:
+    @pytest.fixture
+    def scorer(self):
+        return GoalsForMetricScorer()
+
+    def test_score(self, scorer):
+        assert scorer.score(
+            MatchScore(
+                TeamGameScore(team_name="a", score=2), TeamGameScore(team_name="b", score=10)
+            )
+        ) == (2, 10)
+
+    def test_sort_order(self, scorer):
+        assert scorer.sort_order() == -1
+
+    def test_readable_string_from_metric_equal_to_one(self, scorer):
+        assert scorer.readable_string_from_metric(1) == "1 goal"
+
+    def test_readable_string_from_metric_greater_than_one(self, scorer):
+        assert scorer.readable_string_from_metric(5) == "5 goals"
+
+    def test_score_batch(self, scorer, vectorization):
+        metric_deltas_a, metric_deltas_b = scorer.score_batch(
+            [0, 2, 4], [1, 3, 5], [3, 2, 3], [1, 10, 3]
+        )
+
+        assert list(metric_deltas_a) == [3, 2, 3]
+        assert list(metric_deltas_b) == [1, 10, 3]
+
+    def test_counter_weights(self, scorer):
+        assert scorer.counter_weights() == MatchCounterWeights(goals_for=1)
@@ -0,0 +1,155 @@
+import asyncio
+
+import pytest
+
+from main import IncrementalStandardCompetitionSoccerTeamRanker, MatchResultMetricScorer
+from models import MatchScore, TeamGameScore
+from server import FromTuplesSoccerMatchScoresLoader, RankingServer
+
+
+async def send(reader, writer, *lines):
+    writer.write("".join(f"{line}\n" for line in lines).encode())
+    await writer.drain()
+
+
+async def read_reply(reader):
+    reply_lines = []
+    while (reply_line := (await reader.readline()).decode().rstrip("\n")) != "":
+        reply_lines.append(reply_line)
+    return reply_lines
+
+
+class TestRankingServer:
+    @pytest.fixture
+    def ranking_server(self):
+        return RankingServer(
+            IncrementalStandardCompetitionSoccerTeamRanker(
+                metric_scorers=[MatchResultMetricScorer()]
+            ),
+            ingest_batch_size=2,
+        )
+
+    def run_with_server(self, ranking_server, client, unix_socket_path=None):
+        async def run():
+            server = await ranking_server.start_server(unix_socket_path=unix_socket_path)
+            async with server:
+                if unix_socket_path is not None:
+                    open_connection = lambda: asyncio.open_unix_connection(unix_socket_path)
+                else:
+                    port = server.sockets[0].getsockname()[1]
+                    open_connection = lambda: asyncio.open_connection("127.0.0.1", port)
+                return await client(open_connection)
+
+        return asyncio.run(run())
+
+    def test_ingest_and_query(self, ranking_server):
+        async def client(open_connection):
+            reader, writer = await open_connection()
+            await send(
+                reader,
+                writer,
+                "Lions 3, Snakes 3",
+                "Tarantulas 1, FC Awesome 0",
+                "Lions 1, FC Awesome 1",
+                "",
+                "Tarantulas 3, Snakes 1",
+                "Lions 4, Grouches 0",
+                "/rankings",
+                "/top 3",
+                "/rank Snakes",
+            )
+            replies = [await read_reply(reader) for _ in range(3)]
+            writer.close()
+            return replies
+
+        assert self.run_with_server(ranking_server, client) == [
+            [
+                "1. Tarantulas, 6 pts",
+                "2. Lions, 5 pts",
+                "3. FC Awesome, 1 pt",
+                "3. Snakes, 1 pt",
+                "5. Grouches, 0 pts",
+            ],
+            ["1. Tarantulas, 6 pts", "2. Lions, 5 pts", "3. FC Awesome, 1 pt", "3. Snakes, 1 pt"],
+            ["3"],
+        ]
+
+    @pytest.mark.parametrize(
+        "line, expected_reply",
+        (
+            (
+                "Lions 3, Lions 3",
+                [
+                    "ERROR A valid match must contain mutually exclusive team scores:"
+                    " Lions 3, Lions 3"
+                ],
+            ),
+            ("Lions 3", ["ERROR Invalid Match Score found in input: Lions 3"]),
+            ("/top 0", ["ERROR Top K must be > 0"]),
+            ("/top foo", ["ERROR Top K must be an integer: foo"]),
+            ("/rank Unknown", ["ERROR Unknown team Unknown"]),
+            ("/foo", ["ERROR Unknown command foo"]),
+        ),
+    )
+    def test_errors(self, ranking_server, line, expected_reply):
+        async def client(open_connection):
+            reader, writer = await open_connection()
+            await send(reader, writer, line, "/rankings")
+            replies = [await read_reply(reader) for _ in range(2)]
+            writer.close()
+            return replies
+
+        assert self.run_with_server(ranking_server, client) == [expected_reply, []]
+
+    def test_invalid_utf8(self, ranking_server):
+        async def client(open_connection):
+            reader, writer = await open_connection()
+            writer.write(b"Lions\xff 3, Snakes 1\nLions 3, Snakes 1\n")
+            await send(reader, writer, "/rankings")
+            replies = [await read_reply(reader) for _ in range(2)]
+            writer.close()
+            return replies
+
+        assert self.run_with_server(ranking_server, client) == [
+            [
+                "ERROR 'utf-8' codec can't decode byte 0xff in position 5: invalid start byte:"
+                " Lions\ufffd 3, Snakes 1"
+            ],
+            ["1. Lions, 3 pts", "2. Snakes, 0 pts"],
+        ]
+
+    def test_concurrent_clients(self, ranking_server, tmp_path):
+        async def client(open_connection):
+            ingest_reader, ingest_writer = await open_connection()
+            query_reader, query_writer = await open_connection()
+            await send(ingest_reader, ingest_writer, *(["Lions 1, Snakes 0"] * 100))
+            ingest_writer.close()
+            await ingest_writer.wait_closed()
+            # Queries are answered while (and after) the other client's match scores are ingested
+            rankings = []
+            while not rankings or rankings[-1] != ["1. Lions, 300 pts", "2. Snakes, 0 pts"]:
+                await send(query_reader, query_writer, "/rankings")
+                rankings.append(await read_reply(query_reader))
+            query_writer.close()
+            return rankings[-1]
+
+        assert self.run_with_server(
+            ranking_server, client, unix_socket_path=tmp_path / "server.sock"
+        ) == ["1. Lions, 300 pts", "2. Snakes, 0 pts"]
+
+    def test_invalid_ingest_batch_size(self):
+        with pytest.raises(ValueError, match="Ingest batch size must be > 0"):
+            RankingServer(
+                IncrementalStandardCompetitionSoccerTeamRanker(metric_scorers=[]),
+                ingest_batch_size=0,
+            )
+
+
+class TestFromTuplesSoccerMatchScoresLoader:
+    def test_iter_match_scores(self):
+        loader = FromTuplesSoccerMatchScoresLoader([("a", 1, "b", 2)])
+
+        assert list(loader.iter_match_score_tuples()) == [("a", 1, "b", 2)]
+        assert list(loader.iter_match_scores()) == [
+            MatchScore(TeamGameScore(team_name="a", score=1), TeamGameScore(team_name="b", score=2))
+        ]